@@ -0,0 +1,66 @@
+"""
+Fit the cost model behind ``preset="auto"``.
+
+Times every registered extractor on a synthetic noisy gradient at several
+sample sizes and palette sizes, and fits the cost per unit of work and the
+fixed overhead per method, i.e. the ``_NS_PER_UNIT`` and ``_OVERHEAD_SECONDS``
+coefficients in ``pylette/src/presets.py``. Re-run it to refit them for other
+hardware.
+
+Usage:
+    python benchmarks/cost_model.py [--sizes 64 128 256] [--palette-sizes 5 16 32] [--repeats 3]
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+from pylette.src.extractors import available_methods
+from pylette.src.extractors.registry import get_extractor
+from pylette.src.presets import estimate_cost, work_units
+
+
+def make_pixels(side: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:side, 0:side]
+    arr = np.stack([x * 255 // side, y * 255 // side, (x + y) * 255 // (2 * side), np.full_like(x, 255)], axis=-1)
+    arr[..., :3] += rng.integers(-20, 21, (side, side, 3))
+    return np.clip(arr, 0, 255).astype(np.uint8).reshape(-1, 4)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 128, 256], help="Sample sides to time.")
+    parser.add_argument("--palette-sizes", type=int, nargs="+", default=[5, 16, 32])
+    parser.add_argument("--repeats", type=int, default=3, help="Timings per point; the fastest is kept.")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    samples = {side: make_pixels(side) for side in args.sizes}
+
+    print(f"{'method':<10} {'side':>5} {'k':>4} {'seconds':>9} {'predicted':>10}")
+    for method in available_methods():
+        extractor = get_extractor(method)
+        extractor.extract(samples[args.sizes[0]], palette_size=5)  # warm up imports
+        units, seconds = [], []
+        for side, pixels in samples.items():
+            for k in args.palette_sizes:
+                best = min(_time(extractor.extract, pixels, k) for _ in range(args.repeats))
+                units.append(work_units(method, len(pixels), k))
+                seconds.append(best)
+                predicted = estimate_cost(method, len(pixels), k)
+                print(f"{method.value:<10} {side:>5} {k:>4} {best:>9.4f} {predicted:>10.4f}")
+        slope, intercept = np.polyfit(units, seconds, 1)
+        print(f"{method.value:<10} fit: {slope * 1e9:.0f} ns/unit, {max(intercept, 0.0):.4f} s overhead\n")
+
+
+def _time(fn, pixels: np.ndarray, palette_size: int) -> float:  # type: ignore[no-untyped-def]
+    start = time.perf_counter()
+    fn(pixels, palette_size=palette_size)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
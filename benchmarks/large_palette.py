@@ -0,0 +1,50 @@
+"""
+Benchmark extraction time against palette size.
+
+Times every registered extractor on a synthetic 1 MP image (a noisy gradient,
+so it has ~10^5-10^6 distinct colors) for palette sizes up to 256, the regime
+used for GIF / indexed-PNG export.
+
+Usage:
+    python benchmarks/large_palette.py [--size 1000] [--palette-sizes 16 64 256]
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+from PIL import Image
+
+from pylette import extract_colors
+from pylette.src.extractors import available_methods
+
+
+def make_image(size: int) -> Image.Image:
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:size, 0:size]
+    arr = np.stack([x * 255 // size, y * 255 // size, (x + y) * 255 // (2 * size)], axis=-1)
+    arr = np.clip(arr + rng.integers(-20, 21, (size, size, 3)), 0, 255).astype(np.uint8)
+    return Image.fromarray(arr, "RGB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1000, help="Image side length in pixels.")
+    parser.add_argument("--palette-sizes", type=int, nargs="+", default=[16, 64, 256])
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    image = make_image(args.size)
+    extract_colors(image, palette_size=2, resize=16)  # warm up imports
+
+    print(f"{'method':<10} {'palette_size':>12} {'seconds':>9}")
+    for method in available_methods():
+        for palette_size in args.palette_sizes:
+            start = time.perf_counter()
+            extract_colors(image, palette_size=palette_size, mode=method, resize=None)
+            print(f"{method.value:<10} {palette_size:>12} {time.perf_counter() - start:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
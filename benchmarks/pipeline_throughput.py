@@ -0,0 +1,121 @@
+"""
+Benchmark the staged pipeline on a mixed local and remote corpus.
+
+Serves half of a batch of synthetic PNGs from a local HTTP server that adds a
+fixed latency to every response (standing in for a CDN), keeps the other half
+on disk, and times ``iter_extract_colors`` (one worker per core runs each image
+start to finish) against ``pipeline_extract_colors`` (separate read, decode and
+extract stages). It also prints the two lower bounds on wall time, the I/O
+limit (total latency spread over the readers) and the CPU limit (total
+extraction time spread over the cores), which the pipeline should approach.
+
+Usage:
+    python benchmarks/pipeline_throughput.py [--images 64] [--size 512] [--latency 0.1]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from pylette import extract_colors, iter_extract_colors, pipeline_extract_colors
+from pylette.types import PipelineStats
+
+
+def make_png(rng: np.random.Generator, size: int) -> bytes:
+    y, x = np.mgrid[0:size, 0:size]
+    base = np.stack([x * 255 // size, y * 255 // size, (x + y) * 255 // (2 * size)], axis=-1)
+    arr = np.clip(base + rng.integers(-30, 31, base.shape), 0, 255).astype(np.uint8)
+    buffer = BytesIO()
+    Image.fromarray(arr).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def serve(bodies: dict[str, bytes], latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            time.sleep(latency)
+            body = bodies[self.path]
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=64, help="Number of images; half are served over HTTP.")
+    parser.add_argument("--size", type=int, default=512, help="Image side length in pixels.")
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds of latency per HTTP response.")
+    parser.add_argument("--read-workers", type=int, default=16, help="Reader threads of the pipeline.")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    cores = os.cpu_count() or 1
+    rng = np.random.default_rng(0)
+    pngs = [make_png(rng, args.size) for _ in range(args.images)]
+    n_remote = args.images // 2
+    bodies = {f"/image{i}.png": png for i, png in enumerate(pngs[:n_remote])}
+    httpd = serve(bodies, args.latency)
+    port = httpd.server_address[1]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        images: list[str] = []
+        for i, png in enumerate(pngs):
+            if i < n_remote:
+                images.append(f"http://127.0.0.1:{port}/image{i}.png")
+            else:
+                path = Path(tmp) / f"image{i}.png"
+                path.write_bytes(png)
+                images.append(str(path))
+        images = images[::2] + images[1::2]  # interleave remote and local
+
+        extract_colors(pngs[0])  # warm up imports
+        start = time.perf_counter()
+        for png in pngs:
+            extract_colors(png)
+        cpu_bound = (time.perf_counter() - start) / cores
+        io_bound = n_remote * args.latency / args.read_workers
+        print(f"{cores} cores, {args.images} images ({n_remote} over HTTP, {args.latency * 1000:.0f} ms latency)")
+        print(f"lower bounds: CPU {cpu_bound:.2f}s, I/O {io_bound:.2f}s\n")
+
+        start = time.perf_counter()
+        results = list(iter_extract_colors(images, max_workers=cores))
+        assert all(r.success for r in results)
+        print(f"iter_extract_colors      {time.perf_counter() - start:>6.2f}s")
+
+        stats = PipelineStats()
+        start = time.perf_counter()
+        results = list(pipeline_extract_colors(images, read_workers=args.read_workers, stats=stats))
+        assert all(r.success for r in results)
+        print(f"pipeline_extract_colors  {time.perf_counter() - start:>6.2f}s\n")
+
+        print(f"{'stage':<8} {'workers':>7} {'busy s':>7} {'mean depth':>10} {'max depth':>9} {'capacity':>8}")
+        for name in ("read", "decode", "extract"):
+            st = getattr(stats, name)
+            row = f"{name:<8} {st.workers:>7} {st.busy_seconds:>7.2f} {st.mean_depth:>10.1f} {st.max_depth:>9}"
+            print(f"{row} {st.capacity:>8}")
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark how batch_extract_colors scales with worker threads.
+
+Extracts palettes from a batch of synthetic images with the ``threads``
+backend at increasing worker counts and prints the speedup over one worker.
+On a free-threaded interpreter (``python3.14t``) with the GIL disabled the
+speedup should be close to the worker count up to the number of cores; on a
+regular build it flattens after a few workers, because much of an extraction
+holds the GIL. BLAS/OpenMP pools are limited to one thread so they do not
+compete with the workers.
+
+Usage:
+    python3.14t benchmarks/thread_scaling.py [--images 32] [--size 512] [--mode KMeans]
+"""
+
+import argparse
+import os
+import sys
+import sysconfig
+import time
+import warnings
+
+import numpy as np
+from threadpoolctl import threadpool_limits
+
+from pylette import batch_extract_colors, extract_colors
+
+
+def make_images(n: int, size: int) -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:size, 0:size]
+    base = np.stack([x * 255 // size, y * 255 // size, (x + y) * 255 // (2 * size)], axis=-1)
+    return [np.clip(base + rng.integers(-30, 31, base.shape), 0, 255).astype(np.uint8) for _ in range(n)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=32, help="Number of images in the batch.")
+    parser.add_argument("--size", type=int, default=512, help="Image side length in pixels.")
+    parser.add_argument("--mode", default="KMeans", help="Extraction method.")
+    parser.add_argument("--workers", type=int, nargs="+", help="Worker counts to time (default: powers of 2).")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    cores = os.cpu_count() or 1
+    workers = args.workers or [w for w in (1, 2, 4, 8, 16, 32, 64) if w <= cores] or [1]
+    free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, free-threaded build: {free_threaded}, GIL enabled: {gil_enabled}")
+    print(f"{cores} cores, {args.images} images of {args.size}x{args.size}, mode {args.mode}\n")
+
+    images = make_images(args.images, args.size)
+    extract_colors(images[0], mode=args.mode)  # warm up imports
+
+    print(f"{'workers':>7} {'seconds':>9} {'speedup':>8} {'efficiency':>10}")
+    baseline = None
+    with threadpool_limits(limits=1):
+        for n in workers:
+            start = time.perf_counter()
+            results = batch_extract_colors(images, mode=args.mode, max_workers=n, backend="threads")
+            elapsed = time.perf_counter() - start
+            assert all(r.success for r in results)
+            baseline = baseline or elapsed
+            speedup = baseline / elapsed
+            print(f"{n:>7} {elapsed:>9.2f} {speedup:>7.2f}x {speedup / n:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
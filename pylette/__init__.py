@@ -1,7 +1,19 @@
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from pylette import types
+from pylette.src.archives import archive_members
 from pylette.src.color import Color
-from pylette.src.color_extraction import batch_extract_colors, extract_colors
+from pylette.src.color_extraction import (
+    batch_extract_colors,
+    extract_colors,
+    extract_colors_progressive,
+    extract_colors_stacked,
+    iter_extract_colors,
+)
 from pylette.src.exceptions import (
+    ExtractionTimeoutError,
+    ImageTooLargeError,
     InvalidColorspaceError,
     InvalidHarmonyError,
     InvalidImageError,
@@ -9,18 +21,88 @@ from pylette.src.exceptions import (
     PyletteError,
     UnknownExtractionMethodError,
 )
+from pylette.src.extractors.online import HistogramExtractor, StreamingKMeansExtractor
+from pylette.src.fetch import HostLimiter, HttpClient, set_http_client
+from pylette.src.files import set_mmap_reads
+from pylette.src.inspection import inspect_image, inspect_images
+from pylette.src.loaders import FileLoader, HttpLoader, ImageLoader, register_loader, unregister_loader
 from pylette.src.palette import Palette
-from pylette.src.types import HarmonyKind
+from pylette.src.session import ExtractionConfig, ExtractionSession
+from pylette.src.types import Backend, HarmonyKind, Preset, Schedule
+
+if TYPE_CHECKING:
+    from pylette.src.async_extraction import (
+        batch_extract_colors_async,
+        extract_colors_async,
+        iter_extract_colors_async,
+    )
+    from pylette.src.cache import MemoryPaletteCache, PaletteCache
+    from pylette.src.pipeline import pipeline_extract_colors
+
+# Imported on first use, so that `import pylette` does not load asyncio,
+# sqlite3 and the threading machinery of the pipeline.
+_LAZY = {
+    "extract_colors_async": "pylette.src.async_extraction",
+    "batch_extract_colors_async": "pylette.src.async_extraction",
+    "iter_extract_colors_async": "pylette.src.async_extraction",
+    "PaletteCache": "pylette.src.cache",
+    "MemoryPaletteCache": "pylette.src.cache",
+    "pipeline_extract_colors": "pylette.src.pipeline",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     "extract_colors",
     "batch_extract_colors",
+    "iter_extract_colors",
+    "extract_colors_stacked",
+    "extract_colors_progressive",
+    "extract_colors_async",
+    "batch_extract_colors_async",
+    "iter_extract_colors_async",
+    "pipeline_extract_colors",
+    "inspect_image",
+    "inspect_images",
+    "HostLimiter",
+    "HttpClient",
+    "set_http_client",
+    "ImageLoader",
+    "HttpLoader",
+    "FileLoader",
+    "register_loader",
+    "unregister_loader",
+    "archive_members",
+    "set_mmap_reads",
+    "PaletteCache",
+    "MemoryPaletteCache",
+    "ExtractionConfig",
+    "ExtractionSession",
     "Palette",
+    "StreamingKMeansExtractor",
+    "HistogramExtractor",
     "Color",
     "types",
+    "Backend",
     "HarmonyKind",
+    "Preset",
+    "Schedule",
     "PyletteError",
     "InvalidImageError",
+    "ImageTooLargeError",
+    "ExtractionTimeoutError",
     "NoValidPixelsError",
     "UnknownExtractionMethodError",
     "InvalidColorspaceError",
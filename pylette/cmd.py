@@ -1,15 +1,31 @@
 import json
+import os
 import pathlib
 from enum import Enum
-from typing import Annotated, List
+from typing import TYPE_CHECKING, Annotated, List, Literal
 
 import typer
 from rich.console import Console
 from rich.table import Table
 
+from pylette.src.archives import archive_members, is_archive
 from pylette.src.cli_utils import PyletteProgress
-from pylette.src.color_extraction import batch_extract_colors
-from pylette.src.types import BatchResult, ColorSpace, ExtractionMethod
+from pylette.src.color_extraction import iter_extract_colors
+from pylette.src.exceptions import InvalidImageError
+from pylette.src.inspection import inspect_images
+from pylette.src.types import (
+    UNSET,
+    Backend,
+    BatchResult,
+    BatchStats,
+    ColorSpace,
+    ExtractionMethod,
+    InspectResult,
+    Preset,
+)
+
+if TYPE_CHECKING:
+    from pylette.src.cache import PaletteCache
 
 
 class SortBy(str, Enum):
@@ -20,15 +36,32 @@ class SortBy(str, Enum):
 pylette_app = typer.Typer()
 
 
-@pylette_app.command(no_args_is_help=True)
+@pylette_app.command(
+    no_args_is_help=True, epilog="To read sizes and formats from the headers only, run pylette-inspect."
+)
 def main(
     image_sources: Annotated[
-        List[str], typer.Argument(help="A list of paths / directories / URLs pointing to images.")
+        List[str],
+        typer.Argument(
+            help="A list of paths / directories / URLs pointing to images. "
+            "A zip or tar archive stands for every image in it; ARCHIVE::MEMBER names a single one."
+        ),
     ],  # These can be paths or URLs
-    mode: ExtractionMethod = ExtractionMethod.KM,
+    mode: ExtractionMethod | None = typer.Option(None, help="Extraction method. [default: KMeans]"),
     palette_size: int = typer.Option(
         5, "--palette-size", "--n", help="Number of colors to extract. (--n is a deprecated alias.)"
     ),
+    resize: int | None = typer.Option(
+        None,
+        min=0,
+        help="Sample size: images are downscaled to RESIZE x RESIZE before extraction. 0 disables resizing. "
+        "[default: 256]",
+    ),
+    preset: Preset | None = typer.Option(
+        None,
+        help="Speed/quality preset choosing the mode and sample size. 'auto' picks per image. "
+        "An explicit --mode or --resize takes precedence.",
+    ),
     sort_by: SortBy = SortBy.luminance,
     stdout: bool = True,
     out_filename: pathlib.Path | None = None,
@@ -40,12 +73,32 @@ def main(
         max=255,
         help="Alpha threshold for transparent image masking (0-255). Pixels with alpha below this value are excluded.",
     ),
-    max_workers: int | None = typer.Option(
+    max_workers: str | None = typer.Option(
         None,
         "--max-workers",
         "--num-threads",
+        help="Number of workers for batch extraction, or 'auto' to tune it while the batch runs. "
+        "(--num-threads is a deprecated alias.)",
+    ),
+    backend: Backend = typer.Option(
+        Backend.THREADS,
+        help="Where extractions run: worker threads or worker processes.",
+    ),
+    timeout: float | None = typer.Option(
+        None,
+        help="Per-image time limit in seconds; slower images are reported as failed. "
+        "Only the processes backend can stop them; threads finish them in the background.",
+    ),
+    max_pixels: int | None = typer.Option(
+        None,
         min=1,
-        help="Number of worker threads for batch extraction. (--num-threads is a deprecated alias.)",
+        help="Reject images with more pixels than this (checked from the header, before decoding).",
+    ),
+    cache_dir: pathlib.Path | None = typer.Option(
+        None,
+        "--cache-dir",
+        help="Directory of a persistent palette cache: images whose content and settings were seen "
+        "before are answered from it instead of extracted.",
     ),
     export_json: bool = typer.Option(False, "--export-json", help="Export palettes to JSON format"),
     output: pathlib.Path | None = typer.Option(
@@ -55,6 +108,11 @@ def main(
         "If directory: creates individual files. If file: creates combined file.",
     ),
 ):
+    workers = parse_max_workers(max_workers)
+    image_sources = expand_archives(image_sources)
+    if timeout is not None and timeout <= 0:
+        raise typer.BadParameter(f"expected a positive number of seconds, got {timeout}.", param_hint="--timeout")
+
     # Validate export_json requirements
     if export_json and output is None:
         typer.echo("Error: --output is required when using --export-json", err=True)
@@ -75,15 +133,31 @@ def main(
             else:
                 progress.update(task_id, advance=1)
 
-        results = batch_extract_colors(
-            images=image_sources,
-            palette_size=palette_size,
-            sort_mode=sort_by.value,
-            mode=mode,
-            alpha_mask_threshold=alpha_mask_threshold,
-            max_workers=max_workers,
-            progress_callback=progress_callback,
-        )
+        results: list[BatchResult] = []
+        stats = BatchStats()
+        interrupted = False
+        try:
+            for result in iter_extract_colors(
+                images=image_sources,
+                palette_size=palette_size,
+                resize=UNSET if resize is None else resize or None,
+                sort_mode=sort_by.value,
+                mode=mode,
+                preset=preset,
+                alpha_mask_threshold=alpha_mask_threshold,
+                max_workers=workers,
+                progress_callback=progress_callback,
+                backend=backend,
+                ordered=True,
+                stats=stats,
+                timeout=timeout,
+                max_pixels=max_pixels,
+                cache=_palette_cache(cache_dir),
+            ):
+                results.append(result)
+        except KeyboardInterrupt:
+            # Remaining images are dropped; report what finished.
+            interrupted = True
 
     successful = [r for r in results if r.success]
     failed = [r for r in results if not r.success]
@@ -103,6 +177,22 @@ def main(
     if failed:
         print_extraction_summary(successful, failed)
 
+    if workers == "auto" and stats.concurrency_history:
+        typer.secho(
+            f"Auto-tuned concurrency: {stats.workers} workers "
+            f"(history: {', '.join(map(str, stats.concurrency_history))})",
+            err=True,
+        )
+
+    if cache_dir is not None:
+        typer.secho(f"Palette cache: {stats.cache_hits}/{len(results)} images answered from {cache_dir}", err=True)
+
+    if interrupted:
+        typer.secho(
+            f"Interrupted: {len(results)}/{len(image_sources)} images processed.", fg=typer.colors.YELLOW, err=True
+        )
+        raise typer.Exit(130)
+
     # If we have no successful extractions, return with code 1
     if not successful:
         raise typer.Exit(1)
@@ -111,6 +201,80 @@ def main(
         raise typer.Exit(2)
 
 
+inspect_app = typer.Typer()
+
+
+@inspect_app.command(no_args_is_help=True)
+def inspect(
+    image_sources: Annotated[List[str], typer.Argument(help="Paths / URLs / archives of the images to inspect.")],
+    max_workers: int | None = typer.Option(None, "--max-workers", min=1, help="Threads reading headers."),
+    output: pathlib.Path | None = typer.Option(None, "--output", help="Write the records here instead of stdout."),
+):
+    """Print the size, format, mode and alpha flag of every image as JSON lines, reading only headers."""
+    results = inspect_images(expand_archives(image_sources), max_workers=max_workers)
+    lines = [json.dumps(inspect_record(result)) for result in results]
+    if output is None:
+        for line in lines:
+            typer.echo(line)
+    else:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text("".join(f"{line}\n" for line in lines))
+
+    failed = sum(not r.success for r in results)
+    if failed == len(results):
+        raise typer.Exit(1)
+    elif failed:
+        raise typer.Exit(2)
+
+
+def inspect_record(result: InspectResult) -> dict[str, object]:
+    """The JSON record of one inspected image: its source and ``ImageInfo``, or the error."""
+    record: dict[str, object] = {"source": str(result.source)}
+    if result.info is None:
+        record["error"] = str(result.exception)
+    else:
+        record.update(result.info)
+        record["n_bytes"] = result.n_bytes
+    return record
+
+
+def _palette_cache(cache_dir: pathlib.Path | None) -> "PaletteCache | None":
+    if cache_dir is None:
+        return None
+    from pylette.src.cache import PaletteCache  # sqlite3 is only loaded when caching
+
+    return PaletteCache(cache_dir)
+
+
+def expand_archives(sources: list[str]) -> list[str]:
+    """Replace every zip or tar archive in ``sources`` by the addresses of its images."""
+    expanded: list[str] = []
+    for source in sources:
+        if is_archive(source) and os.path.isfile(source):
+            try:
+                expanded.extend(archive_members(source))
+            except InvalidImageError as e:
+                raise typer.BadParameter(str(e), param_hint="IMAGE_SOURCES") from e
+        else:
+            expanded.append(source)
+    return expanded
+
+
+def parse_max_workers(value: str | None) -> int | Literal["auto"] | None:
+    """Parse ``--max-workers``: a positive int, ``auto`` or unset."""
+    if value is None:
+        return None
+    if value.strip().lower() == "auto":
+        return "auto"
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        raise typer.BadParameter(f"expected a positive int or 'auto', got {value!r}.", param_hint="--max-workers")
+    return workers
+
+
 def handle_json_export(
     successful_results: list[BatchResult], output_path: pathlib.Path, colorspace: ColorSpace
 ) -> None:
@@ -227,5 +391,9 @@ def main_typer() -> None:
     pylette_app()
 
 
+def inspect_typer() -> None:
+    inspect_app(prog_name="pylette-inspect")
+
+
 if __name__ == "__main__":
     main_typer()
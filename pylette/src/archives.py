@@ -0,0 +1,278 @@
+"""
+Reading images out of zip and tar archives without unpacking them.
+
+An archive member is addressed as ``<archive>::<member>``, e.g.
+``shard-0001.tar::images/cat.jpg``, and is accepted wherever a path is.
+:func:`archive_members` lists the address of every image in an archive, in
+archive order, so a whole archive is one argument to the batch API::
+
+    batch_extract_colors(archive_members("shard-0001.tar"))
+
+Members are read through :data:`ARCHIVE_LOADER`, which keeps the last few
+archives open between reads:
+
+* a zip is indexed once from its central directory and members are read
+  directly;
+* an uncompressed tar is indexed once from its headers and members are read
+  by seeking;
+* a compressed tar (``.tar.gz``, ``.tar.bz2``, ``.tar.xz``) cannot be seeked,
+  so it is decompressed front to back in a single streaming pass. Members are
+  served as the pass reaches them, and the members read past are kept, up to
+  64 MiB, in case they are asked for next, so a batch reading an archive in
+  order (as :func:`archive_members` lists it) decompresses it once.
+
+Compressed tars must be read in archive order: a member that was passed and
+is no longer kept can only be reached by decompressing the archive again from
+the start, so reading one in another order costs a pass per member (a
+``RuntimeWarning`` says so the first time). Shuffle or sort the addresses of a
+compressed tar only after extracting, or decompress it to a plain ``.tar``.
+The reader remembers only its position, not the names it went by, so a
+member the archive does not have also costs a full pass to rule out.
+"""
+
+import atexit
+import os
+import threading
+import warnings
+import zipfile
+from collections import OrderedDict
+from pathlib import Path, PurePosixPath
+from typing import Iterator, Protocol
+
+from PIL import Image
+
+from pylette.src.exceptions import InvalidImageError
+from pylette.src.types import ImageInput
+
+MEMBER_SEPARATOR = "::"
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+# Archives ARCHIVE_LOADER keeps open at once.
+_MAX_OPEN_ARCHIVES = 8
+
+# Bytes of the members a compressed tar keeps after reading past them.
+_LOOKAHEAD_BYTES = 64 * 1024 * 1024
+
+
+def is_archive(path: str | Path) -> bool:
+    """Check whether ``path`` names a zip or tar archive, by its extension."""
+    return str(path).lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def split_member(image: ImageInput) -> tuple[str, str] | None:
+    """Split an ``<archive>::<member>`` address; ``None`` if ``image`` is not one."""
+    if not isinstance(image, (str, Path)):
+        return None
+    archive, separator, member = str(image).partition(MEMBER_SEPARATOR)
+    return (archive, member) if separator and member and is_archive(archive) else None
+
+
+def _is_image_name(name: str) -> bool:
+    path = PurePosixPath(name)
+    return not path.name.startswith(".") and path.suffix.lower() in Image.registered_extensions()
+
+
+def archive_members(archive: str | Path) -> list[str]:
+    """
+    List the address of every image in ``archive``, in archive order.
+
+    Images are recognized by their extension; hidden files (such as the ``._``
+    files macOS adds to zips) are skipped.
+
+    Raises:
+        InvalidImageError: If ``archive`` cannot be read as a zip or tar archive.
+    """
+    import tarfile
+
+    try:
+        if str(archive).lower().endswith(".zip"):
+            with zipfile.ZipFile(archive) as zf:
+                names = [info.filename for info in zf.infolist() if not info.is_dir()]
+        else:
+            with tarfile.open(archive, "r|*") as tf:
+                names = [info.name for info in tf if info.isfile()]
+    except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+        raise InvalidImageError(f"Could not read archive {archive}: {e}") from e
+    return [f"{archive}{MEMBER_SEPARATOR}{name}" for name in names if _is_image_name(name)]
+
+
+class _Reader(Protocol):
+    def read(self, member: str) -> bytes: ...
+
+    def close(self) -> None: ...
+
+
+class _ZipReader:
+    def __init__(self, path: str):
+        self.archive = zipfile.ZipFile(path)
+
+    def read(self, member: str) -> bytes:
+        return self.archive.read(member)
+
+    def close(self) -> None:
+        self.archive.close()
+
+
+class _TarReader:
+    """Random access to an uncompressed tar."""
+
+    def __init__(self, path: str):
+        import tarfile
+
+        self.archive = tarfile.open(path, "r:")
+        self.members = {info.name: info for info in self.archive if info.isfile()}
+
+    def read(self, member: str) -> bytes:
+        f = self.archive.extractfile(self.members[member])
+        assert f is not None  # members are regular files
+        return f.read()
+
+    def close(self) -> None:
+        self.archive.close()
+
+
+class _TarStreamReader:
+    """One forward pass over a compressed tar, restarted when a member it went by and dropped is asked for."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.warned = False
+        self._start()
+
+    def _start(self) -> None:
+        import tarfile
+
+        self.archive = tarfile.open(self.path, "r|*")
+        self.stream: Iterator[tarfile.TarInfo] = iter(self.archive)
+        # Members the pass has reached, and the last ones passed by, kept.
+        self.position = 0
+        self.passed: OrderedDict[str, bytes] = OrderedDict()
+        self.passed_bytes = 0
+
+    def _take(self, member: str) -> bytes:
+        data = self.passed.pop(member)
+        self.passed_bytes -= len(data)
+        return data
+
+    def _advance_to(self, member: str) -> bytes | None:
+        for info in self.stream:
+            if not info.isfile():
+                continue
+            f = self.archive.extractfile(info)
+            assert f is not None
+            data = f.read()
+            self.position += 1
+            if info.name == member:
+                return data
+            if info.name in self.passed:
+                self._take(info.name)  # a later member of the same name replaces it
+            self.passed[info.name] = data
+            self.passed_bytes += len(data)
+            while self.passed_bytes > _LOOKAHEAD_BYTES:
+                self._take(next(iter(self.passed)))
+        return None
+
+    def read(self, member: str) -> bytes:
+        if member in self.passed:
+            return self._take(member)
+        from_start = self.position == 0
+        data = self._advance_to(member)
+        if data is None and not from_start:
+            # Passed before, or missing: only a new pass can tell.
+            self.archive.close()
+            self._start()
+            data = self._advance_to(member)
+            if data is not None and not self.warned:
+                self.warned = True
+                warnings.warn(
+                    f"{self.path} is read out of archive order: every member asked for after the pass "
+                    "went by decompresses the archive again. Read compressed tars in the order "
+                    "archive_members lists.",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+        if data is None:
+            raise KeyError(member)
+        return data
+
+    def close(self) -> None:
+        self.archive.close()
+
+
+def _open_reader(path: str) -> _Reader:
+    import tarfile
+
+    if path.lower().endswith(".zip"):
+        return _ZipReader(path)
+    try:
+        return _TarReader(path)
+    except tarfile.ReadError:
+        return _TarStreamReader(path)  # compressed
+
+
+class _OpenArchive:
+    def __init__(self, reader: _Reader):
+        self.reader = reader
+        self.lock = threading.Lock()
+        self.closed = False
+
+
+class ArchiveLoader:
+    """
+    Loads ``<archive>::<member>`` addresses, keeping the last few archives open.
+
+    Reads of one archive are serialized; archives are reopened when they
+    change on disk.
+    """
+
+    max_concurrency: int | None = None
+
+    def __init__(self, max_open: int = _MAX_OPEN_ARCHIVES):
+        self.max_open = max_open
+        self._lock = threading.Lock()
+        self._open: OrderedDict[tuple[str, int, int], _OpenArchive] = OrderedDict()
+
+    def _archive(self, path: str) -> _OpenArchive:
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            archive = self._open.pop(key, None) or _OpenArchive(_open_reader(path))
+            self._open[key] = archive
+            while len(self._open) > self.max_open:
+                _, evicted = self._open.popitem(last=False)
+                with evicted.lock:
+                    evicted.closed = True
+                    evicted.reader.close()
+        return archive
+
+    def load(self, uri: str) -> bytes:
+        import tarfile
+
+        parts = split_member(uri)
+        if parts is None:
+            raise InvalidImageError(f"{uri} is not an archive member.")
+        path, member = parts
+        try:
+            while True:
+                archive = self._archive(path)
+                with archive.lock:
+                    if not archive.closed:  # else evicted before this read got to it
+                        return archive.reader.read(member)
+        except KeyError:
+            raise InvalidImageError(f"{path} has no member {member!r}.") from None
+        except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+            raise InvalidImageError(f"Could not read {uri}: {e}") from e
+
+    def close(self) -> None:
+        """Close every open archive."""
+        with self._lock:
+            for archive in self._open.values():
+                with archive.lock:
+                    archive.closed = True
+                    archive.reader.close()
+            self._open.clear()
+
+
+ARCHIVE_LOADER = ArchiveLoader()
+atexit.register(ARCHIVE_LOADER.close)
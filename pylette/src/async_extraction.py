@@ -0,0 +1,216 @@
+"""
+asyncio variants of the extraction API.
+
+For services running an event loop: nothing here blocks the loop. URLs (and
+other URIs, see :mod:`pylette.src.loaders`) are loaded in worker threads (at
+most ``per_host_limit`` at a time per host, see
+:class:`~pylette.src.fetch.HostLimiter`), and the CPU-bound extraction is
+offloaded to an executor of the caller's choice: the loop's default thread
+pool, or e.g. a :class:`~concurrent.futures.ProcessPoolExecutor` shared across
+requests.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from typing import AsyncIterator, Callable, Iterable, Literal, Sequence
+
+from pylette.src.archives import split_member
+from pylette.src.color_extraction import extract_colors
+from pylette.src.fetch import HostLimiter
+from pylette.src.loaders import loader_for, read_uri
+from pylette.src.palette import Palette
+from pylette.src.types import UNSET, BatchResult, ExtractionMethod, ImageInput, Preset, SourceType, Unset
+
+# Default number of images iter_extract_colors_async fetches or extracts at once.
+_ASYNC_MAX_IN_FLIGHT = 16
+
+
+async def _extract(
+    image: ImageInput,
+    extract: Callable[[ImageInput], Palette],
+    executor: Executor | None,
+    limiter: HostLimiter,
+) -> Palette:
+    loop = asyncio.get_running_loop()
+    loader = loader_for(image)
+    if loader is None:
+        return await loop.run_in_executor(executor, extract, image)
+
+    url = str(image)
+    async with limiter(url):
+        data = await asyncio.to_thread(read_uri, url, loader)
+    palette = await loop.run_in_executor(executor, extract, data)
+    if palette.metadata is not None:
+        # Extraction saw the downloaded bytes; describe the URL instead.
+        palette.metadata["image_source"] = url
+        palette.metadata["source_type"] = SourceType.ARCHIVE_MEMBER if split_member(url) else SourceType.URL
+    return palette
+
+
+async def extract_colors_async(
+    image: ImageInput,
+    palette_size: int = 5,
+    resize: int | bool | None | Unset = UNSET,
+    mode: ExtractionMethod | str | None = None,
+    sort_mode: Literal["luminance", "frequency"] | None = None,
+    alpha_mask_threshold: int | None = None,
+    time_budget: float | None = None,
+    preset: Preset | str | None = None,
+    max_pixels: int | None = None,
+    executor: Executor | None = None,
+    limiter: HostLimiter | None = None,
+) -> Palette:
+    """
+    Asynchronously extract a palette; see :func:`~pylette.extract_colors` for the parameters.
+
+    Parameters:
+        executor: Where extraction runs; ``None`` uses the event loop's default executor.
+        limiter: Optional :class:`~pylette.HostLimiter` shared between calls, to cap
+            concurrent downloads per host across a service.
+
+    Raises:
+        InvalidImageError: If the image cannot be downloaded or loaded.
+
+    Examples:
+        >>> palette = await extract_colors_async("https://example.com/photo.jpg", palette_size=8)
+    """
+    extract = partial(
+        extract_colors,
+        palette_size=palette_size,
+        resize=resize,
+        mode=mode,
+        sort_mode=sort_mode,
+        alpha_mask_threshold=alpha_mask_threshold,
+        time_budget=time_budget,
+        preset=preset,
+        max_pixels=max_pixels,
+    )
+    return await _extract(image, extract, executor, limiter or HostLimiter())
+
+
+async def iter_extract_colors_async(
+    images: Iterable[ImageInput],
+    palette_size: int = 5,
+    resize: int | bool | None | Unset = UNSET,
+    mode: ExtractionMethod | str | None = None,
+    sort_mode: Literal["luminance", "frequency"] | None = None,
+    alpha_mask_threshold: int | None = None,
+    time_budget: float | None = None,
+    preset: Preset | str | None = None,
+    max_pixels: int | None = None,
+    executor: Executor | None = None,
+    max_in_flight: int | None = None,
+    per_host_limit: int = 4,
+) -> AsyncIterator[BatchResult]:
+    """
+    Extract palettes from many images concurrently, yielding results as they finish.
+
+    The async counterpart of :func:`~pylette.iter_extract_colors`: ``images`` is
+    consumed lazily, at most ``max_in_flight`` images are being fetched or
+    extracted at once, and each :class:`~pylette.types.BatchResult` (with its
+    input ``index``) is yielded as soon as it completes. Breaking out of the
+    loop cancels the outstanding work.
+
+    Parameters:
+        images: The input images; any iterable of :func:`~pylette.extract_colors` inputs.
+        executor: Where extraction runs; ``None`` uses the event loop's default executor.
+        max_in_flight: Maximum number of images in progress; defaults to 16.
+        per_host_limit: Maximum number of simultaneous downloads per host.
+        **kwargs: Every other parameter is as in :func:`~pylette.extract_colors`.
+
+    Raises:
+        ValueError: If ``max_in_flight`` or ``per_host_limit`` is not positive.
+
+    Examples:
+        >>> async for result in iter_extract_colors_async(urls, per_host_limit=2):
+        ...     print(result.index, result.palette)
+    """
+    if max_in_flight is not None and max_in_flight < 1:
+        raise ValueError(f"max_in_flight must be a positive int or None, got {max_in_flight!r}.")
+    window = max_in_flight or _ASYNC_MAX_IN_FLIGHT
+    limiter = HostLimiter(per_host_limit)
+    extract = partial(
+        extract_colors,
+        palette_size=palette_size,
+        resize=resize,
+        mode=mode,
+        sort_mode=sort_mode,
+        alpha_mask_threshold=alpha_mask_threshold,
+        time_budget=time_budget,
+        preset=preset,
+        max_pixels=max_pixels,
+    )
+
+    async def run(index: int, image: ImageInput) -> BatchResult:
+        try:
+            palette = await _extract(image, extract, executor, limiter)
+        except Exception as e:
+            return BatchResult(source=image, exception=e, index=index)
+        return BatchResult(source=image, result=palette, index=index)
+
+    inputs = enumerate(images)
+    pending: set[asyncio.Task[BatchResult]] = set()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < window:
+                item = next(inputs, None)
+                if item is None:
+                    exhausted = True
+                else:
+                    pending.add(asyncio.ensure_future(run(*item)))
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=lambda t: t.result().index or 0):
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        # Threads already downloading or extracting run to completion, but
+        # nothing waits for them any more.
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def batch_extract_colors_async(
+    images: Sequence[ImageInput],
+    palette_size: int = 5,
+    resize: int | bool | None | Unset = UNSET,
+    mode: ExtractionMethod | str | None = None,
+    sort_mode: Literal["luminance", "frequency"] | None = None,
+    alpha_mask_threshold: int | None = None,
+    time_budget: float | None = None,
+    preset: Preset | str | None = None,
+    max_pixels: int | None = None,
+    executor: Executor | None = None,
+    max_in_flight: int | None = None,
+    per_host_limit: int = 4,
+) -> list[BatchResult]:
+    """
+    Extract palettes from many images concurrently; see :func:`iter_extract_colors_async`.
+
+    Returns:
+        One :class:`~pylette.types.BatchResult` per input, in input order.
+
+    Examples:
+        >>> results = await batch_extract_colors_async(urls, palette_size=5, per_host_limit=2)
+    """
+    results: list[BatchResult | None] = [None] * len(images)
+    async for result in iter_extract_colors_async(
+        images,
+        palette_size=palette_size,
+        resize=resize,
+        mode=mode,
+        sort_mode=sort_mode,
+        alpha_mask_threshold=alpha_mask_threshold,
+        time_budget=time_budget,
+        preset=preset,
+        max_pixels=max_pixels,
+        executor=executor,
+        max_in_flight=max_in_flight,
+        per_host_limit=per_host_limit,
+    ):
+        assert result.index is not None
+        results[result.index] = result
+    return [r for r in results if r is not None]
@@ -0,0 +1,88 @@
+"""
+Adaptive concurrency for batch extraction (``max_workers="auto"``).
+
+The best number of concurrent extractions depends on the corpus: URLs are
+I/O-bound and want many more tasks in flight than there are cores, large local
+files are CPU-bound and slow down once the cores are oversubscribed. Instead
+of guessing, :class:`ConcurrencyTuner` measures throughput while the batch
+runs and hill-climbs towards the concurrency that maximizes it:
+
+* the batch runs in epochs of a few completions each, and every epoch's
+  throughput (completions per second) is compared with the previous one;
+* if throughput rose, the tuner takes another step in the same direction; if
+  it fell, it turns around; if it stayed flat (within ``tolerance``), it steps
+  down, preferring the smaller of two equally fast concurrencies.
+
+Steps are a quarter of the current limit (at least 1), so an I/O-bound batch
+climbs from the core count to dozens of tasks within a few epochs, and the
+limit settles into a small oscillation around the optimum.
+"""
+
+import time
+
+
+class ConcurrencyTuner:
+    """Hill-climbing controller for the number of concurrent extractions.
+
+    Parameters:
+        initial: Starting limit.
+        maximum: Upper bound on the limit (the pool size).
+        minimum: Lower bound on the limit.
+        tolerance: Relative throughput change treated as no change.
+
+    Examples:
+        >>> tuner = ConcurrencyTuner(initial=4, maximum=64)
+        >>> while work_left:
+        ...     run_up_to(tuner.limit)
+        ...     tuner.record()  # once per completed task
+    """
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1, tolerance: float = 0.1):
+        if not 1 <= minimum <= maximum:
+            raise ValueError(f"Need 1 <= minimum <= maximum, got minimum={minimum}, maximum={maximum}.")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.tolerance = tolerance
+        self.limit = min(max(initial, minimum), maximum)
+        self.history: list[int] = [self.limit]
+        """The limit at the start of every epoch, ending with the current one."""
+        self._direction = 1
+        self._previous: float | None = None
+        self._epoch_start: float | None = None
+        self._epoch_done = 0
+
+    def _epoch_size(self) -> int:
+        # Long enough that every slot completes about twice, so one slow task
+        # does not decide the measurement.
+        return max(4, 2 * self.limit)
+
+    def start(self, now: float | None = None) -> None:
+        """Start measuring; called when the first tasks are submitted."""
+        self._epoch_start = time.perf_counter() if now is None else now
+        self._epoch_done = 0
+
+    def record(self, completed: int = 1, now: float | None = None) -> None:
+        """Count ``completed`` finished tasks, adjusting the limit at the end of every epoch."""
+        now = time.perf_counter() if now is None else now
+        if self._epoch_start is None:
+            self.start(now)
+        assert self._epoch_start is not None
+        self._epoch_done += completed
+        if self._epoch_done < self._epoch_size():
+            return
+        elapsed = max(now - self._epoch_start, 1e-9)
+        throughput = self._epoch_done / elapsed
+        if self._previous is not None:
+            if throughput < self._previous * (1 - self.tolerance):
+                self._direction = -self._direction
+            elif throughput <= self._previous * (1 + self.tolerance):
+                self._direction = -1
+        self._previous = throughput
+        step = max(1, self.limit // 4)
+        self.limit = min(max(self.limit + self._direction * step, self.minimum), self.maximum)
+        if self.limit in (self.minimum, self.maximum):
+            # Pinned at a bound: the next step can only go the other way.
+            self._direction = 1 if self.limit == self.minimum else -1
+        self.history.append(self.limit)
+        self._epoch_start = now
+        self._epoch_done = 0
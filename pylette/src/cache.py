@@ -0,0 +1,360 @@
+"""
+Palette caches for :func:`~pylette.extract_colors` and the batch APIs.
+
+``extract_colors(image, cache=...)`` (and the batch APIs, which pass
+``cache`` on to every extraction) answers from the cache when it can and
+otherwise extracts and stores the palette; ``metadata["cached"]`` tells which
+it was. Two caches implement the :class:`ExtractionCache` protocol:
+
+* :class:`PaletteCache` is persistent and content-addressed. It hashes the
+  image content (see :func:`pylette.src.dedup.content_key`) and looks the
+  palette up under that digest plus the normalized extraction parameters, so
+  a renamed or re-downloaded image is still a hit and a file rewritten in
+  place is a miss. The store is a single SQLite file, safe to share between
+  threads and processes (every thread opens its own connection; SQLite
+  serializes the writes). Once its palettes take more than ``max_bytes``, the
+  least recently used are evicted. Entries are stored as JSON (every color's
+  float sRGB, opacity and frequency, plus the metadata), so reading a cache
+  file never runs code from it. Keys include the Pylette version, so an
+  upgrade starts from an empty cache.
+* :class:`MemoryPaletteCache` is an in-process LRU of local files' palettes,
+  keyed by path, size, modification time and parameters. Nothing is read to
+  look an image up, so a hit costs one ``stat``; the trade-off is that a file
+  rewritten with the same size and modification time is not noticed.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from copy import deepcopy
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Callable, Mapping, Protocol
+
+import numpy as np
+
+from pylette.src.color import Color
+from pylette.src.dedup import content_key
+from pylette.src.loaders import is_uri
+from pylette.src.palette import Palette
+from pylette.src.types import CacheStats, ExtractionMethod, ImageInput, PaletteMetaData, Preset, SourceType
+
+# Default limit on the size of the palettes a PaletteCache stores.
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_FILENAME = "palettes.sqlite3"
+
+# Evicting frees space down to this fraction of max_bytes, so that not every
+# insert into a full cache evicts.
+_EVICT_TO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS palettes (
+    key TEXT PRIMARY KEY,
+    palette BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS palettes_accessed ON palettes (accessed);
+"""
+
+
+def _pylette_version() -> str:
+    try:
+        return version("pylette")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+_VERSION = _pylette_version()
+
+
+def _params_key(params: Mapping[str, object]) -> str:
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def _json_default(value: object) -> object:
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _encode(palette: Palette) -> bytes:
+    """The stored form of ``palette``: its colors as float rows, so they round-trip exactly, and its metadata."""
+    metadata = None
+    if palette.metadata is not None:
+        metadata = {key: value for key, value in palette.metadata.items() if key != "cached"}
+    colors = [[*map(float, c.rgb_float), float(c.opacity), float(c.frequency)] for c in palette.colors]
+    return json.dumps({"colors": colors, "metadata": metadata}, default=_json_default).encode()
+
+
+def _decode(data: bytes) -> Palette:
+    """Rebuild a palette from :func:`_encode`'s form, restoring the enums and tuples JSON flattened."""
+    record = json.loads(data)
+    colors = [
+        Color.from_srgb_float((float(r), float(g), float(b)), float(frequency), alpha=float(alpha))
+        for r, g, b, alpha, frequency in record["colors"]
+    ]
+    metadata: PaletteMetaData | None = record["metadata"]
+    if metadata is not None:
+        metadata["source_type"] = SourceType(metadata["source_type"])
+        params = metadata["extraction_params"]
+        params["mode"] = ExtractionMethod(params["mode"])
+        if "preset" in params:
+            params["preset"] = Preset(params["preset"])
+        info = metadata["image_info"]
+        info["original_size"] = (info["original_size"][0], info["original_size"][1])
+        info["processed_size"] = (info["processed_size"][0], info["processed_size"][1])
+    return Palette(colors, metadata=metadata)
+
+
+class ExtractionCache(Protocol):
+    """Where :func:`~pylette.extract_colors` looks palettes up and stores them."""
+
+    def get_or_extract(
+        self, image: ImageInput, params: Mapping[str, object], extract: Callable[[ImageInput], Palette]
+    ) -> tuple[Palette, bool]:
+        """
+        Return the cached palette of ``image`` for ``params``, or ``extract`` one and store it.
+
+        ``extract`` may be given a different input with the same content (the
+        loaded bytes of a URL). Returns the palette, which the caller may
+        modify, and whether it came from the cache.
+        """
+        ...
+
+
+class PaletteCache:
+    """
+    Palettes stored on disk under a digest of the image content and extraction parameters.
+
+    Parameters:
+        directory: Where the cache file lives; created if missing.
+        max_bytes: Size of the stored palettes above which the least recently
+            used are evicted.
+
+    Raises:
+        ValueError: If ``max_bytes`` is not positive.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be a positive int, got {max_bytes!r}.")
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connection().executescript(_SCHEMA)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Connections stay behind; a worker process opens its own.
+        return {"directory": self.directory, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.directory = state["directory"]
+        self.max_bytes = state["max_bytes"]
+        self._local = threading.local()
+
+    @property
+    def path(self) -> Path:
+        """The SQLite file."""
+        return self.directory / _FILENAME
+
+    def _connection(self) -> sqlite3.Connection:
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @staticmethod
+    def key(digest: str, params: Mapping[str, object]) -> str:
+        """The cache key of an image with content ``digest`` extracted with ``params``."""
+        normalized = f"{digest}:{_VERSION}:{_params_key(params)}"
+        return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+    def get_or_extract(
+        self, image: ImageInput, params: Mapping[str, object], extract: Callable[[ImageInput], Palette]
+    ) -> tuple[Palette, bool]:
+        digest, payload = content_key(image)  # for a URI, the payload is the loaded image
+        key = self.key(digest, params) if digest is not None else None
+        palette = self.get(key) if key is not None else None
+        if palette is not None:
+            return palette, True
+        palette = extract(payload)
+        if key is not None:
+            self.put(key, palette)
+        return palette, False
+
+    def get(self, key: str) -> Palette | None:
+        """The palette stored under ``key``, or ``None``."""
+        try:
+            connection = self._connection()
+            row = connection.execute("SELECT palette FROM palettes WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE palettes SET accessed = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error as e:
+            warnings.warn(f"Palette cache {self.path} is unavailable: {e}", RuntimeWarning, stacklevel=2)
+            return None
+        try:
+            return _decode(row[0])
+        except Exception:
+            return None  # written by an incompatible version
+
+    def put(self, key: str, palette: Palette) -> None:
+        """Store ``palette`` under ``key``, evicting the least recently used palettes if the cache is full."""
+        data = _encode(palette)
+        try:
+            connection = self._connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO palettes (key, palette, size, accessed) VALUES (?, ?, ?, ?)",
+                    (key, data, len(data), time.time()),
+                )
+                self._evict(connection)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            warnings.warn(f"Palette cache {self.path} is unavailable: {e}", RuntimeWarning, stacklevel=2)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        (total,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM palettes").fetchone()
+        if total <= self.max_bytes:
+            return
+        evicted: list[tuple[str]] = []
+        for key, size in connection.execute("SELECT key, size FROM palettes ORDER BY accessed"):
+            if total <= self.max_bytes * _EVICT_TO:
+                break
+            evicted.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM palettes WHERE key = ?", evicted)
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM palettes").fetchone()[0]
+
+    @property
+    def size_bytes(self) -> int:
+        """Size of the stored palettes."""
+        return self._connection().execute("SELECT COALESCE(SUM(size), 0) FROM palettes").fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove every stored palette."""
+        self._connection().execute("DELETE FROM palettes")
+
+    def close(self) -> None:
+        """Close the calling thread's connection; the cache reopens it when used again."""
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+def _copy(palette: Palette) -> Palette:
+    return Palette(list(palette.colors), metadata=deepcopy(palette.metadata))
+
+
+class MemoryPaletteCache:
+    """
+    An in-process, thread-safe LRU cache of the palettes of local image files.
+
+    Palettes are keyed by the file's path, size and modification time and the
+    extraction parameters; a file that changed on disk is extracted again.
+    Other inputs (URLs, archive members, bytes, arrays, PIL images) are
+    extracted without the cache. The cache lives in this process: with the
+    ``processes`` backend every extraction gets an empty copy, so use it with
+    threads.
+
+    Parameters:
+        max_palettes: Most palettes kept; the least recently used are evicted.
+
+    Raises:
+        ValueError: If ``max_palettes`` is not positive.
+    """
+
+    def __init__(self, max_palettes: int = 1024):
+        if max_palettes < 1:
+            raise ValueError(f"max_palettes must be a positive int, got {max_palettes!r}.")
+        self.max_palettes = max_palettes
+        self._lock = threading.Lock()
+        # (path, parameters) -> ((size, mtime), palette); a file has one entry
+        # per parameter set, replaced when the file changes.
+        self._entries: OrderedDict[tuple[str, str], tuple[tuple[int, int], Palette]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"max_palettes": self.max_palettes}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["max_palettes"])
+
+    @staticmethod
+    def _stamp(path: str) -> tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def get_or_extract(
+        self, image: ImageInput, params: Mapping[str, object], extract: Callable[[ImageInput], Palette]
+    ) -> tuple[Palette, bool]:
+        if not isinstance(image, (str, Path)) or is_uri(image):
+            return extract(image), False
+        path = os.path.abspath(image)
+        try:
+            stamp = self._stamp(path)
+        except OSError:
+            return extract(image), False  # the extraction reports it
+        key = (path, _params_key(params))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return _copy(entry[1]), True
+            self._misses += 1
+        palette = extract(image)
+        try:
+            changed = self._stamp(path) != stamp
+        except OSError:
+            changed = True
+        if not changed:  # else the palette may be of either version
+            with self._lock:
+                self._entries[key] = (stamp, _copy(palette))
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_palettes:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return palette, False
+
+    def invalidate(self, path: str | Path | None = None) -> None:
+        """Drop the palettes of ``path`` (for every parameter set), or every palette if ``path`` is ``None``."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            target = os.path.abspath(path)
+            for key in [key for key in self._entries if key[0] == target]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hits, misses and evictions so far, and the number of palettes held."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits, misses=self._misses, evictions=self._evictions, palettes=len(self._entries)
+            )
@@ -1,44 +1,84 @@
+import os
+import threading
 import time
-import urllib.parse
 import warnings
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from copy import deepcopy
 from datetime import datetime
+from functools import partial
 from io import BytesIO
 from pathlib import Path
-from typing import Callable, Literal, Sequence
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Literal, Mapping, Sequence, overload
 
 import numpy as np
+from numpy.typing import ArrayLike, NDArray
 from PIL import Image
 
-from pylette.src.exceptions import InvalidImageError, NoValidPixelsError, UnknownExtractionMethodError
+from pylette.src.archives import split_member
+from pylette.src.autotune import ConcurrencyTuner
+from pylette.src.color import Color
+from pylette.src.colorspaces import linear_srgb_to_oklab, linear_to_srgb, oklab_to_linear_srgb, srgb_to_linear
+from pylette.src.dedup import iter_content_keys
+from pylette.src.exceptions import (
+    ExtractionTimeoutError,
+    ImageTooLargeError,
+    InvalidImageError,
+    NoValidPixelsError,
+    UnknownExtractionMethodError,
+)
+from pylette.src.extractors.clustering import batched_kmeans
+from pylette.src.extractors.protocol import RefinableColorExtractor
 from pylette.src.extractors.registry import get_extractor
+from pylette.src.fetch import fetch_image_bytes
+from pylette.src.files import open_file
+from pylette.src.loaders import ImageLoader, is_uri, loader_for, open_uri
 from pylette.src.palette import Palette
+from pylette.src.presets import resolve_preset
 from pylette.src.types import (
+    UNSET,
+    Backend,
     BatchResult,
+    BatchStats,
     ExtractionMethod,
     ExtractionParams,
     ImageInfo,
     ImageInput,
+    PaletteArrays,
     PaletteMetaData,
     PILImage,
+    Preset,
     ProcessingStats,
+    RefinementInfo,
+    Schedule,
     SourceType,
+    Unset,
     coerce_to_enum,
 )
 
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+    from pylette.src.cache import ExtractionCache
+
+# Sample size of an extraction when neither the caller nor a preset sets one.
+DEFAULT_RESIZE = 256
 
-def _is_url(image_str: str) -> bool:
-    """Check if a string is a valid URL."""
+
+def _open_local(path: str | Path) -> PILImage:
+    """Open a local file lazily, on a file handle the returned image owns."""
+    f = open_file(path)
     try:
-        result = urllib.parse.urlparse(image_str)
-        return all([result.scheme, result.netloc])
-    except Exception:
-        return False
+        return Image.open(f)
+    except BaseException:
+        f.close()
+        raise
 
 
 def _normalize_image_input(image: ImageInput) -> PILImage:
     """Convert any valid image input to a PIL Image.
 
+    Local files are opened lazily and stay open until the image is closed.
     Any failure to load (unsupported type, missing file, corrupt data, a URL that
     is not an image) is surfaced as :class:`InvalidImageError`.
     """
@@ -46,11 +86,10 @@ def _normalize_image_input(image: ImageInput) -> PILImage:
         if isinstance(image, Image.Image):
             return image
         elif isinstance(image, (str, Path)):
-            image_str = str(image)
-            if _is_url(image_str):
-                return request_image(image_str)
-            else:
-                return Image.open(image)
+            loader = loader_for(image)
+            if loader is not None:
+                return open_uri(str(image), loader)
+            return _open_local(image)
         elif isinstance(image, bytes):
             return Image.open(BytesIO(image))
         elif hasattr(image, "__array__"):  # More general check for array-like objects
@@ -59,6 +98,8 @@ def _normalize_image_input(image: ImageInput) -> PILImage:
             raise InvalidImageError(f"Unsupported image type: {type(image)}")
     except InvalidImageError:
         raise
+    except Image.DecompressionBombError as e:
+        raise ImageTooLargeError(f"Could not load image: {e}") from e
     except Exception as e:
         raise InvalidImageError(f"Could not load image: {e}") from e
 
@@ -67,8 +108,9 @@ def _get_source_type_from_image_input(image: ImageInput) -> SourceType:
     if isinstance(image, Image.Image):
         source_type = SourceType.PIL_IMAGE
     elif isinstance(image, (str, Path)):
-        image_str = str(image)
-        if _is_url(image_str):
+        if split_member(image) is not None:
+            source_type = SourceType.ARCHIVE_MEMBER
+        elif is_uri(image):
             source_type = SourceType.URL
         else:
             source_type = SourceType.FILE_PATH
@@ -81,9 +123,10 @@ def _get_source_type_from_image_input(image: ImageInput) -> SourceType:
     return source_type
 
 
-def _get_descriptive_image_source(image: ImageInput, pil_image: PILImage) -> str:
+def _get_descriptive_image_source(image: ImageInput, pil_image: PILImage | None = None) -> str:
     """Generate a descriptive image source string for metadata."""
     if isinstance(image, Image.Image):
+        pil_image = pil_image or image
         return f"<pil_image: {pil_image.size[0]}x{pil_image.size[1]} {pil_image.mode}>"
     elif isinstance(image, (str, Path)):
         return str(image)
@@ -96,13 +139,16 @@ def _get_descriptive_image_source(image: ImageInput, pil_image: PILImage) -> str
         return f"<unknown: {type(image).__name__}>"
 
 
-def _resolve_resize(resize: int | bool | None) -> int | None:
-    """Normalize the ``resize`` argument to a pixel sample size or ``None``.
+def _resolve_resize(resize: int | bool | None | Unset) -> int | None | Unset:
+    """Normalize the ``resize`` argument to a pixel sample size, ``None`` or ``UNSET``.
 
     Accepts an ``int`` sample size (the image is resized to ``(resize, resize)``
-    before sampling), ``None`` (no resize, sample the full image), or a
-    deprecated ``bool`` (``True`` -> 256, ``False`` -> ``None``).
+    before sampling), ``None`` (no resize, sample the full image), ``UNSET``
+    (left to the preset, else :data:`DEFAULT_RESIZE`), or a deprecated ``bool``
+    (``True`` -> 256, ``False`` -> ``None``).
     """
+    if resize is UNSET:
+        return resize
     if isinstance(resize, bool):
         warnings.warn(
             "Passing a bool for `resize` is deprecated and will be removed; pass an int "
@@ -117,68 +163,984 @@ def _resolve_resize(resize: int | bool | None) -> int | None:
     return resize
 
 
+def _check_max_pixels_arg(max_pixels: int | None) -> None:
+    if max_pixels is not None and max_pixels < 1:
+        raise ValueError(f"max_pixels must be a positive int or None, got {max_pixels!r}.")
+
+
+def check_max_pixels(img: PILImage, max_pixels: int | None) -> None:
+    """Reject ``img`` if it has more than ``max_pixels`` pixels.
+
+    Only the size is read, so for an image just opened from a file, bytes or a
+    URL the check runs on the header, before any pixel data is decoded.
+
+    Raises:
+        ImageTooLargeError: If the image has more than ``max_pixels`` pixels.
+    """
+    _check_size(img.size, max_pixels)
+
+
+def _check_size(size: tuple[int, int], max_pixels: int | None) -> None:
+    if max_pixels is not None and size[0] * size[1] > max_pixels:
+        raise ImageTooLargeError(f"Image of {size[0]}x{size[1]} pixels exceeds the limit of {max_pixels:,} pixels.")
+
+
+def _prepare_image(
+    image: ImageInput, max_pixels: int | None = None
+) -> tuple[SourceType, PILImage, PILImage, ImageInfo]:
+    """Load ``image`` and convert it to RGBA.
+
+    Returns:
+        The source type, the image as loaded, its RGBA conversion, and the
+        image info (``processed_size`` is the full size until sampling sets it).
+
+    Raises:
+        ImageTooLargeError: If the image has more than ``max_pixels`` pixels
+            (checked before it is decoded).
+    """
+    source_type = _get_source_type_from_image_input(image)
+    img_obj = _normalize_image_input(image)
+    try:
+        check_max_pixels(img_obj, max_pixels)
+        img = img_obj.convert("RGBA")  # decodes a lazily opened image
+    except ImageTooLargeError:
+        raise
+    except Exception as e:
+        raise InvalidImageError(f"Could not load image: {e}") from e
+    finally:
+        if img_obj is not image:
+            # Release the file now rather than when the garbage collector gets
+            # to it; size, format and info remain readable.
+            img_obj.close()
+    image_info = ImageInfo(
+        original_size=img_obj.size,
+        processed_size=img.size,
+        format=getattr(img_obj, "format", None),
+        mode=img.mode,
+        has_alpha=img.mode in ("RGBA", "LA") or "transparency" in img_obj.info,
+    )
+    return source_type, img_obj, img, image_info
+
+
+def _sample_valid_pixels(
+    img: PILImage, resize: int | None, alpha_mask_threshold: int
+) -> tuple[NDArray[np.uint8], tuple[int, int]]:
+    """Resize an RGBA image to ``(resize, resize)`` (unless ``None``) and drop alpha-masked pixels.
+
+    Returns:
+        The ``(n, 4)`` valid pixels and the sampled image size.
+
+    Raises:
+        NoValidPixelsError: If no pixels remain after alpha masking.
+    """
+    if resize is not None:
+        img = img.resize((resize, resize))
+
+    arr = np.asarray(img)
+    alpha_mask = arr[:, :, 3] <= alpha_mask_threshold
+    valid_pixels = arr[~alpha_mask]
+
+    if len(valid_pixels) == 0:
+        raise NoValidPixelsError(
+            f"No valid pixels remain after applying alpha mask with threshold {alpha_mask_threshold}. "
+            f"Try using a lower alpha-mask-threshold value or check if your image has transparency."
+        )
+    return valid_pixels, img.size
+
+
+def _sort_colors(colors: list[Color], sort_mode: Literal["luminance", "frequency"] | None) -> None:
+    if colors:
+        if sort_mode == "luminance":
+            colors.sort(key=lambda c: c.luminance, reverse=False)
+        else:
+            colors.sort(reverse=True)
+
+
+def _build_metadata(
+    image: ImageInput,
+    img_obj: PILImage,
+    source_type: SourceType,
+    extraction_params: ExtractionParams,
+    image_info: ImageInfo,
+    valid_pixels: int,
+    start_time: float,
+) -> PaletteMetaData:
+    width, height = image_info["processed_size"]
+    return PaletteMetaData(
+        image_source=_get_descriptive_image_source(image, img_obj),
+        source_type=source_type,
+        extraction_params=extraction_params,
+        image_info=image_info,
+        processing_stats=ProcessingStats(
+            total_pixels=width * height,
+            valid_pixels=valid_pixels,
+            extraction_time=time.time() - start_time,
+            timestamp=datetime.now().isoformat(),
+        ),
+    )
+
+
+def _result_for(result: BatchResult, image: ImageInput, index: int) -> BatchResult:
+    """``result``, given to ``image`` at ``index``: an input with the same content."""
+    palette = result.result
+    if palette is None:
+        return BatchResult(source=image, exception=result.exception, index=index)
+    copy = Palette(list(palette.colors), metadata=deepcopy(palette.metadata))
+    if copy.metadata is not None:
+        copy.metadata["image_source"] = _get_descriptive_image_source(image)
+        copy.metadata["source_type"] = _get_source_type_from_image_input(image)
+    return BatchResult(source=image, result=copy, index=index)
+
+
+def restore_source_metadata(palette: Palette, image: ImageInput, decoded: PILImage) -> None:
+    """Describe ``image`` in the metadata of a palette extracted from ``decoded``, its decoded copy."""
+    if palette.metadata is not None:
+        palette.metadata["image_source"] = _get_descriptive_image_source(image, decoded)
+        palette.metadata["source_type"] = _get_source_type_from_image_input(image)
+
+
+def _extract_cached(
+    cache: "ExtractionCache",
+    image: ImageInput,
+    extract: Callable[[ImageInput], Palette],
+    params: Mapping[str, object],
+    max_pixels: int | None,
+) -> Palette:
+    """Answer ``image`` from ``cache`` if it can, else ``extract`` it and store the palette."""
+    palette, hit = cache.get_or_extract(image, params, extract)
+    if palette.metadata is not None:
+        if hit:
+            _check_size(palette.metadata["image_info"]["original_size"], max_pixels)
+        palette.metadata["image_source"] = _get_descriptive_image_source(image)
+        palette.metadata["source_type"] = _get_source_type_from_image_input(image)
+        palette.metadata["cached"] = hit
+    return palette
+
+
+# Side of the coarsest sample in progressive extraction; every further level
+# doubles it until the requested sample size is reached.
+_PROGRESSIVE_MIN_SAMPLE = 32
+
+
+def _resolve_mode(mode: ExtractionMethod | str | None) -> ExtractionMethod | None:
+    return coerce_to_enum(mode, ExtractionMethod, error_cls=UnknownExtractionMethodError) if mode is not None else None
+
+
+def _default_settings(mode: ExtractionMethod | None, resize: int | None | Unset) -> tuple[ExtractionMethod, int | None]:
+    """Fill in the ``mode`` and ``resize`` the caller left unset with the defaults."""
+    return (mode if mode is not None else ExtractionMethod.KM), (DEFAULT_RESIZE if resize is UNSET else resize)
+
+
+def _apply_preset(
+    preset: Preset | None,
+    img: PILImage,
+    palette_size: int,
+    mode: ExtractionMethod | None,
+    resize: int | None | Unset,
+) -> tuple[ExtractionMethod, int | None]:
+    """Settle ``mode`` and ``resize`` for ``img``: values the caller passed win over ``preset``, then the defaults."""
+    if preset is not None and (mode is None or resize is UNSET):
+        settings = resolve_preset(preset, img, palette_size)
+        if mode is None:
+            mode = settings.mode
+        if resize is UNSET:
+            resize = settings.resize
+    return _default_settings(mode, resize)
+
+
+def _refinement_levels(resize: int | None, size: tuple[int, int]) -> list[int | None]:
+    """The sample size of every progressive refinement level, ending with ``resize`` itself."""
+    final = resize if resize is not None else max(size)
+    levels: list[int | None] = []
+    side = _PROGRESSIVE_MIN_SAMPLE
+    while side < final:
+        levels.append(side)
+        side *= 2
+    levels.append(resize)
+    return levels
+
+
 def batch_extract_colors(
     images: Sequence[ImageInput],
     palette_size: int = 5,
-    resize: int | bool | None = 256,
-    mode: ExtractionMethod | str = ExtractionMethod.KM,
+    resize: int | bool | None | Unset = UNSET,
+    mode: ExtractionMethod | str | None = None,
     sort_mode: Literal["luminance", "frequency"] | None = None,
     alpha_mask_threshold: int | None = None,
-    max_workers: int | None = None,
+    max_workers: int | Literal["auto"] | None = None,
     progress_callback: Callable[[int, BatchResult], None] | None = None,
+    time_budget: float | None = None,
+    preset: Preset | str | None = None,
+    backend: Backend | str | Executor = Backend.THREADS,
+    max_in_flight: int | None = None,
+    cancel: threading.Event | None = None,
+    native_threads: int | None = None,
+    schedule: Schedule | str = Schedule.INPUT,
+    stats: BatchStats | None = None,
+    timeout: float | None = None,
+    max_pixels: int | None = None,
+    dedupe: bool = False,
+    cache: "ExtractionCache | None" = None,
 ) -> list[BatchResult]:
     """Extract colors from multiple images in parallel.
 
+    Returns one :class:`~pylette.types.BatchResult` per input, in input order.
+    For very large or lazily produced inputs, :func:`iter_extract_colors`
+    streams results instead of holding them all.
+
     Args:
+        max_workers: Number of workers; ``None`` uses the executor's default.
+            ``"auto"`` tunes the number of concurrent extractions while the
+            batch runs, climbing towards the highest measured throughput (see
+            :mod:`pylette.src.autotune`): high for I/O-bound inputs such as
+            URLs, about the core count for CPU-bound ones.
         progress_callback: Optional callback function called when each task completes.
                          Receives (task_number, result) as arguments.
+        time_budget: Optional per-image time budget in seconds, see :func:`extract_colors`.
+        preset: Optional speed/quality preset, resolved per image, see :func:`extract_colors`.
+        backend: Where extractions run: ``"threads"`` (default), ``"processes"``
+            (warm-started worker processes), or an existing
+            :class:`~concurrent.futures.Executor`, which is used as-is and left running. Results, exceptions and
+            ``progress_callback`` (always invoked in the calling thread) behave
+            the same on every backend. Process workers receive NumPy and PIL
+            inputs through shared memory. See :mod:`pylette.src.executors`.
+        max_in_flight: Maximum number of images submitted but not yet finished;
+            defaults to twice the number of workers.
+        cancel: Optional event; once set, no further images are started, queued
+            ones are dropped, and the results completed so far are returned
+            (so fewer results than inputs; check ``BatchResult.index``).
+        native_threads: Maximum number of OpenMP/BLAS threads each extraction may
+            start (scikit-learn's k-means is multi-threaded). Defaults to the CPU
+            count divided by the number of workers, so workers do not
+            oversubscribe the cores.
+        schedule: Submission order. ``"input"`` (default) submits in input
+            order. ``"largest_first"`` starts the images predicted to be most
+            expensive first, from their header (dimensions, format and file
+            size; see :mod:`pylette.src.scheduling`), so a large image late in
+            the batch does not run alone at the end; the headers are read
+            before the first image is submitted. Either way, results are returned
+            in input order, with ``index`` the input position; only the order
+            of ``progress_callback`` calls differs.
+        stats: Optional :class:`~pylette.types.BatchStats` that is updated with
+            the number of finished images, the elapsed time and the concurrency
+            (with ``max_workers="auto"``, the tuned limit and its history).
+        timeout: Optional time limit in seconds for each image, counted from
+            when a worker starts it. An image that exceeds it gets a result
+            carrying :class:`~pylette.ExtractionTimeoutError` and the batch
+            moves on: process workers running it are killed and replaced (the
+            other images they were running are restarted), while threads cannot
+            be interrupted, so the extraction is left to
+            finish in the background and an owned pool is replaced to keep the
+            worker count.
+        max_pixels: Optional maximum number of pixels per image, checked from
+            the header before decoding; larger images get a result carrying
+            :class:`~pylette.ImageTooLargeError`.
+        dedupe: Hash every input's content first (file and URL bytes, pixel
+            buffers; see :mod:`pylette.src.dedup`) and extract each distinct
+            image once. Inputs with the same content all get a result, each
+            with its own ``source``, ``index`` and a copy of the palette whose
+            metadata describes that input. URLs are then downloaded once,
+            while hashing. Inputs are hashed a bounded window ahead of the
+            extractions and each distinct image is submitted as soon as it is
+            hashed, so only a few downloads are held at a time; with
+            ``schedule="largest_first"`` every input is hashed, and every
+            distinct URL downloaded and held, before the first is submitted.
+        cache: Optional palette cache, consulted by every
+            extraction (see :func:`extract_colors`); ``stats.cache_hits``
+            counts the images answered from it.
+
+    Raises:
+        ValueError: If ``backend`` or ``schedule`` is unknown, or
+            ``max_in_flight``, ``native_threads``, ``timeout`` or ``max_pixels``
+            is not positive.
     """
+    from pylette.src.scheduling import largest_first
 
     resize = _resolve_resize(resize)
+    results: list[BatchResult | None] = [None] * len(images)
+    task_number = 0
 
-    def thread_fn(image: ImageInput):
-        return extract_colors(
-            image=image,
-            palette_size=palette_size,
-            resize=resize,
-            mode=mode,
-            sort_mode=sort_mode,
-            alpha_mask_threshold=alpha_mask_threshold,
-        )
+    def record(result: BatchResult) -> None:
+        nonlocal task_number
+        assert result.index is not None
+        results[result.index] = result
+        task_number += 1
+        if progress_callback:
+            progress_callback(task_number, result)
 
-    results: list[BatchResult] = []
-    task_number = 1
+    # The distinct images to extract, and the input position of each.
+    work: Iterable[ImageInput] = images
+    positions: Sequence[int] = range(len(images))
+    # Input positions answered by the extraction of an earlier input that is
+    # still running.
+    duplicates: dict[int, list[int]] = {}
+    if dedupe:
+        positions = []
+        if stats is not None:
+            stats.duplicates = 0
+
+        def distinct() -> Iterator[ImageInput]:
+            # Pulled by iter_extract_colors as it submits, so every distinct
+            # image is extracted as soon as it is hashed and a duplicate's
+            # download is dropped at once.
+            first: dict[str, int] = {}
+            for i, (key, payload) in enumerate(iter_content_keys(images)):
+                if key is None or key not in first:
+                    if key is not None:
+                        first[key] = i
+                    positions.append(i)
+                    yield payload
+                    continue
+                if stats is not None:
+                    stats.duplicates += 1
+                original = results[first[key]]
+                if original is None:
+                    duplicates.setdefault(first[key], []).append(i)
+                else:
+                    record(_result_for(original, images[i], i))
 
-    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pylette") as executor:
-        futures_to_image_map = {executor.submit(thread_fn, image): image for image in images}
+        work = distinct()
 
-        for future in as_completed(futures_to_image_map):
-            source_image = futures_to_image_map[future]
+    order: list[int] | None = None
+    if coerce_to_enum(schedule, Schedule) is Schedule.LARGEST_FIRST:
+        work = ranked = list(work)
+        if len(ranked) > 1:
             try:
-                r = future.result()
-                batch_result = BatchResult(source=source_image, result=r)
-                results.append(batch_result)
-                if progress_callback:
-                    progress_callback(task_number, batch_result)
-            except Exception as e:
-                batch_result = BatchResult(source=source_image, exception=e)
-                results.append(batch_result)
+                method, sample_size = _default_settings(_resolve_mode(mode), resize)
+            except ValueError:
+                # The unknown mode is reported per image.
+                method, sample_size = _default_settings(None, resize)
+            order = largest_first(ranked, method, palette_size, sample_size)
+            work = [ranked[i] for i in order]
+
+    def finish(_: int, result: BatchResult) -> None:
+        # Runs on every result before it is yielded: map the submitted position
+        # back to the input position and answer the input's duplicates.
+        assert result.index is not None
+        index = positions[order[result.index] if order is not None else result.index]
+        image = images[index]
+        if result.source is not image:
+            # Extracted from the downloaded bytes of a URL; describe the URL.
+            result = _result_for(result, image, index)
+        result.index = index
+        record(result)
+        for i in duplicates.pop(index, []):
+            record(_result_for(result, images[i], i))
+
+    for _ in iter_extract_colors(
+        work,
+        palette_size=palette_size,
+        resize=resize,
+        mode=mode,
+        sort_mode=sort_mode,
+        alpha_mask_threshold=alpha_mask_threshold,
+        max_workers=max_workers,
+        progress_callback=finish,
+        time_budget=time_budget,
+        preset=preset,
+        backend=backend,
+        max_in_flight=max_in_flight,
+        cancel=cancel,
+        native_threads=native_threads,
+        stats=stats,
+        timeout=timeout,
+        max_pixels=max_pixels,
+        cache=cache,
+    ):
+        pass
+    return [r for r in results if r is not None]
+
+
+def _limited_loader(image: ImageInput) -> ImageLoader | None:
+    """The loader of ``image`` if it limits its concurrency."""
+    try:
+        loader = loader_for(image)
+    except InvalidImageError:
+        return None  # the extraction reports it
+    return loader if loader is not None and loader.max_concurrency is not None else None
+
+
+# Default in-flight window of ``iter_extract_colors`` per worker: enough to keep
+# every worker busy while bounding how many inputs and results are alive at once.
+_IN_FLIGHT_PER_WORKER = 2
+
+# How often ``iter_extract_colors`` checks its cancel event while waiting.
+_CANCEL_POLL_SECONDS = 0.05
+
+# Pool sizes with ``max_workers="auto"``: the most concurrent extractions the
+# tuner may choose. Threads go far beyond the core count for I/O-bound inputs.
+_AUTO_MAX_THREADS = 64
+_AUTO_PROCESSES_PER_CPU = 2
+
+
+def iter_extract_colors(
+    images: Iterable[ImageInput],
+    palette_size: int = 5,
+    resize: int | bool | None | Unset = UNSET,
+    mode: ExtractionMethod | str | None = None,
+    sort_mode: Literal["luminance", "frequency"] | None = None,
+    alpha_mask_threshold: int | None = None,
+    max_workers: int | Literal["auto"] | None = None,
+    progress_callback: Callable[[int, BatchResult], None] | None = None,
+    time_budget: float | None = None,
+    preset: Preset | str | None = None,
+    backend: Backend | str | Executor = Backend.THREADS,
+    max_in_flight: int | None = None,
+    cancel: threading.Event | None = None,
+    native_threads: int | None = None,
+    ordered: bool = False,
+    stats: BatchStats | None = None,
+    timeout: float | None = None,
+    max_pixels: int | None = None,
+    cache: "ExtractionCache | None" = None,
+) -> Iterator[BatchResult]:
+    """
+    Extract colors from a stream of images in parallel, yielding results as they finish.
+
+    ``images`` may be any iterable, including a lazy generator: it is consumed
+    only as workers free up (backpressure), and at most ``max_in_flight``
+    inputs are submitted at any time. Each result is yielded as soon as it is
+    ready and the pipeline keeps no reference to it or to its input afterwards,
+    so memory stays flat however many images are processed.
+
+    Stopping is prompt: when ``cancel`` is set, or a ``KeyboardInterrupt``
+    arrives while waiting, queued images are dropped and the generator ends
+    (or re-raises) without waiting for the images still being extracted.
+    Closing the generator early also drops queued images, but waits for
+    running ones.
+
+    Parameters:
+        images: The input images; any iterable of :func:`extract_colors` inputs.
+        max_in_flight: Maximum number of images submitted but not yet yielded;
+            defaults to twice the number of workers. With ``max_workers="auto"``
+            the tuned limit is used instead, capped by ``max_in_flight``.
+        cancel: Optional event that stops the run once set.
+        ordered: Yield results in input order instead of completion order.
+            Results that finish early are held back until their predecessors
+            are done, and count towards ``max_in_flight``.
+        **kwargs: Every other parameter is as in :func:`batch_extract_colors`.
+
+    Yields:
+        BatchResult: One result per input, with ``index`` set to the input's
+        position in ``images``. Failed extractions carry their exception.
+
+    Raises:
+        ValueError: If ``backend`` is unknown, or ``max_in_flight``,
+            ``native_threads``, ``timeout`` or ``max_pixels`` is not positive.
+
+    Examples:
+        >>> paths = Path("photos").rglob("*.jpg")
+        >>> for result in iter_extract_colors(paths, palette_size=8):
+        ...     save(result.index, result.palette)
+    """
+    from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+
+    from pylette.src.executors import (
+        CompactPalette,
+        SharedImage,
+        create_executor,
+        extract_compact,
+        limit_native_threads,
+        native_threads_for,
+        release_block,
+        share_image,
+        terminate_workers,
+        warm_imports,
+    )
+
+    resize = _resolve_resize(resize)
+    if max_in_flight is not None and max_in_flight < 1:
+        raise ValueError(f"max_in_flight must be a positive int or None, got {max_in_flight!r}.")
+    if native_threads is not None and native_threads < 1:
+        raise ValueError(f"native_threads must be a positive int or None, got {native_threads!r}.")
+    if timeout is not None and timeout <= 0:
+        raise ValueError(f"timeout must be a positive number of seconds, got {timeout!r}.")
+    _check_max_pixels_arg(max_pixels)
+    extract = partial(
+        extract_colors,
+        palette_size=palette_size,
+        resize=resize,
+        mode=mode,
+        sort_mode=sort_mode,
+        alpha_mask_threshold=alpha_mask_threshold,
+        time_budget=time_budget,
+        preset=preset,
+        max_pixels=max_pixels,
+        cache=cache,
+    )
+    owned = not isinstance(backend, Executor)
+    tuner: ConcurrencyTuner | None = None
+    pool_size: int | None
+    if isinstance(max_workers, str):
+        if max_workers != "auto":
+            raise ValueError(f"max_workers must be a positive int, 'auto' or None, got {max_workers!r}.")
+        # The pool is sized for the largest concurrency the tuner may choose;
+        # idle pool threads cost nothing, the tuner limits what runs.
+        cpus = os.cpu_count() or 1
+        if isinstance(backend, Executor):
+            size: int = getattr(backend, "_max_workers", None) or cpus
+        elif coerce_to_enum(backend, Backend) is Backend.THREADS:
+            size = _AUTO_MAX_THREADS
+        else:
+            size = _AUTO_PROCESSES_PER_CPU * cpus
+        tuner = ConcurrencyTuner(initial=min(cpus, size), maximum=min(size, max_in_flight or size))
+        pool_size = size
+    else:
+        pool_size = max_workers
+    # Default pools have about one worker per core, so one native thread each.
+    native_threads = native_threads or native_threads_for(
+        pool_size or getattr(backend, "_max_workers", None) or os.cpu_count() or 1
+    )
+    extract = limit_native_threads(extract, native_threads)
+    executor = create_executor(coerce_to_enum(backend, Backend), pool_size, native_threads) if owned else backend
+    # Process workers get in-memory images through shared memory and send
+    # palettes back compactly, so no full frame is pickled either way.
+    in_processes = isinstance(executor, ProcessPoolExecutor)
+    if timeout is not None and not in_processes:
+        # Import up front, so that the first tasks are not timed out for it.
+        warm_imports()
+    workers = pool_size or getattr(executor, "_max_workers", None) or os.cpu_count() or 1
+    window = max_in_flight or _IN_FLIGHT_PER_WORKER * workers
+
+    def has_room() -> bool:
+        queued = len(pending) + len(held) + sum(map(len, waiting.values()))
+        if tuner is None:
+            return queued < window
+        # Tuned: the limit counts running tasks only, so held-back ordered
+        # results do not look like lost throughput; they are bounded separately.
+        return len(pending) < tuner.limit and queued < window
+
+    started = time.perf_counter()
+    if stats is not None:
+        stats.workers = tuner.limit if tuner is not None else workers
+
+    inputs = enumerate(images)
+    # Futures map to input positions: inputs need not be hashable or distinct.
+    pending: dict[Future[Any], tuple[int, ImageInput, tuple["SharedMemory", SharedImage] | None]] = {}
+    # With a timeout: when each pending task was first seen running.
+    running_since: dict[Future[Any], float] = {}
+    # Inputs whose loader is at its ``max_concurrency``, in input order, and
+    # the tasks each such loader has pending (see :mod:`pylette.src.loaders`).
+    waiting: dict[ImageLoader, deque[tuple[int, ImageInput]]] = {}
+    loading: dict[Future[Any], ImageLoader] = {}
+    held: dict[int, BatchResult] = {}
+    next_index = 0
+    task_number = 1
+    tuning = False
+
+    def submit(index: int, image: ImageInput, shared: tuple["SharedMemory", SharedImage] | None) -> None:
+        nonlocal tuning
+        if tuner is not None and not tuning:
+            # The first epoch counts from the first submission, so it includes
+            # the first tasks' latency.
+            tuner.start()
+            tuning = True
+        if in_processes:
+            future = executor.submit(extract_compact, extract, shared[1] if shared else image)
+        else:
+            future = executor.submit(extract, image)
+        pending[future] = (index, image, shared)
+        loader = _limited_loader(image)
+        if loader is not None:
+            loading[future] = loader
+
+    def pop(future: Future[Any]) -> tuple[int, ImageInput, tuple["SharedMemory", SharedImage] | None]:
+        running_since.pop(future, None)
+        loading.pop(future, None)
+        return pending.pop(future)
+
+    def has_slot(loader: ImageLoader) -> bool:
+        assert loader.max_concurrency is not None
+        return sum(1 for busy in loading.values() if busy is loader) < loader.max_concurrency
+
+    def submit_next() -> bool:
+        try:
+            index, image = next(inputs)
+        except StopIteration:
+            return False
+        loader = _limited_loader(image)
+        if loader is not None and (loader in waiting or not has_slot(loader)):
+            waiting.setdefault(loader, deque()).append((index, image))
+        else:
+            submit(index, image, share_image(image) if in_processes else None)
+        return True
+
+    def submit_waiting() -> bool:
+        if tuner is not None and len(pending) >= tuner.limit:
+            return False
+        for loader, queue in waiting.items():
+            if has_slot(loader):
+                index, image = queue.popleft()
+                if not queue:
+                    del waiting[loader]
+                submit(index, image, share_image(image) if in_processes else None)
+                return True
+        return False
+
+    def collect(future: Future[Any]) -> BatchResult:
+        index, image, shared = pop(future)
+        if shared is not None:
+            release_block(shared[0])
+        try:
+            r = future.result()
+        except Exception as e:
+            return BatchResult(source=image, exception=e, index=index)
+        if isinstance(r, CompactPalette):
+            r = r.to_palette()
+            if isinstance(image, Image.Image) and r.metadata is not None:
+                # The worker saw a copy of the pixels; describe the caller's image.
+                r.metadata["image_source"] = _get_descriptive_image_source(image, image)
+                r.metadata["image_info"]["format"] = image.format
+        return BatchResult(source=image, result=r, index=index)
+
+    def expire(limit: float) -> list[BatchResult]:
+        """Fail the tasks running for longer than ``limit`` seconds, replacing an owned pool that runs them."""
+        nonlocal executor
+        now = time.monotonic()
+        for future in pending:
+            if future not in running_since and future.running():
+                running_since[future] = now
+        expired = sorted(
+            (f for f, since in running_since.items() if now - since > limit and not f.done()),
+            key=lambda f: pending[f][0],
+        )
+        results: list[BatchResult] = []
+        for future in expired:
+            index, image, shared = pop(future)
+            future.cancel()
+            if shared is not None:
+                release_block(shared[0])
+            error = ExtractionTimeoutError(f"Extraction did not finish within {limit} seconds.")
+            results.append(BatchResult(source=image, exception=error, index=index))
+        if not expired or isinstance(backend, Executor):
+            # A borrowed executor is the caller's: its stuck tasks are abandoned.
+            return results
+        stale, executor = executor, create_executor(coerce_to_enum(backend, Backend), pool_size, native_threads)
+        if isinstance(stale, ProcessPoolExecutor):
+            # Killing the workers fails the other tasks they were running as
+            # well: restart those (but keep results that are already in).
+            terminate_workers(stale)
+            for future in list(pending):
+                if future.done() and not future.cancelled() and not isinstance(future.exception(), BrokenExecutor):
+                    continue
+                index, image, shared = pop(future)
+                submit(index, image, shared)
+        else:
+            # Threads cannot be stopped: the old pool finishes what it started,
+            # the new one takes over what was still queued.
+            for future in list(pending):
+                if future.cancel():
+                    index, image, shared = pop(future)
+                    submit(index, image, shared)
+            stale.shutdown(wait=False)
+        return results
+
+    # Set when stopping on cancel or an exception such as KeyboardInterrupt:
+    # running tasks are then abandoned rather than waited for.
+    abandon = False
+    try:
+        exhausted = False
+        while True:
+            if cancel is not None and cancel.is_set():
+                abandon = True
+                return
+            # Held-back inputs already count towards the window.
+            while submit_waiting():
+                pass
+            while not exhausted and has_room():
+                exhausted = not submit_next()
+            if not pending:
+                break
+            poll = _CANCEL_POLL_SECONDS if cancel is not None or timeout is not None else None
+            done, _ = wait(pending, timeout=poll, return_when=FIRST_COMPLETED)
+            finished = [collect(future) for future in sorted(done, key=lambda f: pending[f][0])]
+            if timeout is not None:
+                finished += expire(timeout)
+            for batch_result in finished:
+                if tuner is not None:
+                    tuner.record()
+                if stats is not None:
+                    stats.images += 1
+                    stats.elapsed_seconds = time.perf_counter() - started
+                    stats.workers = tuner.limit if tuner is not None else workers
+                    stats.concurrency_history = list(tuner.history) if tuner is not None else []
+                    palette = batch_result.palette
+                    if palette is not None and palette.metadata is not None and palette.metadata.get("cached"):
+                        stats.cache_hits += 1
                 if progress_callback:
                     progress_callback(task_number, batch_result)
-            task_number += 1
+                task_number += 1
+                if ordered:
+                    assert batch_result.index is not None
+                    held[batch_result.index] = batch_result
+                else:
+                    yield batch_result
+            while next_index in held:
+                yield held.pop(next_index)
+                next_index += 1
+    except GeneratorExit:
+        raise
+    except BaseException:
+        abandon = True
+        raise
+    finally:
+        # Stopped early: drop queued tasks, then free the shared memory still
+        # held for running ones (an unlinked block stays mapped in the worker
+        # until it lets go).
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=not abandon, cancel_futures=True)
+        elif not abandon:
+            wait(pending)
+        for _, _, shared in pending.values():
+            if shared is not None:
+                release_block(shared[0])
+
+
+# Upper bound on the (images x samples x clusters) distance tensor that
+# ``extract_colors_stacked`` materializes at once; larger stacks are processed
+# in consecutive slices of images.
+_STACKED_MAX_ELEMENTS = 1 << 24
+
+_LUMINANCE_WEIGHTS = np.array([0.2126, 0.7152, 0.0722])
+
+
+def _sample_stack(
+    pixels: NDArray[np.uint8], valid: NDArray[np.bool_], n_samples: int, rng: np.random.Generator
+) -> tuple[NDArray[np.uint8], NDArray[np.float64]]:
+    """Sample ``n_samples`` pixels from every image of an ``(n, pixels, channels)`` stack, with their weights.
+
+    Pixels are drawn among each image's valid pixels: random keys with invalid
+    pixels pushed to the end, then the smallest keys per row. Images with fewer
+    valid pixels than the sample get zero-weight padding. The keys take 16
+    bytes per pixel, so they are drawn for a few images at a time, bounded by
+    ``_STACKED_MAX_ELEMENTS``.
+    """
+    n_images, n_pixels = valid.shape
+    if n_samples >= n_pixels:
+        return pixels, valid.astype(np.float64)
+    samples = np.empty((n_images, n_samples, pixels.shape[2]), dtype=np.uint8)
+    weights = np.empty((n_images, n_samples))
+    step = max(1, _STACKED_MAX_ELEMENTS // n_pixels)
+    for lo in range(0, n_images, step):
+        keys = rng.random((min(step, n_images - lo), n_pixels))
+        keys[~valid[lo : lo + step]] = 2.0
+        picks = np.sort(np.argpartition(keys, n_samples - 1, axis=1)[:, :n_samples], axis=1)
+        samples[lo : lo + step] = np.take_along_axis(pixels[lo : lo + step], picks[:, :, None], axis=1)
+        weights[lo : lo + step] = np.take_along_axis(valid[lo : lo + step], picks, axis=1)
+    return samples, weights
+
+
+@overload
+def extract_colors_stacked(
+    images: ArrayLike,
+    palette_size: int = ...,
+    masks: ArrayLike | None = ...,
+    sample_size: int | None = ...,
+    mode: ExtractionMethod | str = ...,
+    sort_mode: Literal["luminance", "frequency"] | None = ...,
+    alpha_mask_threshold: int | None = ...,
+    as_arrays: Literal[False] = ...,
+) -> list[Palette]: ...
+
+
+@overload
+def extract_colors_stacked(
+    images: ArrayLike,
+    palette_size: int = ...,
+    masks: ArrayLike | None = ...,
+    sample_size: int | None = ...,
+    mode: ExtractionMethod | str = ...,
+    sort_mode: Literal["luminance", "frequency"] | None = ...,
+    alpha_mask_threshold: int | None = ...,
+    *,
+    as_arrays: Literal[True],
+) -> PaletteArrays: ...
+
+
+def extract_colors_stacked(
+    images: ArrayLike,
+    palette_size: int = 5,
+    masks: ArrayLike | None = None,
+    sample_size: int | None = 4096,
+    mode: ExtractionMethod | str = ExtractionMethod.KM,
+    sort_mode: Literal["luminance", "frequency"] | None = None,
+    alpha_mask_threshold: int | None = None,
+    as_arrays: bool = False,
+) -> list[Palette] | PaletteArrays:
+    """
+    Extracts a palette for every image of an ``(N, H, W, C)`` stack in one vectorized call.
+
+    Where :func:`batch_extract_colors` runs one independent extraction per
+    image, this runs a single batched k-means over the whole stack: every image
+    gets its own centroids, but sampling, seeding and the Lloyd iterations are
+    array operations over all images at once, with no per-image PIL round trip
+    or estimator setup.
+
+    Parameters:
+        images: ``(N, H, W, C)`` uint8 array of equally sized images, ``C`` 3 (RGB) or 4 (RGBA).
+        palette_size: The number of colors to extract per image.
+        masks: Optional ``(N, H, W)`` boolean array; only pixels where it is
+            ``True`` are sampled. Combined with ``alpha_mask_threshold``.
+        sample_size: The number of pixels sampled per image (drawn among its
+            valid pixels). ``None`` clusters every pixel.
+        mode: ``KMeans`` (cluster RGBA, like the ``KMeans`` extractor) or
+            ``OKLab`` (cluster in OKLab, like the ``OKLab`` extractor).
+        sort_mode: The mode to sort colors.
+        alpha_mask_threshold: Optional integer between 0, 255.
+            Any pixel with alpha less than this threshold will be discarded from calculations.
+        as_arrays: Return a compact :class:`~pylette.types.PaletteArrays`
+            instead of a list of palettes.
+
+    Returns:
+        list[Palette] | PaletteArrays: One palette per image, in stack order.
+
+    Raises:
+        InvalidImageError: If ``images`` is not an ``(N, H, W, 3|4)`` stack or ``masks`` does not match it.
+        NoValidPixelsError: If any image has no pixels left after masking.
+        ValueError: If ``mode`` is not ``KMeans`` or ``OKLab``.
+
+    Examples:
+        >>> frames = np.stack([np.asarray(Image.open(p).convert("RGB")) for p in paths])
+        >>> palettes = extract_colors_stacked(frames, palette_size=5)
+        >>> arrays = extract_colors_stacked(frames, palette_size=5, as_arrays=True)
+    """
+
+    start_time = time.time()
+
+    mode = coerce_to_enum(mode, ExtractionMethod, error_cls=UnknownExtractionMethodError)
+    if mode not in (ExtractionMethod.KM, ExtractionMethod.OKLAB):
+        raise ValueError(f"Stacked extraction supports KMeans and OKLab, not {mode.value}.")
+    if sample_size is not None and sample_size < 1:
+        raise ValueError(f"sample_size must be a positive int or None, got {sample_size!r}.")
 
-    # Return results in original order
-    source_to_result = {r.source: r for r in results}
-    return [source_to_result[source] for source in images]
+    stack = np.asarray(images)
+    if stack.ndim != 4 or stack.shape[-1] not in (3, 4):
+        raise InvalidImageError(f"Expected an (N, H, W, 3|4) image stack, got shape {stack.shape}.")
+    n_images, height, width, n_channels = stack.shape
+    n_pixels = height * width
+    pixels = stack.astype(np.uint8, copy=False).reshape(n_images, n_pixels, n_channels)
+
+    if alpha_mask_threshold is None:
+        alpha_mask_threshold = 0
+    if n_channels == 4:
+        valid = pixels[:, :, 3] > alpha_mask_threshold
+    else:
+        valid = np.full((n_images, n_pixels), 255 > alpha_mask_threshold)
+    if masks is not None:
+        mask_arr = np.asarray(masks, dtype=bool)
+        if mask_arr.shape != (n_images, height, width):
+            raise InvalidImageError(f"Expected masks of shape {(n_images, height, width)}, got {mask_arr.shape}.")
+        valid &= mask_arr.reshape(n_images, n_pixels)
+
+    valid_counts = valid.sum(axis=1)
+    if n_images and not valid_counts.all():
+        empty = int(np.argmin(valid_counts))
+        raise NoValidPixelsError(
+            f"No valid pixels remain in image {empty} after applying the mask and alpha threshold "
+            f"{alpha_mask_threshold}."
+        )
+
+    n_samples = n_pixels if sample_size is None else min(sample_size, n_pixels)
+    rng = np.random.default_rng(2024)
+
+    rgba = np.zeros((n_images, palette_size, 4))
+    frequencies = np.zeros((n_images, palette_size))
+    step = max(1, _STACKED_MAX_ELEMENTS // (n_samples * palette_size))
+    for lo in range(0, n_images, step):
+        samples, w = _sample_stack(pixels[lo : lo + step], valid[lo : lo + step], n_samples, rng)
+        chunk = samples.astype(np.float64)
+        if n_channels == 3:
+            chunk = np.concatenate([chunk, np.full((*chunk.shape[:2], 1), 255.0)], axis=2)
+        if mode is ExtractionMethod.OKLAB:
+            points = linear_srgb_to_oklab(srgb_to_linear(chunk[:, :, :3] / 255.0))
+        else:
+            points = chunk
+        centers, labels = batched_kmeans(points, w, palette_size)
+
+        offsets = (np.arange(len(chunk)) * palette_size)[:, None]
+        flat = (labels + offsets).ravel()
+        totals = np.bincount(flat, weights=w.ravel(), minlength=len(chunk) * palette_size)
+        totals = totals.reshape(len(chunk), palette_size)
+        if mode is ExtractionMethod.OKLAB:
+            srgb = np.clip(linear_to_srgb(oklab_to_linear_srgb(centers)), 0.0, 1.0) * 255.0
+            alpha = np.bincount(flat, weights=(chunk[:, :, 3] * w).ravel(), minlength=len(chunk) * palette_size)
+            alpha = alpha.reshape(len(chunk), palette_size) / np.where(totals > 0, totals, 1.0)
+            rgba[lo : lo + step] = np.concatenate([srgb, alpha[:, :, None]], axis=2)
+        else:
+            rgba[lo : lo + step] = centers
+        frequencies[lo : lo + step] = totals / totals.sum(axis=1, keepdims=True)
+
+    if mode is ExtractionMethod.KM:
+        # Truncate like the KMeans extractor, before sorting so luminance order
+        # matches the colors actually returned.
+        rgba = np.floor(rgba)
+
+    # Sort every row; empty slots always go last.
+    if sort_mode == "luminance":
+        keys = np.where(frequencies > 0, (rgba[:, :, :3] / 255.0) @ _LUMINANCE_WEIGHTS, np.inf)
+    else:
+        keys = -frequencies
+    order = np.argsort(keys, axis=1, kind="stable")
+    rgba = np.take_along_axis(rgba, order[:, :, None], axis=1)
+    frequencies = np.take_along_axis(frequencies, order, axis=1)
+
+    if as_arrays:
+        return PaletteArrays(colors=np.round(rgba).astype(np.uint8), frequencies=frequencies)
+
+    extraction_time = (time.time() - start_time) / max(n_images, 1)
+    timestamp = datetime.now().isoformat()
+    palettes: list[Palette] = []
+    for i in range(n_images):
+        colors: list[Color] = []
+        for color, freq in zip(rgba[i], frequencies[i]):
+            if freq <= 0:
+                continue
+            if mode is ExtractionMethod.OKLAB:
+                r, g, b = (float(c) / 255.0 for c in color[:3])
+                colors.append(Color.from_srgb_float((r, g, b), float(freq), alpha=float(color[3]) / 255.0))
+            else:
+                colors.append(Color(tuple(int(c) for c in color), float(freq)))
+        metadata = PaletteMetaData(
+            image_source=f"<numpy_array: shape={(height, width, n_channels)} index={i}>",
+            source_type=SourceType.NUMPY_ARRAY,
+            extraction_params=ExtractionParams(
+                palette_size=palette_size,
+                mode=mode,
+                sort_mode=sort_mode,
+                resize=None,
+                alpha_mask_threshold=alpha_mask_threshold,
+            ),
+            image_info=ImageInfo(
+                original_size=(width, height),
+                processed_size=(width, height),
+                format=None,
+                mode="RGBA" if n_channels == 4 else "RGB",
+                has_alpha=n_channels == 4,
+            ),
+            processing_stats=ProcessingStats(
+                total_pixels=n_pixels,
+                valid_pixels=int(valid_counts[i]),
+                extraction_time=extraction_time,
+                timestamp=timestamp,
+            ),
+        )
+        palettes.append(Palette(colors, metadata=metadata))
+    return palettes
 
 
 def extract_colors(
     image: ImageInput,
     palette_size: int = 5,
-    resize: int | bool | None = 256,
-    mode: ExtractionMethod | str = ExtractionMethod.KM,
+    resize: int | bool | None | Unset = UNSET,
+    mode: ExtractionMethod | str | None = None,
     sort_mode: Literal["luminance", "frequency"] | None = None,
     alpha_mask_threshold: int | None = None,
+    time_budget: float | None = None,
+    preset: Preset | str | None = None,
+    max_pixels: int | None = None,
+    cache: "ExtractionCache | None" = None,
 ) -> Palette:
     """
     Extracts a set of 'palette_size' colors from the given image.
@@ -190,12 +1152,34 @@ def extract_colors(
             before colors are extracted, which bounds runtime; pass ``None`` to
             sample the image at full resolution instead. Smaller values are
             faster but coarser; larger values are slower but capture more detail.
-            Defaults to ``256``. (Passing a ``bool`` is deprecated: ``True`` maps
-            to ``256`` and ``False`` to ``None``.)
-        mode: The color quantization algorithm to use.
+            Defaults to ``256``, or the preset's choice. (Passing a ``bool`` is
+            deprecated: ``True`` maps to ``256`` and ``False`` to ``None``.)
+        mode: The color quantization algorithm to use. Defaults to ``KMeans``,
+            or the preset's choice.
         sort_mode: The mode to sort colors.
         alpha_mask_threshold: Optional integer between 0, 255.
             Any pixel with alpha less than this threshold will be discarded from calculations.
+        time_budget: Optional time budget in seconds. Extraction then refines
+            progressively from a coarse sample towards ``resize`` and returns the
+            most refined palette that fits the budget (see
+            :func:`extract_colors_progressive`); ``metadata["refinement"]``
+            records how far it got. ``None`` always samples at ``resize``.
+        preset: Optional speed/quality preset choosing ``mode`` and ``resize``:
+            ``"fast"`` (MedianCut at 64), ``"balanced"`` (KMeans at 256, the
+            defaults), ``"quality"`` (OKLab at 512), or ``"auto"``, which picks
+            per image from its size and color content with a cost model (see
+            :mod:`pylette.src.presets`). A ``mode`` or ``resize`` passed
+            explicitly takes precedence over the preset. The chosen settings
+            are recorded in ``metadata["extraction_params"]``.
+        max_pixels: Optional maximum number of pixels (width x height). Larger
+            images are rejected from their header, before any pixel data is
+            decoded, which guards against decompression bombs.
+        cache: Optional palette cache: a persistent :class:`~pylette.PaletteCache`,
+            keyed by the image content, or an in-process
+            :class:`~pylette.MemoryPaletteCache`, keyed by path and modification
+            time. The palette is looked up under the image and these parameters
+            and only extracted (then stored) if it is not there;
+            ``metadata["cached"]`` tells which.
     Returns:
         Palette: A palette of the extracted colors.
 
@@ -219,88 +1203,238 @@ def extract_colors(
 
     Raises:
         InvalidImageError: If the image cannot be loaded or its type is unsupported.
+        ImageTooLargeError: If the image has more than ``max_pixels`` pixels.
         NoValidPixelsError: If no pixels remain after alpha masking.
         UnknownExtractionMethodError: If ``mode`` is not a known extraction method.
+        ValueError: If ``preset`` is not a known preset or ``max_pixels`` is not positive.
 
     Examples:
         Colors can be extracted from a variety of sources, including local files, byte streams, URLs, and numpy arrays.
 
         >>> extract_colors("path/to/image.jpg", palette_size=5, resize=256, mode="KM", sort_mode="luminance")
         >>> extract_colors(b"image_bytes", palette_size=5, resize=None, mode="KM", sort_mode="luminance")
+        >>> extract_colors("path/to/image.jpg", palette_size=8, preset="auto")
     """
 
+    if cache is not None:
+        resize = _resolve_resize(resize)
+        mode = _resolve_mode(mode)
+        preset = coerce_to_enum(preset, Preset) if preset is not None else None
+        if preset is None:
+            mode, resize = _default_settings(mode, resize)
+        _check_max_pixels_arg(max_pixels)
+        extract = partial(
+            extract_colors,
+            palette_size=palette_size,
+            resize=resize,
+            mode=mode,
+            sort_mode=sort_mode,
+            alpha_mask_threshold=alpha_mask_threshold,
+            time_budget=time_budget,
+            preset=preset,
+            max_pixels=max_pixels,
+        )
+        params = {
+            "palette_size": palette_size,
+            # Left to the preset if unset.
+            "mode": mode.value if mode is not None else None,
+            "sort_mode": sort_mode,
+            "resize": resize if resize is not UNSET else resize.value,
+            "alpha_mask_threshold": alpha_mask_threshold or 0,
+            "time_budget": time_budget,
+            "preset": preset.value if preset is not None else None,
+        }
+        return _extract_cached(cache, image, extract, params, max_pixels)
+
+    if time_budget is not None:
+        palette: Palette | None = None
+        for palette in extract_colors_progressive(
+            image=image,
+            palette_size=palette_size,
+            resize=resize,
+            mode=mode,
+            sort_mode=sort_mode,
+            alpha_mask_threshold=alpha_mask_threshold,
+            time_budget=time_budget,
+            preset=preset,
+            max_pixels=max_pixels,
+        ):
+            pass
+        assert palette is not None  # the coarsest level always runs
+        return palette
+
     start_time = time.time()
 
-    mode = coerce_to_enum(mode, ExtractionMethod, error_cls=UnknownExtractionMethodError)
-    resize = _resolve_resize(resize)
+    requested_mode = _resolve_mode(mode)
+    requested_resize = _resolve_resize(resize)
+    _check_max_pixels_arg(max_pixels)
+    if preset is not None:
+        preset = coerce_to_enum(preset, Preset)
+    if alpha_mask_threshold is None:
+        alpha_mask_threshold = 0
 
-    source_type = _get_source_type_from_image_input(image)
-    # Normalize input to PIL Image and convert to RGBA
-    img_obj = _normalize_image_input(image)
-    original_size = img_obj.size
-    img = img_obj.convert("RGBA")
+    source_type, img_obj, img, image_info = _prepare_image(image, max_pixels)
+    mode, resize = _apply_preset(preset, img, palette_size, requested_mode, requested_resize)
+    valid_pixels, processed_size = _sample_valid_pixels(img, resize, alpha_mask_threshold)
+    image_info["processed_size"] = processed_size
 
-    # Store original image info
-    image_info = ImageInfo(
-        original_size=original_size,
-        processed_size=(resize, resize) if resize is not None else img.size,
-        format=getattr(img_obj, "format", None),
-        mode=img.mode,
-        has_alpha=img.mode in ("RGBA", "LA") or "transparency" in img_obj.info,
+    # Color extraction
+    extractor = get_extractor(mode)
+    colors = extractor.extract(arr=valid_pixels, palette_size=palette_size)
+    _sort_colors(colors, sort_mode)
+
+    extraction_params = ExtractionParams(
+        palette_size=palette_size,
+        mode=mode,
+        sort_mode=sort_mode,
+        resize=resize,
+        alpha_mask_threshold=alpha_mask_threshold,
     )
+    if preset is not None:
+        extraction_params["preset"] = preset
+    metadata = _build_metadata(
+        image,
+        img_obj,
+        source_type,
+        extraction_params,
+        image_info,
+        valid_pixels=len(valid_pixels),
+        start_time=start_time,
+    )
+    return Palette(colors, metadata=metadata)
 
-    if resize is not None:
-        img = img.resize((resize, resize))
-        image_info["processed_size"] = (resize, resize)
 
-    width, height = img.size
-    arr = np.asarray(img)
+def extract_colors_progressive(
+    image: ImageInput,
+    palette_size: int = 5,
+    resize: int | bool | None | Unset = UNSET,
+    mode: ExtractionMethod | str | None = None,
+    sort_mode: Literal["luminance", "frequency"] | None = None,
+    alpha_mask_threshold: int | None = None,
+    time_budget: float | None = None,
+    preset: Preset | str | None = None,
+    max_pixels: int | None = None,
+) -> Iterator[Palette]:
+    """
+    Yields successively refined palettes for the given image (anytime extraction).
+
+    The image is decoded once, then sampled at increasing sizes: ``32x32``
+    first, doubling the side at every level, up to ``resize`` (or the full image
+    when ``resize`` is ``None``). Each level is warm-started from the previous
+    level's colors where the extractor supports it (``KMeans`` and ``OKLab``), so
+    later levels converge quickly. The last palette yielded is identical in kind
+    to what :func:`extract_colors` returns; the caller can stop iterating at any
+    point and keep the best palette so far.
+
+    Parameters:
+        image: The input image.
+        palette_size: The number of colors to extract.
+        resize: The sample size of the final refinement level (see :func:`extract_colors`).
+        mode: The color quantization algorithm to use.
+        sort_mode: The mode to sort colors.
+        alpha_mask_threshold: Optional integer between 0, 255.
+            Any pixel with alpha less than this threshold will be discarded from calculations.
+        time_budget: Optional time budget in seconds, counted from the call and
+            including decoding. The coarsest level always runs; every further
+            level runs only if its cost, extrapolated from the previous level,
+            still fits in the budget.
+        preset: Optional speed/quality preset, see :func:`extract_colors`.
+        max_pixels: Optional maximum number of pixels, see :func:`extract_colors`.
+
+    Yields:
+        Palette: One palette per completed level, coarsest first. Each
+        palette's ``metadata["refinement"]`` records how far refinement got.
+
+    Raises:
+        InvalidImageError: If the image cannot be loaded or its type is unsupported.
+        ImageTooLargeError: If the image has more than ``max_pixels`` pixels.
+        NoValidPixelsError: If no pixels remain after alpha masking.
+        UnknownExtractionMethodError: If ``mode`` is not a known extraction method.
+        ValueError: If ``time_budget`` or ``max_pixels`` is not positive or ``preset``
+            is not a known preset.
+
+    Examples:
+        >>> for palette in extract_colors_progressive("photo.jpg", palette_size=8):
+        ...     show(palette)  # coarse first, then sharper
+
+        >>> best = None
+        >>> for best in extract_colors_progressive("photo.jpg", time_budget=0.05):
+        ...     pass
+    """
 
+    start_time = time.time()
+    clock_start = time.monotonic()
+
+    if time_budget is not None and time_budget <= 0:
+        raise ValueError(f"time_budget must be a positive number of seconds, got {time_budget!r}.")
+    requested_mode = _resolve_mode(mode)
+    requested_resize = _resolve_resize(resize)
+    _check_max_pixels_arg(max_pixels)
+    if preset is not None:
+        preset = coerce_to_enum(preset, Preset)
     if alpha_mask_threshold is None:
         alpha_mask_threshold = 0
 
-    alpha_mask = arr[:, :, 3] <= alpha_mask_threshold
-    valid_pixels = arr[~alpha_mask]
+    source_type, img_obj, img, image_info = _prepare_image(image, max_pixels)
+    mode, resize = _apply_preset(preset, img, palette_size, requested_mode, requested_resize)
+    extractor = get_extractor(mode)
+    levels = _refinement_levels(resize, img.size)
+    extraction_params = ExtractionParams(
+        palette_size=palette_size,
+        mode=mode,
+        sort_mode=sort_mode,
+        resize=resize,
+        alpha_mask_threshold=alpha_mask_threshold,
+    )
+    if preset is not None:
+        extraction_params["preset"] = preset
 
-    if len(valid_pixels) == 0:
-        raise NoValidPixelsError(
-            f"No valid pixels remain after applying alpha mask with threshold {alpha_mask_threshold}. "
-            f"Try using a lower alpha-mask-threshold value or check if your image has transparency."
-        )
+    previous: list[Color] | None = None
+    level_cost: float | None = None
+    level_pixels = 0
+    for level, sample_size in enumerate(levels, start=1):
+        n_pixels = sample_size * sample_size if sample_size is not None else img.size[0] * img.size[1]
+        if time_budget is not None and previous is not None and level_cost is not None:
+            predicted = level_cost * n_pixels / level_pixels
+            if time.monotonic() - clock_start + predicted > time_budget:
+                return
 
-    # Color extraction
-    extractor = get_extractor(mode)
-    colors = extractor.extract(arr=valid_pixels, palette_size=palette_size)
+        level_start = time.monotonic()
+        try:
+            valid_pixels, processed_size = _sample_valid_pixels(img, sample_size, alpha_mask_threshold)
+        except NoValidPixelsError:
+            # Small, mostly transparent details can vanish at a coarse sample;
+            # only the final level is authoritative.
+            if level == len(levels):
+                raise
+            continue
 
-    if colors:
-        if sort_mode == "luminance":
-            colors.sort(key=lambda c: c.luminance, reverse=False)
+        if previous is not None and isinstance(extractor, RefinableColorExtractor):
+            colors = extractor.refine(arr=valid_pixels, palette_size=palette_size, previous=previous)
         else:
-            colors.sort(reverse=True)
+            colors = extractor.extract(arr=valid_pixels, palette_size=palette_size)
+        _sort_colors(colors, sort_mode)
+        level_cost, level_pixels = time.monotonic() - level_start, n_pixels
+        previous = colors
 
-    end_time = time.time()
-
-    # Build comprehensive metadata
-    metadata = PaletteMetaData(
-        image_source=_get_descriptive_image_source(image, img_obj),
-        source_type=source_type,
-        extraction_params=ExtractionParams(
-            palette_size=palette_size,
-            mode=mode,
-            sort_mode=sort_mode,
-            resize=resize,
-            alpha_mask_threshold=alpha_mask_threshold,
-        ),
-        image_info=image_info,
-        processing_stats=ProcessingStats(
-            total_pixels=width * height,
+        level_info = ImageInfo(**image_info)
+        level_info["processed_size"] = processed_size
+        metadata = _build_metadata(
+            image,
+            img_obj,
+            source_type,
+            ExtractionParams(**extraction_params),
+            level_info,
             valid_pixels=len(valid_pixels),
-            extraction_time=end_time - start_time,
-            timestamp=datetime.now().isoformat(),
-        ),
-    )
-
-    return Palette(colors, metadata=metadata)
+            start_time=start_time,
+        )
+        metadata["refinement"] = RefinementInfo(
+            levels_completed=level,
+            levels_total=len(levels),
+            sample_size=sample_size,
+            time_budget=time_budget,
+        )
+        yield Palette(list(colors), metadata=metadata)
 
 
 def request_image(image_url: str) -> Image.Image:
@@ -317,12 +1451,4 @@ def request_image(image_url: str) -> Image.Image:
         InvalidImageError: If the URL does not point to a valid image.
     """
 
-    import requests
-
-    response = requests.get(image_url)
-    # Check if the request was successful and content type is an image
-    if response.status_code == 200 and "image" in response.headers.get("Content-Type", ""):
-        img = Image.open(BytesIO(response.content))
-        return img
-    else:
-        raise InvalidImageError("The URL did not point to a valid image.")
+    return Image.open(BytesIO(fetch_image_bytes(image_url)))
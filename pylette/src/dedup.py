@@ -0,0 +1,126 @@
+"""
+Content hashing for deduplicating batch inputs (``batch_extract_colors(dedupe=True)``).
+
+Batches often hold the same image several times: under different URLs, as a
+re-upload at another path, or as the same bytes twice. Every input is reduced
+to a digest of its content, and images with equal digests are extracted once:
+
+* files are hashed as they are read, in chunks, without decoding;
+* URIs (URLs and other loader schemes, see :mod:`pylette.src.loaders`) are
+  loaded once; the result is hashed and then extracted from, so a
+  deduplicated batch never fetches a URL twice (and drops the download of a
+  duplicate as soon as it is hashed);
+* bytes are hashed as they are;
+* NumPy arrays and PIL images are hashed over their pixel buffer, shape and
+  dtype (or mode).
+
+Encoded files and decoded pixels are hashed separately, so a file and an array
+of its pixels are not recognized as the same image. BLAKE2b releases the GIL
+on large buffers, so hashing runs on a small thread pool alongside the reads,
+a bounded window ahead of the consumer: a batch holds a few loaded images at a
+time, not all of them.
+"""
+
+import hashlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+from PIL import Image
+
+from pylette.src.files import open_file
+from pylette.src.loaders import is_uri, read_uri
+from pylette.src.types import ImageInput
+
+# Threads hashing inputs: reading files and downloading URLs is I/O-bound.
+_HASH_WORKERS = 16
+
+# How many inputs ``iter_content_keys`` hashes ahead of its consumer.
+_HASH_AHEAD = 2 * _HASH_WORKERS
+
+_CHUNK_SIZE = 1 << 20
+
+
+def _digest(*parts: bytes | memoryview) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part)
+    return h.hexdigest()
+
+
+def content_key(image: ImageInput) -> tuple[str | None, ImageInput]:
+    """Hash the content of ``image``.
+
+    Returns:
+        The digest, or ``None`` if the content cannot be read (the input is then
+        extracted on its own and reports the error), and the input to extract
+        from: what the loader returned for a URI, ``image`` itself otherwise.
+    """
+    try:
+        if isinstance(image, (str, Path)):
+            if is_uri(image):
+                loaded = read_uri(str(image))
+                if isinstance(loaded, Image.Image):
+                    return content_key(loaded)[0], loaded
+                return _digest(b"encoded:", loaded), loaded
+            h = hashlib.blake2b(b"encoded:", digest_size=16)
+            with open_file(image) as f:
+                while chunk := f.read(_CHUNK_SIZE):
+                    h.update(chunk)
+            return h.hexdigest(), image
+        if isinstance(image, bytes):
+            return _digest(b"encoded:", image), image
+        if isinstance(image, Image.Image):
+            header = f"image:{image.mode}:{image.size}".encode()
+            return _digest(header, image.tobytes()), image
+        if hasattr(image, "__array__"):
+            arr = np.ascontiguousarray(image)
+            if arr.dtype.hasobject:
+                return None, image
+            return _digest(f"array:{arr.dtype.str}:{arr.shape}".encode(), arr.data), image
+    except Exception:
+        return None, image  # extracting it on its own reports the error
+    return None, image
+
+
+def iter_content_keys(images: Iterable[ImageInput]) -> Iterator[tuple[str | None, ImageInput]]:
+    """
+    :func:`content_key` of every image, in order, computed concurrently a bounded window ahead.
+
+    A path or URI given again is not read again: it gets the digest of its
+    first occurrence and is returned as itself.
+    """
+    # Every path and URI seen: its hashing task, then its digest.
+    seen: dict[str, Future[tuple[str | None, ImageInput]] | str | None] = {}
+    # Inputs hashed or being hashed but not yet yielded, and whether each is
+    # the first occurrence of its path or URI.
+    ahead: deque[tuple[ImageInput, Future[tuple[str | None, ImageInput]] | str | None, bool]] = deque()
+
+    def resolve() -> tuple[str | None, ImageInput]:
+        image, key, first = ahead.popleft()
+        if isinstance(key, Future):
+            digest, payload = key.result()
+        else:
+            digest, payload = key, image
+        if not first:
+            return digest, image
+        if isinstance(image, (str, Path)):
+            seen[str(image)] = digest  # the payload is not kept for repeats
+        return digest, payload
+
+    with ThreadPoolExecutor(max_workers=_HASH_WORKERS, thread_name_prefix="pylette-hash") as pool:
+        for image in images:
+            name = str(image) if isinstance(image, (str, Path)) else None
+            if name is not None and name in seen:
+                ahead.append((image, seen[name], False))
+            else:
+                future = pool.submit(content_key, image)
+                if name is not None:
+                    seen[name] = future
+                ahead.append((image, future, True))
+            if len(ahead) > _HASH_AHEAD:
+                yield resolve()
+        while ahead:
+            yield resolve()
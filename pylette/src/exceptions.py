@@ -3,7 +3,8 @@
 Every error Pylette raises derives from :class:`PyletteError`, so a caller can
 ``except PyletteError`` to catch any Pylette-originated failure and branch on the
 concrete subclass to identify the failure mode. The concrete subclasses also
-derive from the builtin (:class:`ValueError`).
+derive from the matching builtin (:class:`ValueError`, or :class:`TimeoutError`
+for timeouts).
 """
 
 
@@ -15,6 +16,14 @@ class InvalidImageError(PyletteError, ValueError):
     """An input image could not be loaded, or its type is unsupported."""
 
 
+class ImageTooLargeError(InvalidImageError):
+    """An input image has more pixels than allowed (e.g. a decompression bomb); detected from its header."""
+
+
+class ExtractionTimeoutError(PyletteError, TimeoutError):
+    """An extraction did not finish within its time limit."""
+
+
 class NoValidPixelsError(PyletteError, ValueError):
     """No pixels remain to extract a palette from (e.g. a fully alpha-masked image)."""
 
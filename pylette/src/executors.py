@@ -0,0 +1,260 @@
+"""
+Executor backends for batch extraction.
+
+``batch_extract_colors`` runs one extraction per image on a
+:class:`concurrent.futures.Executor`. Much of an extraction (mask building,
+``Color`` construction, metadata, and the PIL / scikit-learn glue) holds the
+GIL, so a thread pool saturates only a few cores. The backends here trade
+start-up and pickling cost for real parallelism:
+
+* ``threads``: a :class:`~concurrent.futures.ThreadPoolExecutor`. Cheapest to
+  start and shares the decoded inputs; the default.
+* ``processes``: a :class:`~concurrent.futures.ProcessPoolExecutor` started with
+  ``forkserver`` where the platform has it (``spawn`` elsewhere). The fork
+  server preloads the heavy imports once, so every worker starts warm.
+  Scripts using it must guard their entry point with
+  ``if __name__ == "__main__":``.
+
+There is no sub-interpreter backend: NumPy, scikit-learn, SciPy and Pillow's C
+extensions cannot be imported in an isolated sub-interpreter, so every task
+on an ``InterpreterPoolExecutor`` would fail.
+
+Images and palettes cross process boundaries by pickling. In-memory inputs
+(NumPy arrays and PIL images) are placed in :mod:`multiprocessing.shared_memory`
+blocks instead, and only a small :class:`SharedImage` descriptor is pickled;
+palettes come back as a :class:`CompactPalette`. The cross-process cost per
+image is then independent of the image size.
+
+scikit-learn's k-means runs its own OpenMP thread pool inside every task, by
+default one thread per core, so ``n`` workers would each start ``n_cores``
+native threads. Every task therefore runs under an OpenMP limit of
+:func:`native_threads_for` (the cores divided among the workers) unless the
+caller chooses one; process workers additionally cap their BLAS pools, which
+are process-wide. See :func:`limit_native_threads`.
+
+A task that exceeds its time limit can only be stopped on the ``processes``
+backend: :func:`terminate_workers` kills the pool's worker processes, and the
+batch continues on a fresh pool. Threads cannot be interrupted, so a timed-out
+task there is abandoned and runs to completion in the background.
+"""
+
+import importlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from multiprocessing.context import BaseContext
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, TypeVar
+
+import numpy as np
+from numpy.typing import NDArray
+from PIL import Image
+from threadpoolctl import ThreadpoolController, threadpool_limits
+
+from pylette.src.color import Color
+from pylette.src.palette import Palette
+from pylette.src.types import Backend, ImageInput, PaletteMetaData
+
+# PIL modes that round-trip through ``np.asarray`` / ``Image.fromarray``
+# unchanged; other modes (e.g. palette-based "P") are converted to RGBA first.
+_SHAREABLE_MODES = ("L", "LA", "RGB", "RGBA")
+
+# Modules imported once per worker (or once in the fork server) before any task
+# runs, so the first extraction on a worker does not pay for them.
+WARM_IMPORTS = ("pylette.src.executors", "sklearn.cluster", "sklearn.neighbors")
+
+
+_T = TypeVar("_T")
+
+
+def warm_imports() -> None:
+    """Import the modules every extraction needs (a no-op once they are loaded)."""
+    for name in WARM_IMPORTS:
+        importlib.import_module(name)
+
+
+def _init_process_worker(native_threads: int | None) -> None:
+    warm_imports()
+    if native_threads is not None:
+        # The process is ours alone, so its process-wide BLAS pools can be capped too.
+        threadpool_limits(limits=native_threads)
+
+
+def default_workers(backend: Backend) -> int:
+    """The worker count :func:`create_executor` gets from the standard library when ``max_workers`` is ``None``."""
+    cpus = os.cpu_count() or 1
+    return min(32, cpus + 4) if backend is Backend.THREADS else cpus
+
+
+def native_threads_for(workers: int) -> int:
+    """Native threads per task so that ``workers`` concurrent tasks fill, but do not oversubscribe, the cores."""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+_controller: ThreadpoolController | None = None
+_controller_lock = threading.Lock()
+
+
+def _native_controller() -> ThreadpoolController:
+    """The thread-pool controller of this process, built once the native libraries are loaded."""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            warm_imports()  # load scikit-learn's OpenMP runtime so the controller sees it
+            _controller = ThreadpoolController()
+        return _controller
+
+
+def _run_limited(native_threads: int, fn: Callable[[Any], _T], arg: Any) -> _T:
+    # OpenMP limits apply to the calling thread only, so concurrent tasks do not
+    # interfere; BLAS limits are process-wide and left to the process initializer.
+    with _native_controller().limit(limits=native_threads, user_api="openmp"):
+        return fn(arg)
+
+
+def limit_native_threads(fn: Callable[[Any], _T], native_threads: int) -> Callable[[Any], _T]:
+    """Wrap the task ``fn`` so that it runs with at most ``native_threads`` OpenMP threads.
+
+    The wrapper pickles (for process workers) as long as ``fn`` does.
+    """
+    return partial(_run_limited, native_threads, fn)
+
+
+def _process_context() -> BaseContext:
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(list(WARM_IMPORTS))
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def create_executor(backend: Backend, max_workers: int | None = None, native_threads: int | None = None) -> Executor:
+    """Create the executor for ``backend``; the caller owns (and shuts down) it.
+
+    ``native_threads`` caps the BLAS and OpenMP pools of process workers for
+    their lifetime; thread workers share the caller's process, so their tasks
+    are limited one at a time with :func:`limit_native_threads`.
+    """
+    if backend is Backend.THREADS:
+        return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pylette")
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=_process_context(),
+        initializer=_init_process_worker,
+        initargs=(native_threads,),
+    )
+
+
+def terminate_workers(executor: ProcessPoolExecutor) -> None:
+    """Kill the worker processes of ``executor`` and shut it down without waiting.
+
+    Every unfinished future of the pool fails with
+    :class:`~concurrent.futures.process.BrokenProcessPool`; the pool cannot be
+    used afterwards.
+    """
+    kill_workers = getattr(executor, "kill_workers", None)  # Python 3.14+
+    if kill_workers is not None:
+        kill_workers()
+    else:
+        processes: dict[int, multiprocessing.Process] = getattr(executor, "_processes", None) or {}
+        for process in list(processes.values()):
+            process.kill()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+@dataclass(frozen=True)
+class SharedImage:
+    """Descriptor of an image array placed in a shared-memory block.
+
+    This is all that is pickled to a process worker; the worker maps the block
+    and extracts from the pixels in place.
+    """
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+    mode: str | None  # PIL mode to rebuild the image with; None for NumPy inputs
+
+
+def share_image(image: ImageInput) -> tuple[SharedMemory, SharedImage] | None:
+    """Copy an in-memory image into a new shared-memory block.
+
+    Returns:
+        The block (owned by the caller, who must close and unlink it) and its
+        descriptor, or ``None`` for inputs that are not NumPy arrays or PIL
+        images, or cannot be shared (empty or object arrays).
+    """
+    mode: str | None = None
+    if isinstance(image, Image.Image):
+        pil_image = image
+        if image.mode not in _SHAREABLE_MODES or "transparency" in image.info:
+            pil_image = image.convert("RGBA")
+        arr = np.asarray(pil_image)
+        mode = pil_image.mode
+    elif not isinstance(image, (str, bytes)) and hasattr(image, "__array__"):
+        arr = np.asarray(image)
+    else:
+        return None
+    if arr.nbytes == 0 or arr.dtype.hasobject:
+        return None
+
+    block = SharedMemory(create=True, size=arr.nbytes)
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=block.buf)[...] = arr
+    return block, SharedImage(name=block.name, shape=arr.shape, dtype=arr.dtype.str, mode=mode)
+
+
+def release_block(block: SharedMemory) -> None:
+    """Close and unlink a block created by :func:`share_image`."""
+    block.close()
+    block.unlink()
+
+
+@dataclass(frozen=True)
+class CompactPalette:
+    """A palette packed for transfer: one ``(k, 5)`` float row per color plus metadata.
+
+    Each row holds the color's float sRGB, its opacity and its frequency, so
+    :meth:`to_palette` rebuilds the colors exactly.
+    """
+
+    values: NDArray[np.float64]
+    metadata: PaletteMetaData | None
+
+    @classmethod
+    def from_palette(cls, palette: Palette) -> "CompactPalette":
+        values = np.array([(*c.rgb_float, c.opacity, c.frequency) for c in palette.colors], dtype=np.float64)
+        return cls(values=values.reshape(-1, 5), metadata=palette.metadata)
+
+    def to_palette(self) -> Palette:
+        colors = [
+            Color.from_srgb_float((float(r), float(g), float(b)), float(frequency), alpha=float(alpha))
+            for r, g, b, alpha, frequency in self.values
+        ]
+        return Palette(colors, metadata=self.metadata)
+
+
+def extract_compact(extract: Callable[[ImageInput], Palette], image: ImageInput | SharedImage) -> CompactPalette:
+    """Process-worker task: run ``extract`` on ``image``, mapping it from shared memory if needed.
+
+    A PIL input arrives as a new image over the shared pixels, so its palette
+    metadata describes that copy; the caller restores the original's details.
+    """
+    if not isinstance(image, SharedImage):
+        return CompactPalette.from_palette(extract(image))
+
+    block = SharedMemory(name=image.name)
+    try:
+        arr = np.ndarray(image.shape, dtype=np.dtype(image.dtype), buffer=block.buf)
+        palette = extract(Image.fromarray(arr, mode=image.mode) if image.mode is not None else arr)
+        del arr
+    finally:
+        try:
+            block.close()
+        except BufferError:
+            # A traceback still references the mapped pixels; the mapping is
+            # released with it, and the parent unlinks the block either way.
+            pass
+    return CompactPalette.from_palette(palette)
@@ -0,0 +1,187 @@
+"""Shared clustering kernels for large palette sizes.
+
+The k-means extractors hand every pixel to scikit-learn's ``KMeans``, whose
+k-means++ seeding and Lloyd iterations both cost ``O(n_pixels * palette_size)``.
+That is negligible for a 5-color palette but dominates runtime at the 64-256
+colors used for GIF / indexed-PNG export. From :data:`LARGE_PALETTE_SIZE`
+colors upwards the extractors switch to :func:`cluster_large`, which
+
+1. collapses the pixels to their distinct colors with counts (one ``np.unique``
+   over packed 32-bit RGBA), so repeated colors are clustered once;
+2. fits a count-weighted ``KMeans`` on a fixed-size uniform sample of those
+   distinct colors, bounding the fit cost independently of image size;
+3. assigns every distinct color to its nearest centroid with a KD-tree
+   (``O(log k)`` per query instead of ``O(k)``), and
+4. finishes with one exact update step, so every centroid is the true mean of
+   the pixels assigned to it and frequencies count every pixel.
+"""
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+# Palette sizes from which the extractors use the large-palette kernels.
+LARGE_PALETTE_SIZE = 64
+
+# Maximum number of distinct colors the weighted KMeans is fitted on.
+FIT_SAMPLE_SIZE = 1 << 14
+
+
+def unique_colors(pixels: NDArray[np.uint8]) -> tuple[NDArray[np.uint8], NDArray[np.intp]]:
+    """Collapse ``(n, 4)`` RGBA pixels into their distinct colors.
+
+    Returns:
+        The distinct colors (``(m, 4)`` uint8) and how many pixels have each (``(m,)``).
+    """
+    packed = np.ascontiguousarray(pixels, dtype=np.uint8).view(np.uint32).ravel()
+    values, counts = np.unique(packed, return_counts=True)
+    return values.view(np.uint8).reshape(-1, 4), counts
+
+
+def cluster_large(
+    points: ArrayLike,
+    weights: ArrayLike,
+    n_clusters: int,
+    random_state: int = 2024,
+    init: NDArray[np.float64] | None = None,
+) -> tuple[NDArray[np.float64], NDArray[np.intp]]:
+    """Weighted k-means for many clusters over (distinct) points.
+
+    Parameters:
+        points: ``(m, d)`` points to cluster, typically the distinct colors of an image.
+        weights: ``(m,)`` positive weight per point, typically its pixel count.
+        n_clusters: Number of clusters; at most ``m`` are returned.
+        random_state: Seed for sampling and k-means++ seeding.
+        init: Optional ``(n_clusters, d)`` starting centroids (a warm start)
+            instead of k-means++ seeding.
+
+    Returns:
+        The ``(k, d)`` centroids (empty clusters dropped) and the ``(m,)`` label
+        of every point into them.
+    """
+    from sklearn.cluster import KMeans
+    from sklearn.neighbors import KDTree
+
+    points = np.asarray(points, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    n_clusters = min(n_clusters, len(points))
+    if init is not None and len(init) != n_clusters:
+        init = None  # cannot seed every cluster; fall back to k-means++
+
+    if len(points) > FIT_SAMPLE_SIZE:
+        rng = np.random.default_rng(random_state)
+        sample = np.sort(rng.choice(len(points), FIT_SAMPLE_SIZE, replace=False))
+    else:
+        sample = np.arange(len(points))
+
+    model = KMeans(
+        n_clusters=n_clusters,
+        n_init="auto",
+        init="k-means++" if init is None else init,  # pyright: ignore[reportArgumentType]
+        random_state=random_state,
+    )
+    model.fit(points[sample], sample_weight=weights[sample])
+
+    labels = np.asarray(KDTree(model.cluster_centers_).query(points, return_distance=False)[:, 0], dtype=np.intp)
+
+    totals = np.bincount(labels, weights=weights, minlength=n_clusters)
+    sums = np.stack(
+        [np.bincount(labels, weights=points[:, c] * weights, minlength=n_clusters) for c in range(points.shape[1])],
+        axis=1,
+    )
+    keep = totals > 0
+    # Renumber labels so they index the kept (non-empty) centroids.
+    remap = np.cumsum(keep) - 1
+    return sums[keep] / totals[keep, None], remap[labels]
+
+
+def _batched_sq_distances(points: NDArray[np.float64], centers: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Squared distances ``(N, S, k)`` between ``(N, S, d)`` points and ``(N, k, d)`` centers."""
+    return (
+        np.einsum("nsd,nsd->ns", points, points)[:, :, None]
+        - 2.0 * points @ centers.transpose(0, 2, 1)
+        + np.einsum("nkd,nkd->nk", centers, centers)[:, None, :]
+    )
+
+
+def _batched_kmeans_plusplus(
+    points: NDArray[np.float64], weights: NDArray[np.float64], n_clusters: int, rng: np.random.Generator
+) -> NDArray[np.float64]:
+    """Weighted k-means++ seeding, run for every image of the batch at once."""
+    n, s, _ = points.shape
+    rows = np.arange(n)
+
+    def draw(p: NDArray[np.float64]) -> NDArray[np.intp]:
+        # One weighted draw per row; rows with no mass left fall back to the weights.
+        p = np.where(p.sum(axis=1, keepdims=True) > 0, p, weights)
+        cdf = np.cumsum(p, axis=1)
+        u = rng.random(n) * cdf[:, -1]
+        return np.minimum((cdf < u[:, None]).sum(axis=1), s - 1)
+
+    centers = np.empty((n, n_clusters, points.shape[2]))
+    centers[:, 0] = points[rows, draw(weights)]
+    closest = np.maximum(_batched_sq_distances(points, centers[:, :1])[:, :, 0], 0.0)
+    for j in range(1, n_clusters):
+        centers[:, j] = points[rows, draw(weights * closest)]
+        closest = np.minimum(closest, np.maximum(_batched_sq_distances(points, centers[:, j : j + 1])[:, :, 0], 0.0))
+    return centers
+
+
+def batched_kmeans(
+    points: ArrayLike,
+    weights: ArrayLike,
+    n_clusters: int,
+    max_iter: int = 100,
+    tol: float = 1e-4,
+    random_state: int = 2024,
+) -> tuple[NDArray[np.float64], NDArray[np.intp]]:
+    """Weighted k-means over a stack of independent point sets, vectorized across the stack.
+
+    Every image of an ``(N, S, d)`` stack gets its own ``n_clusters`` centroids,
+    but seeding (k-means++) and the Lloyd iterations run as whole-stack array
+    operations instead of one estimator per image. Points with weight 0 are
+    padding (e.g. masked-out pixels) and never influence a centroid.
+
+    Parameters:
+        points: ``(N, S, d)`` points, ``S`` samples per image.
+        weights: ``(N, S)`` non-negative weights; every row needs a positive sum.
+        n_clusters: Centroids per image.
+        max_iter: Maximum number of Lloyd iterations.
+        tol: Relative tolerance: every image stops improving once the summed squared
+            centroid shift drops below ``tol`` times its mean per-feature
+            variance (the same criterion as scikit-learn's ``KMeans``).
+        random_state: Seed for k-means++ seeding.
+
+    Returns:
+        The ``(N, k, d)`` centroids and the ``(N, S)`` label of every point.
+        Clusters may end up empty (e.g. fewer distinct points than clusters).
+    """
+    points = np.asarray(points, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    n, _, d = points.shape
+    rng = np.random.default_rng(random_state)
+
+    centers = _batched_kmeans_plusplus(points, weights, n_clusters, rng)
+    mean = np.einsum("ns,nsd->nd", weights, points) / weights.sum(axis=1)[:, None]
+    variance = np.einsum("ns,nsd->n", weights, (points - mean[:, None, :]) ** 2) / weights.sum(axis=1)
+    threshold = tol * variance / d
+    offsets = (np.arange(n) * n_clusters)[:, None]
+    labels = np.zeros(points.shape[:2], dtype=np.intp)
+    for _ in range(max_iter):
+        labels = np.argmin(_batched_sq_distances(points, centers), axis=2)
+        flat = (labels + offsets).ravel()
+        totals = np.bincount(flat, weights=weights.ravel(), minlength=n * n_clusters).reshape(n, n_clusters)
+        sums = np.stack(
+            [
+                np.bincount(flat, weights=(points[:, :, c] * weights).ravel(), minlength=n * n_clusters)
+                for c in range(d)
+            ],
+            axis=1,
+        ).reshape(n, n_clusters, d)
+        hit = totals > 0
+        # Empty clusters keep their previous centroid.
+        updated = np.where(hit[:, :, None], sums / np.where(hit, totals, 1.0)[:, :, None], centers)
+        shift = np.sum((updated - centers) ** 2, axis=(1, 2))
+        centers = updated
+        if np.all(shift <= threshold):
+            break
+    return centers, labels
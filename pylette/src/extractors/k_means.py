@@ -3,6 +3,7 @@ from numpy.typing import NDArray
 from typing_extensions import override
 
 from pylette.src.color import Color
+from pylette.src.extractors.clustering import LARGE_PALETTE_SIZE, cluster_large, unique_colors
 from pylette.src.extractors.protocol import NP_T, ColorExtractorBase
 from pylette.src.extractors.registry import register
 from pylette.types import ExtractionMethod
@@ -25,13 +26,45 @@ class KMeansExtractor(ColorExtractorBase):
             list[Color]: A palette of colors sorted by frequency.
         """
 
-        from sklearn.cluster import KMeans
+        return self._fit(self._reshape_array(arr), palette_size)
+
+    def refine(self, arr: NDArray[NP_T], palette_size: int, previous: list[Color]) -> list[Color]:
+        """
+        Extracts a color palette using KMeans, warm-started from a previous palette.
+
+        Seeding the clusters with colors found on a coarser sample of the same
+        image lets KMeans converge in a few iterations. Falls back to a cold
+        start if ``previous`` cannot seed every cluster.
+
+        Parameters:
+            arr (NDArray[float]): The input array.
+            palette_size (int): The number of colors to extract from the image.
+            previous (list[Color]): The colors to start from.
+
+        Returns:
+            list[Color]: A palette of colors.
+        """
 
         arr = self._reshape_array(arr)
+        init = np.array([c.rgba for c in previous], dtype=np.float64)[:, : arr.shape[1]]
+        if len(init) != min(palette_size, arr.shape[0]):
+            return self._fit(arr, palette_size)
+        return self._fit(arr, palette_size, init)
+
+    def _fit(self, arr: NDArray[NP_T], palette_size: int, init: NDArray[np.float64] | None = None) -> list[Color]:
+        from sklearn.cluster import KMeans
+
+        if palette_size >= LARGE_PALETTE_SIZE:
+            return self._extract_large(arr, palette_size, init)
         # Never request more clusters than there are pixels (degenerate inputs
         # like a 1x1 image); KMeans requires n_clusters <= n_samples.
         n_colors = min(palette_size, arr.shape[0])
-        model = KMeans(n_clusters=n_colors, n_init="auto", init="k-means++", random_state=2024)
+        model = KMeans(
+            n_clusters=n_colors,
+            n_init="auto",
+            init="k-means++" if init is None else init,  # pyright: ignore[reportArgumentType]
+            random_state=2024,
+        )
         labels = model.fit_predict(arr)
         palette = np.array(model.cluster_centers_, dtype=int)
         color_count = np.bincount(labels)
@@ -40,3 +73,13 @@ class KMeansExtractor(ColorExtractorBase):
         for color, freq in zip(palette, color_frequency):
             colors.append(Color(color, freq))
         return colors
+
+    def _extract_large(
+        self, arr: NDArray[NP_T], palette_size: int, init: NDArray[np.float64] | None = None
+    ) -> list[Color]:
+        """Large-palette path: weighted k-means over distinct colors, see :mod:`.clustering`."""
+        colors, counts = unique_colors(np.asarray(arr, dtype=np.uint8))
+        centers, labels = cluster_large(colors, counts, palette_size, init=init)
+        color_count = np.bincount(labels, weights=counts, minlength=len(centers))
+        color_frequency = color_count / float(np.sum(color_count))
+        return [Color(color, freq) for color, freq in zip(np.array(centers, dtype=int), color_frequency)]
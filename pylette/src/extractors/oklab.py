@@ -28,6 +28,7 @@ from typing_extensions import override
 
 from pylette.src.color import Color
 from pylette.src.colorspaces import linear_srgb_to_oklab, linear_to_srgb, oklab_to_linear_srgb, srgb_to_linear
+from pylette.src.extractors.clustering import LARGE_PALETTE_SIZE, cluster_large, unique_colors
 from pylette.src.extractors.protocol import NP_T, ColorExtractorBase
 from pylette.src.extractors.registry import register
 from pylette.src.types import ExtractionMethod
@@ -49,9 +50,36 @@ class OKLabKMeansExtractor(ColorExtractorBase):
             list[Color]: One color per non-empty cluster, with frequencies that
             sum to 1.
         """
-        from sklearn.cluster import KMeans
+        return self._fit(np.asarray(arr).reshape(-1, arr.shape[-1]), palette_size)
+
+    def refine(self, arr: NDArray[NP_T], palette_size: int, previous: list[Color]) -> list[Color]:
+        """Extract a palette in OKLab space, warm-started from a previous palette.
+
+        The clusters are seeded with the OKLab coordinates of ``previous`` (e.g.
+        the palette of a coarser sample of the same image), so k-means converges
+        in a few iterations. Falls back to a cold start if ``previous`` cannot
+        seed every cluster.
 
+        Parameters:
+            arr: Pixel array of shape ``(..., C)`` with ``C >= 3``; RGB(A), uint8.
+            palette_size: Number of clusters / colors to extract.
+            previous: The colors to start from.
+
+        Returns:
+            list[Color]: One color per non-empty cluster, with frequencies that
+            sum to 1.
+        """
         pixels = np.asarray(arr).reshape(-1, arr.shape[-1])
+        init = np.array([c.oklab for c in previous], dtype=np.float64)
+        if len(init) != min(palette_size, len(pixels)):
+            return self._fit(pixels, palette_size)
+        return self._fit(pixels, palette_size, init)
+
+    def _fit(self, pixels: NDArray[NP_T], palette_size: int, init: NDArray[np.float64] | None = None) -> list[Color]:
+        from sklearn.cluster import KMeans
+
+        if palette_size >= LARGE_PALETTE_SIZE:
+            return self._extract_large(pixels, palette_size, init)
         rgb8 = pixels[:, :3].astype(np.float64)
         has_alpha = pixels.shape[1] >= 4
         alpha = pixels[:, 3].astype(np.float64) if has_alpha else np.full(len(pixels), 255.0)
@@ -62,7 +90,12 @@ class OKLabKMeansExtractor(ColorExtractorBase):
         # Never request more clusters than there are pixels (degenerate inputs
         # like a 1x1 image); KMeans requires n_clusters <= n_samples.
         n_clusters = min(palette_size, len(pixels))
-        model = KMeans(n_clusters=n_clusters, n_init="auto", init="k-means++", random_state=2024)
+        model = KMeans(
+            n_clusters=n_clusters,
+            n_init="auto",
+            init="k-means++" if init is None else init,  # pyright: ignore[reportArgumentType]
+            random_state=2024,
+        )
         labels = model.fit_predict(lab)
         centers_lab = np.asarray(model.cluster_centers_)
 
@@ -81,3 +114,26 @@ class OKLabKMeansExtractor(ColorExtractorBase):
             r, g, b = (float(c) for c in centers_srgb[i])
             colors.append(Color.from_srgb_float((r, g, b), counts[i] / total, alpha=mean_alpha))
         return colors
+
+    def _extract_large(
+        self, pixels: NDArray[NP_T], palette_size: int, init: NDArray[np.float64] | None = None
+    ) -> list[Color]:
+        """Large-palette path: weighted k-means over distinct colors, see :mod:`.clustering`."""
+        if pixels.shape[1] == 3:
+            pixels = np.concatenate([pixels, np.full((len(pixels), 1), 255, dtype=pixels.dtype)], axis=1)
+        colors, counts = unique_colors(np.asarray(pixels, dtype=np.uint8))
+        lab = linear_srgb_to_oklab(srgb_to_linear(colors[:, :3].astype(np.float64) / 255.0))
+        centers_lab, labels = cluster_large(lab, counts, palette_size, init=init)
+        centers_srgb = np.clip(linear_to_srgb(oklab_to_linear_srgb(centers_lab)), 0.0, 1.0)
+
+        cluster_counts = np.bincount(labels, weights=counts, minlength=len(centers_lab))
+        alpha_sums = np.bincount(labels, weights=colors[:, 3] * counts, minlength=len(centers_lab))
+        total = float(cluster_counts.sum())
+        return [
+            Color.from_srgb_float(
+                (float(r), float(g), float(b)),
+                cluster_counts[i] / total,
+                alpha=alpha_sums[i] / cluster_counts[i] / 255.0,
+            )
+            for i, (r, g, b) in enumerate(centers_srgb)
+        ]
@@ -0,0 +1,200 @@
+"""Incremental (online) color extraction for pixel streams.
+
+The batch extractors in this package see every pixel of an image at once. For
+live sources -- camera feeds, tiles arriving over a socket -- buffering the
+whole stream into one array is not an option, so the extractors here implement
+:class:`~pylette.src.extractors.protocol.IncrementalColorExtractorBase` instead:
+pixels are fed in chunks with ``partial_fit``, the current palette can be read
+at any moment with ``palette()``, and ``reset()`` starts over.
+
+Both keep a fixed-size summary of the stream, so memory does not grow with the
+number of chunks:
+
+* :class:`StreamingKMeansExtractor` keeps ``palette_size`` running centroids
+  (sequential / MacQueen k-means), optionally with exponential forgetting so
+  the palette tracks a drifting scene.
+* :class:`HistogramExtractor` accumulates a quantized RGB histogram and clusters
+  the occupied bins only when a palette is requested.
+"""
+
+import numpy as np
+from numpy.typing import NDArray
+from typing_extensions import override
+
+from pylette.src.color import Color
+from pylette.src.extractors.protocol import IncrementalColorExtractorBase
+
+# Upper bound on the number of candidate pixels considered when seeding new
+# centroids, so seeding cost does not depend on chunk size.
+_SEED_SAMPLE_SIZE = 4096
+
+
+def _nearest(pixels: NDArray[np.float64], centers: NDArray[np.float64]) -> tuple[NDArray[np.intp], NDArray[np.float64]]:
+    """Return the index of, and squared distance to, the nearest center for every pixel."""
+    distances = (
+        np.einsum("ij,ij->i", pixels, pixels)[:, None]
+        - 2.0 * pixels @ centers.T
+        + np.einsum("ij,ij->i", centers, centers)[None, :]
+    )
+    labels = np.argmin(distances, axis=1)
+    return labels, np.maximum(distances[np.arange(len(pixels)), labels], 0.0)
+
+
+class StreamingKMeansExtractor(IncrementalColorExtractorBase):
+    """Sequential k-means over a pixel stream.
+
+    Every chunk is assigned to its nearest centroids, and each centroid moves to
+    the running mean of the pixels assigned to it. Centroids are seeded with
+    k-means++ from the first distinct colors seen; if the stream has shown fewer
+    than ``palette_size`` distinct colors so far, the remaining centroids are
+    seeded from later chunks. Memory is ``O(palette_size)``.
+
+    Parameters:
+        palette_size: The number of colors to extract.
+        alpha_mask_threshold: Pixels with alpha at or below this value are discarded.
+        decay: Optional forgetting factor in ``(0, 1]`` applied to the
+            accumulated counts before every chunk. ``None`` (or ``1.0``) weighs
+            the whole stream equally; smaller values let the palette follow a
+            changing scene.
+        random_state: Seed for centroid seeding, so a stream always yields the same palette.
+
+    Examples:
+        >>> extractor = StreamingKMeansExtractor(palette_size=5)
+        >>> for frame in camera:
+        ...     extractor.partial_fit(frame)
+        >>> extractor.palette()
+    """
+
+    def __init__(
+        self,
+        palette_size: int = 5,
+        alpha_mask_threshold: int | None = None,
+        decay: float | None = None,
+        random_state: int = 2024,
+    ):
+        super().__init__(palette_size=palette_size, alpha_mask_threshold=alpha_mask_threshold)
+        if decay is not None and not 0.0 < decay <= 1.0:
+            raise ValueError(f"decay must be in (0, 1], got {decay!r}.")
+        self.decay = decay
+        self.random_state = random_state
+        self._reset()
+
+    @override
+    def _reset(self) -> None:
+        self._rng = np.random.default_rng(self.random_state)
+        self._centers: NDArray[np.float64] = np.empty((0, 4), dtype=np.float64)
+        self._counts: NDArray[np.float64] = np.empty(0, dtype=np.float64)
+
+    def _seed(self, pixels: NDArray[np.float64]) -> None:
+        """Add up to the missing number of centroids, chosen by k-means++ among colors not yet covered."""
+        from sklearn.cluster import kmeans_plusplus
+
+        if len(self._centers):
+            _, distances = _nearest(pixels, self._centers)
+            pixels = pixels[distances > 0]
+        candidates = np.unique(pixels, axis=0)
+        if len(candidates) > _SEED_SAMPLE_SIZE:
+            candidates = candidates[self._rng.choice(len(candidates), _SEED_SAMPLE_SIZE, replace=False)]
+        n_new = min(self.palette_size - len(self._centers), len(candidates))
+        if n_new == 0:
+            return
+        seed = int(self._rng.integers(np.iinfo(np.int32).max))
+        new_centers, _ = kmeans_plusplus(candidates, n_clusters=n_new, random_state=seed)
+        self._centers = np.concatenate([self._centers, new_centers])
+        self._counts = np.concatenate([self._counts, np.zeros(n_new)])
+
+    @override
+    def _update(self, pixels: NDArray[np.uint8]) -> None:
+        data = pixels.astype(np.float64)
+        if len(self._centers) < self.palette_size:
+            self._seed(data)
+        if self.decay is not None:
+            self._counts *= self.decay
+
+        labels, _ = _nearest(data, self._centers)
+        n_centers = len(self._centers)
+        chunk_counts = np.bincount(labels, minlength=n_centers).astype(np.float64)
+        chunk_sums = np.stack([np.bincount(labels, weights=data[:, c], minlength=n_centers) for c in range(4)], axis=1)
+
+        hit = chunk_counts > 0
+        self._counts += chunk_counts
+        # Running mean: move each hit centroid towards the mean of its new members,
+        # weighted by how many pixels the centroid already summarizes.
+        self._centers[hit] += (chunk_sums[hit] - chunk_counts[hit, None] * self._centers[hit]) / self._counts[hit, None]
+
+    @override
+    def _colors(self) -> list[Color]:
+        total = float(self._counts.sum())
+        return [
+            Color(tuple(int(v) for v in np.clip(np.round(center), 0, 255)), float(count) / total)
+            for center, count in zip(self._centers, self._counts)
+            if count > 0
+        ]
+
+
+class HistogramExtractor(IncrementalColorExtractorBase):
+    """Histogram-backed extraction over a pixel stream.
+
+    Pixels are binned into a ``2**bits`` levels-per-channel RGB histogram that
+    also accumulates the exact color (and alpha) sums per bin. Updating is a
+    single vectorized ``bincount`` per chunk; the clustering work is deferred to
+    :meth:`palette`, which runs a weighted k-means over the occupied bins only.
+    Memory is ``O(2**(3 * bits))`` regardless of stream length.
+
+    Parameters:
+        palette_size: The number of colors to extract.
+        alpha_mask_threshold: Pixels with alpha at or below this value are discarded.
+        bits: Histogram resolution per channel, in ``[1, 8]``. The default of 5
+            (32768 bins) is fine enough that bin means are indistinguishable
+            from the underlying colors.
+    """
+
+    def __init__(self, palette_size: int = 5, alpha_mask_threshold: int | None = None, bits: int = 5):
+        super().__init__(palette_size=palette_size, alpha_mask_threshold=alpha_mask_threshold)
+        if not 1 <= bits <= 8:
+            raise ValueError(f"bits must be between 1 and 8, got {bits}.")
+        self.bits = bits
+        self._reset()
+
+    @override
+    def _reset(self) -> None:
+        n_bins = 1 << (3 * self.bits)
+        self._counts: NDArray[np.float64] = np.zeros(n_bins, dtype=np.float64)
+        self._sums: NDArray[np.float64] = np.zeros((n_bins, 4), dtype=np.float64)
+
+    @override
+    def _update(self, pixels: NDArray[np.uint8]) -> None:
+        shift = 8 - self.bits
+        q = (pixels[:, :3] >> shift).astype(np.intp)
+        index = (q[:, 0] << (2 * self.bits)) | (q[:, 1] << self.bits) | q[:, 2]
+        n_bins = len(self._counts)
+        self._counts += np.bincount(index, minlength=n_bins)
+        for c in range(4):
+            self._sums[:, c] += np.bincount(index, weights=pixels[:, c], minlength=n_bins)
+
+    @override
+    def _colors(self) -> list[Color]:
+        from sklearn.cluster import KMeans
+
+        occupied = np.flatnonzero(self._counts)
+        weights = self._counts[occupied]
+        means = self._sums[occupied] / weights[:, None]
+        if len(occupied) <= self.palette_size:
+            centers, cluster_weights = means, weights
+        else:
+            model = KMeans(n_clusters=self.palette_size, n_init="auto", init="k-means++", random_state=2024)
+            labels = model.fit_predict(means, sample_weight=weights)
+            cluster_weights = np.bincount(labels, weights=weights, minlength=self.palette_size)
+            # Weighted mean of bin means == exact mean of the member pixels.
+            centers = np.stack(
+                [np.bincount(labels, weights=means[:, c] * weights, minlength=self.palette_size) for c in range(4)],
+                axis=1,
+            )
+            keep = cluster_weights > 0
+            centers, cluster_weights = centers[keep] / cluster_weights[keep, None], cluster_weights[keep]
+
+        total = float(cluster_weights.sum())
+        return [
+            Color(tuple(int(v) for v in np.clip(np.round(center), 0, 255)), float(weight) / total)
+            for center, weight in zip(centers, cluster_weights)
+        ]
@@ -1,11 +1,15 @@
+import threading
 from abc import ABC, abstractmethod
-from typing import Protocol, TypeVar, runtime_checkable
+from typing import TYPE_CHECKING, Protocol, TypeVar, runtime_checkable
 
 import numpy as np
 from numpy.typing import NDArray
 
 from pylette.src.color import Color
 
+if TYPE_CHECKING:
+    from pylette.src.palette import Palette
+
 NP_T = TypeVar("NP_T", bound=np.generic, covariant=True)
 
 
@@ -14,6 +18,13 @@ class ColorExtractor(Protocol):
     def extract(self, arr: NDArray[NP_T], palette_size: int) -> list[Color]: ...
 
 
+@runtime_checkable
+class RefinableColorExtractor(Protocol):
+    """An extractor that can warm-start from a previously extracted palette."""
+
+    def refine(self, arr: NDArray[NP_T], palette_size: int, previous: list[Color]) -> list[Color]: ...
+
+
 class ColorExtractorBase(ABC):
     @abstractmethod
     def extract(self, arr: NDArray[NP_T], palette_size: int) -> list[Color]:
@@ -23,3 +34,94 @@ class ColorExtractorBase(ABC):
         # Reshape to (n_pixels, n_channels) from the array's actual length.
         # Spatial dimensions aren't needed for color clustering.
         return arr.reshape((-1, arr.shape[-1]))
+
+
+@runtime_checkable
+class IncrementalColorExtractor(Protocol):
+    def partial_fit(self, chunk: NDArray[NP_T]) -> "IncrementalColorExtractor": ...
+
+    def palette(self) -> "Palette": ...
+
+    def reset(self) -> None: ...
+
+
+class IncrementalColorExtractorBase(ABC):
+    """Base class for extractors that consume pixels chunk by chunk.
+
+    Unlike :class:`ColorExtractorBase`, which sees every pixel at once, an
+    incremental extractor keeps a fixed-size summary of the stream seen so far,
+    so its memory stays bounded however many chunks are fed to it. Calls on one
+    instance are serialized by a per-instance lock, so several producer threads
+    may feed the same extractor.
+
+    Parameters:
+        palette_size: The number of colors to extract.
+        alpha_mask_threshold: Pixels with alpha at or below this value are
+            discarded, matching :func:`~pylette.extract_colors` (``None`` means
+            ``0``, i.e. only fully transparent pixels are dropped).
+    """
+
+    def __init__(self, palette_size: int = 5, alpha_mask_threshold: int | None = None):
+        if palette_size < 1:
+            raise ValueError(f"palette_size must be at least 1, got {palette_size}.")
+        self.palette_size = palette_size
+        self.alpha_mask_threshold = 0 if alpha_mask_threshold is None else alpha_mask_threshold
+        self.n_pixels_seen = 0
+        self._lock = threading.Lock()
+
+    def partial_fit(self, chunk: NDArray[NP_T]) -> "IncrementalColorExtractorBase":
+        """Fold a chunk of pixels into the running summary.
+
+        Parameters:
+            chunk: Pixel array of shape ``(..., C)`` with ``C`` 3 (RGB) or 4
+                (RGBA), uint8. Chunks may differ in size.
+
+        Returns:
+            The extractor itself, so calls can be chained.
+        """
+        pixels = self._valid_pixels(chunk)
+        if len(pixels):
+            with self._lock:
+                self._update(pixels)
+                self.n_pixels_seen += len(pixels)
+        return self
+
+    def palette(self) -> "Palette":
+        """Return the palette for every pixel seen since construction or the last reset.
+
+        Colors are sorted by descending frequency. Before any pixel has been
+        seen the palette is empty.
+        """
+        from pylette.src.palette import Palette
+
+        with self._lock:
+            colors = self._colors() if self.n_pixels_seen else []
+        colors.sort(reverse=True)
+        return Palette(colors)
+
+    def reset(self) -> None:
+        """Forget every pixel seen so far."""
+        with self._lock:
+            self.n_pixels_seen = 0
+            self._reset()
+
+    def _valid_pixels(self, chunk: NDArray[NP_T]) -> NDArray[np.uint8]:
+        pixels: NDArray[np.uint8] = np.asarray(chunk, dtype=np.uint8)
+        pixels = pixels.reshape((-1, pixels.shape[-1]))
+        if pixels.shape[1] == 3:
+            pixels = np.concatenate([pixels, np.full((len(pixels), 1), 255, dtype=np.uint8)], axis=1)
+        elif pixels.shape[1] != 4:
+            raise ValueError(f"Expected pixels with 3 or 4 channels, got {pixels.shape[1]}.")
+        return pixels[pixels[:, 3] > self.alpha_mask_threshold]
+
+    @abstractmethod
+    def _update(self, pixels: NDArray[np.uint8]) -> None:
+        """Fold ``pixels`` (``(n, 4)`` RGBA, already alpha-masked, ``n >= 1``) into the summary."""
+
+    @abstractmethod
+    def _colors(self) -> list[Color]:
+        """Build the palette colors from the current summary."""
+
+    @abstractmethod
+    def _reset(self) -> None:
+        """Clear the summary."""
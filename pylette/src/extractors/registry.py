@@ -1,7 +1,13 @@
 """
 Registry of color-extraction algorithms
+
+Extractors are stateless: ``extract`` keeps everything in locals, so the single
+registered instance per method is shared by every thread (including on
+free-threaded builds without the GIL). Mutation of the registry itself is
+serialized by a lock, so registering a plugin never races with lookups.
 """
 
+import threading
 from typing import Callable, TypeVar
 
 from pylette.src.exceptions import UnknownExtractionMethodError
@@ -9,6 +15,7 @@ from pylette.src.extractors.protocol import ColorExtractor
 from pylette.src.types import ExtractionMethod, coerce_to_enum
 
 _REGISTRY: dict[ExtractionMethod, ColorExtractor] = {}
+_REGISTRY_LOCK = threading.Lock()
 _E = TypeVar("_E", bound=ColorExtractor)
 
 
@@ -24,10 +31,12 @@ def register(method: ExtractionMethod) -> Callable[[type[_E]], type[_E]]:
     """
 
     def decorator(cls: type[_E]) -> type[_E]:
-        if method in _REGISTRY:
-            existing = type(_REGISTRY[method]).__name__
-            raise ValueError(f"An extractor is already registered for {method} ({existing}).")
-        _REGISTRY[method] = cls()
+        instance = cls()
+        with _REGISTRY_LOCK:
+            if method in _REGISTRY:
+                existing = type(_REGISTRY[method]).__name__
+                raise ValueError(f"An extractor is already registered for {method} ({existing}).")
+            _REGISTRY[method] = instance
         return cls
 
     return decorator
@@ -44,17 +53,16 @@ def get_extractor(method: ExtractionMethod | str) -> ColorExtractor:
 
     method = coerce_to_enum(method, ExtractionMethod, error_cls=UnknownExtractionMethodError)
 
-    try:
-        return _REGISTRY[method]
-    except KeyError:
-        available = ", ".join(sorted(m.value for m in _REGISTRY)) or "(none)"
-        raise UnknownExtractionMethodError(
-            f"No extractor registered for {method.value}. Registered: {available}."
-        ) from None
+    extractor = _REGISTRY.get(method)
+    if extractor is None:
+        available = ", ".join(sorted(m.value for m in available_methods())) or "(none)"
+        raise UnknownExtractionMethodError(f"No extractor registered for {method.value}. Registered: {available}.")
+    return extractor
 
 
 def available_methods() -> list[ExtractionMethod]:
     """
     Return the extraction methods that currently have a registered extractor.
     """
-    return list(_REGISTRY)
+    with _REGISTRY_LOCK:
+        return list(_REGISTRY)
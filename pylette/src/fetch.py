@@ -0,0 +1,200 @@
+"""
+Fetching images over HTTP(S).
+
+:func:`fetch_image_bytes` is the single place URLs are downloaded, for both
+the synchronous API (:func:`~pylette.src.color_extraction.request_image`) and
+the asyncio API, where each fetch runs in a worker thread and
+:class:`HostLimiter` caps how many run against one host at a time. Downloads go
+through one pooled :class:`HttpClient` per process, so a batch of URLs on one
+host reuses its connections.
+"""
+
+import threading
+import urllib.parse
+from typing import TYPE_CHECKING
+
+from pylette.src.exceptions import InvalidImageError
+
+if TYPE_CHECKING:
+    import asyncio
+
+    import requests
+
+
+def is_url(image_str: str) -> bool:
+    """Check if a string is a valid URL."""
+    try:
+        result = urllib.parse.urlparse(image_str)
+        return all([result.scheme, result.netloc])
+    except Exception:
+        return False
+
+
+# Default (connect, read) timeouts in seconds for image downloads.
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+# Default cap on the size of a downloaded image, in bytes.
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class HttpClient:
+    """Pooled HTTP(S) client for downloading images.
+
+    One connection pool (a :class:`requests.adapters.HTTPAdapter`) is kept for
+    the lifetime of the client, so repeated downloads from one host reuse
+    keep-alive connections instead of paying for a TCP/TLS handshake per
+    image. :class:`requests.Session` is not documented as thread-safe, so every
+    thread gets its own session, all mounted on that shared, thread-safe
+    pool. Every request has a timeout, and
+    bodies are streamed with a size cap so an oversized response is rejected
+    without being buffered.
+
+    An accepted body is returned as bytes rather than decoded straight from the
+    socket: :func:`PIL.Image.open` needs a seekable file and reads any other
+    into memory first, and the bytes are also what deduplication and the
+    palette cache hash.
+
+    Parameters:
+        timeout: Seconds to wait, either one number or a ``(connect, read)`` pair.
+        max_bytes: Largest accepted response body; ``None`` for no limit.
+        pool_size: Maximum number of kept-alive connections per host.
+
+    Examples:
+        >>> set_http_client(HttpClient(timeout=2.0, max_bytes=8 * 1024 * 1024))
+    """
+
+    def __init__(
+        self,
+        timeout: float | tuple[float, float] = DEFAULT_TIMEOUT,
+        max_bytes: int | None = DEFAULT_MAX_BYTES,
+        pool_size: int = 32,
+    ):
+        from requests.adapters import HTTPAdapter
+
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"max_bytes must be a positive int or None, got {max_bytes!r}.")
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._local = threading.local()
+
+    def _session(self) -> "requests.Session":
+        import requests
+
+        session: requests.Session | None = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.mount("http://", self.adapter)
+            session.mount("https://", self.adapter)
+        return session
+
+    def fetch(self, image_url: str) -> bytes:
+        """
+        Download the image at ``image_url``.
+
+        Returns:
+            bytes: The encoded image.
+
+        Raises:
+            InvalidImageError: If the URL cannot be fetched, does not point to a
+                valid image, or the image is larger than ``max_bytes``.
+        """
+        import requests
+
+        try:
+            with self._session().get(image_url, timeout=self.timeout, stream=True) as response:
+                # Check if the request was successful and content type is an image
+                if response.status_code != 200 or "image" not in response.headers.get("Content-Type", ""):
+                    raise InvalidImageError("The URL did not point to a valid image.")
+                length = response.headers.get("Content-Length")
+                if self.max_bytes is not None and length is not None and length.isdigit():
+                    if int(length) > self.max_bytes:
+                        raise InvalidImageError(self._too_large(image_url))
+                chunks: list[bytes] = []
+                size = 0
+                for chunk in response.iter_content(_CHUNK_SIZE):
+                    size += len(chunk)
+                    if self.max_bytes is not None and size > self.max_bytes:
+                        raise InvalidImageError(self._too_large(image_url))
+                    chunks.append(chunk)
+        except requests.RequestException as e:
+            raise InvalidImageError(f"Could not fetch {image_url}: {e}") from e
+        return b"".join(chunks)
+
+    def _too_large(self, image_url: str) -> str:
+        return f"The image at {image_url} is larger than max_bytes={self.max_bytes}."
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.adapter.close()
+
+
+_default_client: HttpClient | None = None
+_default_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide :class:`HttpClient`, creating it on first use."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
+
+
+def set_http_client(client: HttpClient | None) -> None:
+    """
+    Replace the process-wide :class:`HttpClient` used for every URL input.
+
+    Passing ``None`` restores a default client on next use. The previous client
+    is not closed. Process-pool workers each create their own default client.
+    """
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
+
+
+def fetch_image_bytes(image_url: str) -> bytes:
+    """
+    Download the image at ``image_url`` with the process-wide :class:`HttpClient`.
+
+    Returns:
+        bytes: The encoded image.
+
+    Raises:
+        InvalidImageError: If the URL does not point to a valid image.
+    """
+    return get_http_client().fetch(image_url)
+
+
+class HostLimiter:
+    """Caps the number of concurrent fetches per host in asyncio code.
+
+    Calling the limiter with a URL returns the :class:`asyncio.Semaphore` for
+    that URL's host (scheme-less ``host[:port]``), created on first use.
+
+    Parameters:
+        per_host: Maximum number of simultaneous fetches against one host.
+
+    Examples:
+        >>> limiter = HostLimiter(per_host=2)
+        >>> async with limiter("https://example.com/a.png"):
+        ...     ...
+    """
+
+    def __init__(self, per_host: int = 4):
+        if per_host < 1:
+            raise ValueError(f"per_host must be at least 1, got {per_host}.")
+        self.per_host = per_host
+        self._semaphores: dict[str, "asyncio.Semaphore"] = {}
+
+    def __call__(self, url: str) -> "asyncio.Semaphore":
+        import asyncio
+
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self.per_host)
+        return semaphore
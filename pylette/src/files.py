@@ -0,0 +1,65 @@
+"""
+Reading local image files with deterministic file-handle lifetimes.
+
+Every local file Pylette decodes is opened through :func:`open_file` and
+closed as soon as its pixels are decoded (or decoding fails), not when the
+garbage collector gets to a lazily opened image. A threaded batch therefore
+holds at most one descriptor per worker, however many files it reads.
+
+Files are opened with a sequential read-ahead hint (``posix_fadvise``) where
+the platform has one. With :func:`set_mmap_reads`, they are memory-mapped
+instead of read through a buffer, so the decoder reads straight from the page
+cache, which saves a copy on large files that are scanned once.
+
+The setting is per process: worker processes started with ``spawn`` or
+``forkserver`` read through a buffer unless they call :func:`set_mmap_reads`
+themselves.
+"""
+
+import mmap
+import os
+from pathlib import Path
+from typing import BinaryIO, cast
+
+_mmap_reads = False
+
+
+def set_mmap_reads(enabled: bool = True) -> None:
+    """Memory-map local image files instead of reading them through a buffer (off by default)."""
+    global _mmap_reads
+    _mmap_reads = enabled
+
+
+def _advise_sequential(fd: int) -> None:
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass  # only a hint; some file systems reject it
+
+
+def open_file(path: str | Path) -> BinaryIO:
+    """
+    Open a local file for one sequential read, memory-mapped if enabled by :func:`set_mmap_reads`.
+
+    The caller owns the returned file and must close it.
+
+    Raises:
+        OSError: If the file cannot be opened.
+    """
+    f = open(path, "rb")
+    try:
+        _advise_sequential(f.fileno())
+        if not _mmap_reads:
+            return f
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return f  # empty files cannot be mapped
+    except BaseException:
+        f.close()
+        raise
+    f.close()  # the map keeps its own descriptor
+    if hasattr(mapped, "madvise"):
+        mapped.madvise(mmap.MADV_SEQUENTIAL)
+    return cast(BinaryIO, mapped)
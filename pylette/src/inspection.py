@@ -0,0 +1,140 @@
+"""
+Header-only image inspection, for planning batches.
+
+:func:`inspect_image` reads what an image's header tells -- its size, format,
+mode and whether it has an alpha channel -- without decoding its pixels, as the
+same :class:`~pylette.types.ImageInfo` extraction records in palette metadata.
+:func:`inspect_images` inspects many images on a thread pool, for cost
+estimates, filtering and sharding before a large job.
+
+Local files and ``file://`` URIs are opened as extraction opens them (through
+:func:`~pylette.src.files.open_file`) and read only as far as their header;
+archive members, URLs and other URIs are loaded whole, but not decoded.
+:func:`read_header` is also what :mod:`pylette.src.scheduling` predicts costs
+from.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO, Sequence
+
+import numpy as np
+from PIL import Image
+
+from pylette.src.exceptions import ImageTooLargeError, InvalidImageError
+from pylette.src.files import open_file
+from pylette.src.loaders import FileLoader, loader_for, read_uri
+from pylette.src.types import ImageInfo, ImageInput, InspectResult, PILImage
+
+# Threads reading headers: opening files and loading URIs is I/O-bound.
+_INSPECT_WORKERS = 16
+
+_ALPHA_MODES = ("RGBA", "RGBa", "LA", "La", "PA")
+
+
+def _info(img: PILImage) -> ImageInfo:
+    return ImageInfo(
+        original_size=img.size,
+        processed_size=img.size,
+        format=img.format,
+        mode=img.mode,
+        has_alpha=img.mode in _ALPHA_MODES or "transparency" in img.info,
+    )
+
+
+def _read_stream(f: BinaryIO) -> tuple[ImageInfo, int]:
+    """Read the header of the encoded image in ``f``, then close ``f``; returns it and the encoded size."""
+    with f, Image.open(f) as img:
+        info = _info(img)
+        f.seek(0, os.SEEK_END)
+        return info, f.tell()
+
+
+def _read_header(image: ImageInput) -> tuple[ImageInfo, int | None]:
+    if isinstance(image, Image.Image):
+        return _info(image), None
+    if isinstance(image, (str, Path)):
+        loader = loader_for(image)
+        if loader is None:
+            return _read_stream(open_file(image))
+        if isinstance(loader, FileLoader):
+            return _read_stream(loader.load(str(image)))
+        loaded = read_uri(str(image), loader)
+        if isinstance(loaded, Image.Image):
+            with loaded:
+                return _info(loaded), None
+        return _read_stream(BytesIO(loaded))
+    if isinstance(image, bytes):
+        return _read_stream(BytesIO(image))
+    if hasattr(image, "__array__"):
+        with Image.fromarray(np.asarray(image)) as img:
+            return _info(img), None
+    raise InvalidImageError(f"Unsupported image type: {type(image)}")
+
+
+def read_header(image: ImageInput) -> tuple[ImageInfo, int | None]:
+    """
+    Read the :class:`~pylette.types.ImageInfo` of ``image`` from its header.
+
+    Returns:
+        The info and the encoded size in bytes (``None`` for decoded inputs:
+        PIL images and arrays).
+
+    Raises:
+        InvalidImageError: If ``image`` cannot be loaded or its header cannot be read.
+        ImageTooLargeError: If PIL rejects the header as a decompression bomb.
+    """
+    try:
+        return _read_header(image)
+    except InvalidImageError:
+        raise
+    except Image.DecompressionBombError as e:
+        raise ImageTooLargeError(f"Could not read image header: {e}") from e
+    except Exception as e:
+        raise InvalidImageError(f"Could not read image header: {e}") from e
+
+
+def inspect_image(image: ImageInput) -> ImageInfo:
+    """
+    Read the size, format, mode and alpha flag of ``image`` from its header.
+
+    The pixels are not decoded, so this is cheap even for very large images.
+    ``processed_size`` equals ``original_size``.
+
+    Raises:
+        InvalidImageError: If ``image`` cannot be loaded or its header cannot be read.
+    """
+    return read_header(image)[0]
+
+
+def inspect_images(images: Sequence[ImageInput], max_workers: int | None = None) -> list[InspectResult]:
+    """
+    Inspect the headers of many images concurrently (see :func:`inspect_image`).
+
+    Parameters:
+        images: The images to inspect.
+        max_workers: Threads reading headers; defaults to 16.
+
+    Returns:
+        One :class:`~pylette.types.InspectResult` per input, in input order.
+        Inputs that cannot be read have ``info=None`` and the error in
+        ``exception``.
+    """
+    if max_workers is not None and max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got {max_workers}.")
+
+    def inspect_one(index: int) -> InspectResult:
+        image = images[index]
+        try:
+            info, n_bytes = read_header(image)
+        except Exception as e:
+            return InspectResult(source=image, exception=e, index=index)
+        return InspectResult(source=image, info=info, n_bytes=n_bytes, index=index)
+
+    workers = max_workers or _INSPECT_WORKERS
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(workers, len(images))), thread_name_prefix="pylette-inspect"
+    ) as pool:
+        return list(pool.map(inspect_one, range(len(images))))
@@ -0,0 +1,185 @@
+"""
+Registry of image loaders, keyed by URI scheme.
+
+A string input whose scheme has a registered loader (``https://...``,
+``file:///...``, or e.g. ``blob://bucket/key`` once a loader for ``blob`` is
+registered) is loaded through that loader, and an archive member
+(``shard.tar::images/cat.jpg``, see :mod:`pylette.src.archives`) through the
+archive loader; every other string is a local path. A loader returns the
+encoded bytes, a binary stream or a decoded :class:`PIL.Image.Image`; Pylette
+closes streams once read and images once their pixels are decoded.
+
+Every loader declares ``max_concurrency``, the number of loads it sustains at
+once (a connection pool size, a rate limit), or ``None`` for no limit.
+:func:`~pylette.iter_extract_colors` and :func:`~pylette.batch_extract_colors`
+group the work by loader and never run more of a loader's inputs at a time,
+so a slow store does not take up every worker while other inputs wait.
+
+Loaders are shared between threads, so ``load`` must be thread-safe. The
+registry lives in the process it is populated in: worker processes start
+from a fresh import and only know the built-in loaders.
+"""
+
+import threading
+import urllib.parse
+from io import BytesIO
+from typing import BinaryIO, Protocol, runtime_checkable
+
+from PIL import Image
+
+from pylette.src.archives import ARCHIVE_LOADER, split_member
+from pylette.src.exceptions import InvalidImageError
+from pylette.src.fetch import HttpClient, get_http_client, is_url
+from pylette.src.files import open_file
+from pylette.src.types import ImageInput, PILImage
+
+
+@runtime_checkable
+class ImageLoader(Protocol):
+    """Loads the images of one or more URI schemes."""
+
+    max_concurrency: int | None
+    """Most loads to run at once; ``None`` for no limit."""
+
+    def load(self, uri: str) -> "bytes | BinaryIO | PILImage": ...
+
+
+class HttpLoader:
+    """Loads ``http`` and ``https`` URIs through an :class:`~pylette.HttpClient`.
+
+    Parameters:
+        client: The client to download with; ``None`` uses the process-wide
+            client (see :func:`~pylette.set_http_client`), looked up on every load.
+        max_concurrency: Most downloads to run at once.
+    """
+
+    def __init__(self, client: HttpClient | None = None, max_concurrency: int | None = None):
+        self.client = client
+        self.max_concurrency = max_concurrency
+
+    def load(self, uri: str) -> bytes:
+        return (self.client or get_http_client()).fetch(uri)
+
+
+class FileLoader:
+    """Loads ``file://`` URIs from the local file system."""
+
+    max_concurrency: int | None = None
+
+    def load(self, uri: str) -> BinaryIO:
+        from urllib.request import url2pathname
+
+        parts = urllib.parse.urlsplit(uri)
+        if parts.netloc not in ("", "localhost"):
+            raise InvalidImageError(f"Cannot load {uri}: file URIs on remote hosts are not supported.")
+        try:
+            return open_file(url2pathname(parts.path))
+        except OSError as e:
+            raise InvalidImageError(f"Could not load image: {e}") from e
+
+
+_REGISTRY: dict[str, ImageLoader] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def register_loader(scheme: str, loader: ImageLoader, replace: bool = False) -> None:
+    """
+    Load every input with the URI scheme ``scheme`` through ``loader``.
+
+    Raises:
+        ValueError: If a loader is already registered for ``scheme`` and
+            ``replace`` is ``False``, or ``scheme`` is not a valid URI scheme
+            (single letters are reserved for Windows drive letters).
+    """
+    scheme = scheme.lower()
+    if len(scheme) < 2 or not scheme[0].isalpha() or not all(c.isalnum() or c in "+-." for c in scheme):
+        raise ValueError(f"Invalid URI scheme: {scheme!r}.")
+    with _REGISTRY_LOCK:
+        if scheme in _REGISTRY and not replace:
+            existing = type(_REGISTRY[scheme]).__name__
+            raise ValueError(f"A loader is already registered for {scheme!r} ({existing}).")
+        _REGISTRY[scheme] = loader
+
+
+def unregister_loader(scheme: str) -> None:
+    """Remove the loader for ``scheme``, if any."""
+    with _REGISTRY_LOCK:
+        _REGISTRY.pop(scheme.lower(), None)
+
+
+def registered_schemes() -> list[str]:
+    """Return the URI schemes that currently have a registered loader."""
+    with _REGISTRY_LOCK:
+        return list(_REGISTRY)
+
+
+def _scheme(image: ImageInput) -> str | None:
+    if not isinstance(image, str):
+        return None  # a Path is always local
+    scheme = image.partition(":")[0].lower()
+    return scheme if len(scheme) > 1 and image[len(scheme) : len(scheme) + 1] == ":" else None
+
+
+def loader_for(image: ImageInput) -> ImageLoader | None:
+    """
+    Return the loader for ``image``, or ``None`` if it is not a URI (a local path or an in-memory image).
+
+    Raises:
+        InvalidImageError: If ``image`` is a URL whose scheme has no registered loader.
+    """
+    if split_member(image) is not None:
+        return ARCHIVE_LOADER
+    scheme = _scheme(image)
+    if scheme is None:
+        return None
+    loader = _REGISTRY.get(scheme)
+    if loader is None and isinstance(image, str) and is_url(image):
+        available = ", ".join(sorted(_REGISTRY)) or "(none)"
+        raise InvalidImageError(f"No loader registered for the {scheme!r} scheme. Registered: {available}.")
+    return loader
+
+
+def is_uri(image: ImageInput) -> bool:
+    """Check whether ``image`` is loaded through a loader; unknown URL schemes count, and fail to load."""
+    try:
+        return loader_for(image) is not None
+    except InvalidImageError:
+        return True
+
+
+def read_uri(uri: str, loader: ImageLoader | None = None) -> bytes | PILImage:
+    """
+    Load ``uri`` with its loader, as encoded bytes or a decoded image.
+
+    Raises:
+        InvalidImageError: If the scheme has no loader or loading fails.
+    """
+    loader = loader or loader_for(uri)
+    if loader is None:
+        raise InvalidImageError(f"{uri} is not a URI.")
+    try:
+        loaded = loader.load(uri)
+        if isinstance(loaded, (bytes, Image.Image)):
+            return loaded
+        with loaded:
+            return loaded.read()
+    except InvalidImageError:
+        raise
+    except Exception as e:
+        raise InvalidImageError(f"Could not load {uri}: {e}") from e
+
+
+def open_uri(uri: str, loader: ImageLoader | None = None) -> PILImage:
+    """Load ``uri`` with its loader and open it as an image (decoded lazily, so the header can be checked first)."""
+    loaded = read_uri(uri, loader)
+    return loaded if isinstance(loaded, Image.Image) else Image.open(BytesIO(loaded))
+
+
+def _register_builtins() -> None:
+    http = HttpLoader()
+    register_loader("http", http)
+    register_loader("https", http)
+    register_loader("file", FileLoader())
+
+
+_register_builtins()
@@ -294,6 +294,10 @@ class Palette:
                 metadata_dict["image_info"] = self.metadata["image_info"]
             if "processing_stats" in self.metadata:
                 metadata_dict["processing_stats"] = self.metadata["processing_stats"]
+            if "refinement" in self.metadata:
+                metadata_dict["refinement"] = self.metadata["refinement"]
+            if "cached" in self.metadata:
+                metadata_dict["cached"] = self.metadata["cached"]
 
             palette_data["metadata"] = metadata_dict
 
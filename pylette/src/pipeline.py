@@ -0,0 +1,363 @@
+"""
+Staged extraction: read, decode and extract on separate worker pools.
+
+:func:`~pylette.iter_extract_colors` runs each image from start to finish on one
+worker, so a worker waiting on the disk or the network holds a CPU slot, and
+busy CPU slots hold up fetching. :func:`pipeline_extract_colors` instead splits
+the work into three stages connected by bounded queues:
+
+1. **read** -- file bytes are read and URIs loaded by many threads
+   (``read_workers``), at most ``max_concurrency`` at a time per loader;
+2. **decode** -- bytes are decoded into images (``decode_workers``);
+3. **extract** -- palettes are extracted (``extract_workers``).
+
+Every stage has its own thread count, so I/O concurrency can far exceed the
+number of cores while extraction stays at about one thread per core, and the
+bounded queues keep a fast stage from racing ahead of a slow one. Throughput
+thus approaches the slower of the I/O and CPU limits. Queue depths and busy
+time per stage are reported live in a :class:`~pylette.types.PipelineStats`.
+"""
+
+import os
+import queue
+import threading
+import time
+from contextlib import nullcontext
+from functools import partial
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Literal
+
+from PIL import Image
+
+from pylette.src.color_extraction import check_max_pixels, extract_colors, restore_source_metadata
+from pylette.src.exceptions import InvalidImageError
+from pylette.src.files import open_file
+from pylette.src.loaders import ImageLoader, loader_for, read_uri
+from pylette.src.palette import Palette
+from pylette.src.types import UNSET, BatchResult, ExtractionMethod, ImageInput, PipelineStats, Preset, StageStats, Unset
+
+# Default number of threads reading file and URL bytes.
+_READ_WORKERS = 16
+
+# How often blocked stages and the consumer check for a stop.
+_POLL_SECONDS = 0.05
+
+# Marks the end of the input on every queue.
+_DONE: Any = object()
+
+
+class _Channel:
+    """A bounded queue into a stage that records its depth and gives up once ``stop`` is set."""
+
+    def __init__(self, capacity: int, stats: StageStats | None, lock: threading.Lock, stop: threading.Event):
+        self.queue: queue.Queue[Any] = queue.Queue(capacity)
+        self.stats = stats
+        self.lock = lock
+        self.stop = stop
+
+    def put(self, item: Any) -> bool:
+        while not self.stop.is_set():
+            try:
+                self.queue.put(item, timeout=_POLL_SECONDS)
+            except queue.Full:
+                continue
+            if self.stats is not None:
+                depth = self.queue.qsize()
+                with self.lock:
+                    self.stats.max_depth = max(self.stats.max_depth, depth)
+                    self.stats.depth_total += depth
+                    self.stats.depth_samples += 1
+            return True
+        return False
+
+    def get(self) -> Any:
+        while not self.stop.is_set():
+            try:
+                return self.queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return _DONE
+
+
+class _LoaderSlots:
+    """Per-loader semaphores holding concurrent reads to each loader's ``max_concurrency``."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.semaphores: dict[ImageLoader, threading.Semaphore] = {}
+
+    def __call__(self, loader: ImageLoader) -> threading.Semaphore | nullcontext[None]:
+        if loader.max_concurrency is None:
+            return nullcontext()
+        with self.lock:
+            if loader not in self.semaphores:
+                self.semaphores[loader] = threading.Semaphore(loader.max_concurrency)
+            return self.semaphores[loader]
+
+
+def _read(image: ImageInput, payload: Any, slots: _LoaderSlots) -> Any:
+    """Stage 1: read file bytes and load URIs; every other input passes through."""
+    if not isinstance(image, (str, Path)):
+        return payload
+    loader = loader_for(image)
+    if loader is not None:
+        with slots(loader):
+            return read_uri(str(image), loader)
+    try:
+        with open_file(image) as f:
+            return f.read()
+    except OSError as e:
+        raise InvalidImageError(f"Could not load image: {e}") from e
+
+
+def _decode(image: ImageInput, payload: Any, max_pixels: int | None = None) -> Any:
+    """Stage 2: decode bytes into a fully loaded image, checking ``max_pixels`` on the header first."""
+    if not isinstance(payload, bytes):
+        return payload
+    try:
+        img = Image.open(BytesIO(payload))
+    except Exception as e:
+        raise InvalidImageError(f"Could not load image: {e}") from e
+    check_max_pixels(img, max_pixels)
+    try:
+        img.load()
+    except Exception as e:
+        raise InvalidImageError(f"Could not load image: {e}") from e
+    return img
+
+
+def _run_stage(
+    work: Callable[[ImageInput, Any], Any],
+    inbox: _Channel,
+    outbox: _Channel,
+    stats: StageStats,
+    remaining: list[int],
+    next_workers: int,
+) -> None:
+    """Worker loop: apply ``work`` to every item; the last worker to finish passes the end on.
+
+    Items are ``(input position, input, payload, error)``; once a stage fails,
+    later stages pass the item through untouched.
+    """
+    while (item := inbox.get()) is not _DONE:
+        index, source, payload, error = item
+        if error is None:
+            start = time.perf_counter()
+            try:
+                payload = work(source, payload)
+            except Exception as e:
+                error = e
+            elapsed = time.perf_counter() - start
+            with inbox.lock:
+                stats.processed += 1
+                stats.busy_seconds += elapsed
+        if not outbox.put((index, source, payload, error)):
+            return
+    with inbox.lock:
+        remaining[0] -= 1
+        last = remaining[0] == 0
+    if last:
+        for _ in range(next_workers):
+            outbox.put(_DONE)
+
+
+def pipeline_extract_colors(
+    images: Iterable[ImageInput],
+    palette_size: int = 5,
+    resize: int | bool | None | Unset = UNSET,
+    mode: ExtractionMethod | str | None = None,
+    sort_mode: Literal["luminance", "frequency"] | None = None,
+    alpha_mask_threshold: int | None = None,
+    time_budget: float | None = None,
+    preset: Preset | str | None = None,
+    read_workers: int = _READ_WORKERS,
+    decode_workers: int | None = None,
+    extract_workers: int | None = None,
+    queue_size: int | None = None,
+    max_in_flight: int | None = None,
+    cancel: threading.Event | None = None,
+    native_threads: int | None = None,
+    ordered: bool = False,
+    stats: PipelineStats | None = None,
+    max_pixels: int | None = None,
+) -> Iterator[BatchResult]:
+    """
+    Extract colors from a stream of images with separate read, decode and extract stages.
+
+    Like :func:`~pylette.iter_extract_colors`, ``images`` is consumed lazily and
+    results are yielded as they finish, but file and URL reads, decoding and
+    extraction each run on their own threads with a bounded queue in front of
+    every stage (see :mod:`pylette.src.pipeline`). Use it for corpora where
+    I/O latency is significant, e.g. URLs or network file systems; for local,
+    in-memory or already decoded inputs :func:`~pylette.iter_extract_colors`
+    is just as fast.
+
+    Parameters:
+        images: The input images; any iterable of :func:`~pylette.extract_colors` inputs.
+        read_workers: Threads reading file and URL bytes.
+        decode_workers: Threads decoding images; defaults to the number of CPUs.
+        extract_workers: Threads extracting palettes; defaults to the number of CPUs.
+        queue_size: Capacity of each queue between stages; defaults to twice the
+            worker count of the stage it feeds.
+        max_in_flight: Maximum number of images read but not yet yielded;
+            defaults to twice the total number of workers.
+        cancel: Optional event that stops the run once set, without waiting for
+            the images still being processed.
+        native_threads: Maximum number of OpenMP threads each extraction may
+            start; defaults to the CPU count divided by ``extract_workers``.
+        ordered: Yield results in input order instead of completion order.
+        stats: Optional :class:`~pylette.types.PipelineStats` that is updated
+            with per-stage counters and queue depths while the pipeline runs.
+        max_pixels: Optional maximum number of pixels per image, checked when
+            decoding, before the pixel data is read; larger images fail with
+            :class:`~pylette.ImageTooLargeError`.
+        **kwargs: Every other parameter is as in :func:`~pylette.extract_colors`.
+
+    Yields:
+        BatchResult: One result per input, with ``index`` set to the input's
+        position in ``images``. Failures in any stage carry their exception.
+
+    Raises:
+        ValueError: If a worker count, ``queue_size``, ``max_in_flight``,
+            ``native_threads`` or ``max_pixels`` is not positive.
+
+    Examples:
+        >>> stats = PipelineStats()
+        >>> for result in pipeline_extract_colors(urls, read_workers=64, stats=stats):
+        ...     save(result.index, result.palette)
+        >>> stats.extract.mean_depth  # near capacity: extraction is the bottleneck
+    """
+    from pylette.src.executors import limit_native_threads, native_threads_for
+
+    for name, value in [
+        ("read_workers", read_workers),
+        ("decode_workers", decode_workers),
+        ("extract_workers", extract_workers),
+        ("queue_size", queue_size),
+        ("max_in_flight", max_in_flight),
+        ("native_threads", native_threads),
+        ("max_pixels", max_pixels),
+    ]:
+        if value is not None and value < 1:
+            raise ValueError(f"{name} must be a positive int, got {value!r}.")
+    cpus = os.cpu_count() or 1
+    if decode_workers is None:
+        decode_workers = cpus
+    if extract_workers is None:
+        extract_workers = cpus
+    window = max_in_flight or 2 * (read_workers + decode_workers + extract_workers)
+    stats = stats if stats is not None else PipelineStats()
+
+    extract = partial(
+        extract_colors,
+        palette_size=palette_size,
+        resize=resize,
+        mode=mode,
+        sort_mode=sort_mode,
+        alpha_mask_threshold=alpha_mask_threshold,
+        time_budget=time_budget,
+        preset=preset,
+        max_pixels=max_pixels,
+    )
+
+    extract = limit_native_threads(extract, native_threads or native_threads_for(extract_workers))
+
+    def extract_stage(image: ImageInput, payload: Any) -> Palette:
+        palette = extract(payload)
+        if isinstance(payload, Image.Image) and payload is not image:
+            # Extraction saw the decoded copy; describe the caller's input.
+            restore_source_metadata(palette, image, payload)
+        return palette
+
+    lock = threading.Lock()
+    stop = threading.Event()
+    slots = threading.Semaphore(window)
+    stages = [
+        ("read", partial(_read, slots=_LoaderSlots()), read_workers, stats.read),
+        ("decode", partial(_decode, max_pixels=max_pixels), decode_workers, stats.decode),
+        ("extract", extract_stage, extract_workers, stats.extract),
+    ]
+    channels = [_Channel(queue_size or 2 * workers, st, lock, stop) for _, _, workers, st in stages]
+    results = _Channel(queue_size or 2 * extract_workers, None, lock, stop)
+    channels.append(results)
+    feed_error: list[BaseException] = []
+
+    def feed() -> None:
+        inputs = enumerate(images)
+        try:
+            while True:
+                # Take a slot before pulling the next input, so no more than
+                # ``window`` inputs are ever drawn from ``images``.
+                while not slots.acquire(timeout=_POLL_SECONDS):
+                    if stop.is_set():
+                        return
+                item = next(inputs, None)
+                if item is None:
+                    break
+                index, image = item
+                if not channels[0].put((index, image, image, None)):
+                    return
+        except BaseException as e:
+            feed_error.append(e)
+        for _ in range(read_workers):
+            channels[0].put(_DONE)
+
+    threads = [threading.Thread(target=feed, name="pylette-feed", daemon=True)]
+    for i, (name, work, workers, st) in enumerate(stages):
+        st.workers = workers
+        st.capacity = channels[i].queue.maxsize
+        next_workers = stages[i + 1][2] if i + 1 < len(stages) else 1
+        remaining = [workers]
+        for n in range(workers):
+            threads.append(
+                threading.Thread(
+                    target=_run_stage,
+                    args=(work, channels[i], channels[i + 1], st, remaining, next_workers),
+                    name=f"pylette-{name}-{n}",
+                    daemon=True,
+                )
+            )
+    for thread in threads:
+        thread.start()
+
+    held: dict[int, BatchResult] = {}
+    next_index = 0
+    abandon = False
+    try:
+        while True:
+            if cancel is not None and cancel.is_set():
+                abandon = True
+                return
+            try:
+                item = results.queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                break
+            index, source, payload, error = item
+            if error is not None:
+                result = BatchResult(source=source, exception=error, index=index)
+            else:
+                result = BatchResult(source=source, result=payload, index=index)
+            if ordered:
+                held[index] = result
+                while next_index in held:
+                    slots.release()
+                    yield held.pop(next_index)
+                    next_index += 1
+            else:
+                slots.release()
+                yield result
+        if feed_error:
+            raise feed_error[0]
+    except GeneratorExit:
+        raise
+    except BaseException:
+        abandon = True
+        raise
+    finally:
+        stop.set()
+        if not abandon:
+            for thread in threads:
+                thread.join()
@@ -0,0 +1,135 @@
+"""
+Named speed/quality presets, and the cost model behind ``preset="auto"``.
+
+A preset picks the extraction ``mode`` and the ``resize`` sample size:
+
+* ``fast``: ``MedianCut`` on a 64x64 sample.
+* ``balanced``: ``KMeans`` on a 256x256 sample (the library defaults).
+* ``quality``: ``OKLab`` (perceptual k-means) on a 512x512 sample.
+* ``auto``: chosen per image, see :func:`choose_settings`.
+
+The auto mode predicts the extraction time of each candidate setting with a
+linear cost model (see :func:`estimate_cost`) and picks the highest-quality candidate predicted to finish within
+:data:`AUTO_TARGET_SECONDS`. The coefficients come from
+``benchmarks/cost_model.py``; re-run it to refit them for other hardware.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from pylette.src.extractors.clustering import FIT_SAMPLE_SIZE, LARGE_PALETTE_SIZE
+from pylette.src.types import ExtractionMethod, PILImage, Preset
+
+
+@dataclass(frozen=True)
+class PresetSettings:
+    mode: ExtractionMethod
+    resize: int | None
+
+
+PRESETS: dict[Preset, PresetSettings] = {
+    Preset.FAST: PresetSettings(mode=ExtractionMethod.MC, resize=64),
+    Preset.BALANCED: PresetSettings(mode=ExtractionMethod.KM, resize=256),
+    Preset.QUALITY: PresetSettings(mode=ExtractionMethod.OKLAB, resize=512),
+}
+
+# Extraction time the auto mode aims for, per image.
+AUTO_TARGET_SECONDS = 0.1
+
+# Cost model coefficients, fitted by benchmarks/cost_model.py: a fixed
+# overhead, and nanoseconds per unit of work (per pixel and split level for
+# MedianCut, per pixel and cluster for the k-means extractors).
+_OVERHEAD_SECONDS: dict[ExtractionMethod, float] = {
+    ExtractionMethod.MC: 0.001,
+    ExtractionMethod.KM: 0.005,
+    ExtractionMethod.OKLAB: 0.005,
+}
+_NS_PER_UNIT: dict[ExtractionMethod, float] = {
+    ExtractionMethod.MC: 40.0,
+    ExtractionMethod.KM: 250.0,
+    ExtractionMethod.OKLAB: 150.0,
+}
+# Per-pixel cost of collapsing to distinct colors and KD-tree assignment on the
+# large-palette path.
+_LARGE_NS_PER_PIXEL = 100.0
+
+# Auto-mode candidates, best quality first. Sides larger than the image are
+# skipped in favour of sampling the image at full resolution.
+_AUTO_CANDIDATES: list[tuple[ExtractionMethod, int]] = [
+    (ExtractionMethod.OKLAB, 256),
+    (ExtractionMethod.OKLAB, 128),
+    (ExtractionMethod.MC, 256),
+    (ExtractionMethod.MC, 128),
+    (ExtractionMethod.MC, 64),
+]
+
+# Side of the nearest-neighbour thumbnail used to estimate distinct colors.
+_DISTINCT_SAMPLE_SIDE = 64
+
+
+def work_units(mode: ExtractionMethod, n_pixels: int, palette_size: int) -> float:
+    """The amount of work, in the units of the cost coefficients, to extract from ``n_pixels`` pixels.
+
+    * ``MedianCut`` makes one linear pass over the pixels per level of its
+      split tree: ``n_pixels * log2(palette_size + 1)``.
+    * The k-means extractors compare every pixel to every centroid in each
+      Lloyd iteration: ``n_pixels * palette_size``. From
+      ``LARGE_PALETTE_SIZE`` colors on, the fit runs on a bounded sample of
+      at most ``FIT_SAMPLE_SIZE`` distinct colors instead.
+    """
+    if mode is ExtractionMethod.MC:
+        return n_pixels * math.log2(palette_size + 1)
+    if palette_size < LARGE_PALETTE_SIZE:
+        return n_pixels * palette_size
+    return min(n_pixels, FIT_SAMPLE_SIZE) * palette_size
+
+
+def estimate_cost(mode: ExtractionMethod, n_pixels: int, palette_size: int) -> float:
+    """Predicted extraction time in seconds for ``n_pixels`` sampled pixels."""
+    seconds = _OVERHEAD_SECONDS[mode] + work_units(mode, n_pixels, palette_size) * _NS_PER_UNIT[mode] * 1e-9
+    if mode is not ExtractionMethod.MC and palette_size >= LARGE_PALETTE_SIZE:
+        seconds += n_pixels * _LARGE_NS_PER_PIXEL * 1e-9
+    return seconds
+
+
+def estimate_distinct_colors(img: PILImage) -> int:
+    """Estimate the number of distinct colors from a nearest-neighbour thumbnail (no blended colors)."""
+    side = _DISTINCT_SAMPLE_SIDE
+    thumb = img.convert("RGBA").resize((min(side, img.size[0]), min(side, img.size[1])), resample=0)
+    return len(np.unique(np.asarray(thumb).view(np.uint32)))
+
+
+def choose_settings(img: PILImage, palette_size: int) -> PresetSettings:
+    """Pick the extraction mode and sample size for ``img`` (the ``auto`` preset).
+
+    * Images with at most ``palette_size`` distinct colors (logos, flat
+      graphics) use ``OKLab``, which recovers them exactly; they are sampled
+      at full resolution when affordable, because resampling blends new
+      colors in along every edge.
+    * Otherwise the best candidate from ``OKLab`` at 256/128 down to
+      ``MedianCut`` at 256/128/64 predicted to meet :data:`AUTO_TARGET_SECONDS` wins.
+    """
+    width, height = img.size
+    full = width * height
+    if estimate_distinct_colors(img) <= palette_size:
+        mode = ExtractionMethod.OKLAB
+        if estimate_cost(mode, full, palette_size) <= AUTO_TARGET_SECONDS:
+            return PresetSettings(mode=mode, resize=None)
+        return PresetSettings(mode=mode, resize=256 if 256 * 256 < full else None)
+
+    for mode, side in _AUTO_CANDIDATES:
+        resize: int | None = side if side * side < full else None
+        n_pixels = side * side if resize is not None else full
+        if estimate_cost(mode, n_pixels, palette_size) <= AUTO_TARGET_SECONDS:
+            return PresetSettings(mode=mode, resize=resize)
+    mode, side = _AUTO_CANDIDATES[-1]
+    return PresetSettings(mode=mode, resize=side if side * side < full else None)
+
+
+def resolve_preset(preset: Preset, img: PILImage, palette_size: int) -> PresetSettings:
+    """Return the settings ``preset`` stands for; ``auto`` inspects ``img``."""
+    if preset is Preset.AUTO:
+        return choose_settings(img, palette_size)
+    return PRESETS[preset]
@@ -0,0 +1,115 @@
+"""
+Cost-aware submission order for batch extraction.
+
+A batch finishes when its last image does. Submitted in input order, one large
+image near the end of a batch starts late and runs alone while every other
+worker idles, so it sets the wall time. Ordering the batch by predicted cost,
+most expensive first (longest-processing-time-first scheduling), lets the
+small images fill in around the large ones instead.
+
+The cost of an image is predicted without decoding it: :func:`probe` reads
+only the dimensions and format from the image header, and
+:func:`estimate_image_cost` adds the decode cost for that format and size to
+the extraction cost model of :mod:`pylette.src.presets`. Headers are read on a
+thread pool, as :func:`~pylette.inspect_images` does.
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+from PIL import Image
+
+from pylette.src.inspection import read_header
+from pylette.src.loaders import FileLoader, loader_for
+from pylette.src.presets import estimate_cost
+from pylette.src.types import ExtractionMethod, ImageInput
+
+# Threads reading headers in largest_first: opening files is I/O-bound.
+_PROBE_WORKERS = 16
+
+# Nanoseconds per pixel to decode an image, convert it to RGBA and resize it,
+# by PIL format (measured on 1536x1536 photos); other formats use the default.
+_DECODE_NS_PER_PIXEL: dict[str, float] = {
+    "BMP": 27.0,
+    "GIF": 36.0,
+    "JPEG": 28.0,
+    "PNG": 51.0,
+    "TIFF": 25.0,
+    "WEBP": 54.0,
+}
+_DEFAULT_DECODE_NS_PER_PIXEL = 50.0
+
+# Nanoseconds per pixel to convert and resize an image that is already decoded.
+_CONVERT_NS_PER_PIXEL = 20.0
+
+# Nanoseconds per byte to read a file.
+_READ_NS_PER_BYTE = 1.0
+
+
+@dataclass(frozen=True)
+class ImageProbe:
+    """What an image header reveals about the cost of extracting from it."""
+
+    size: tuple[int, int]
+    format: str | None  # PIL format; None for inputs that are already decoded
+    n_bytes: int | None  # encoded size, for files and bytes
+
+
+def probe(image: ImageInput) -> ImageProbe | None:
+    """Read the dimensions and format of ``image`` without decoding its pixels.
+
+    Headers are read with :func:`~pylette.src.inspection.read_header`, so local
+    files and ``file://`` URIs are opened like extraction opens them and read
+    only as far as the header.
+
+    Returns:
+        The probe, or ``None`` when it cannot be had cheaply (other URIs and
+        archive members, which would have to be loaded whole) or the header
+        cannot be read; the extraction itself reports such errors.
+    """
+    try:
+        if isinstance(image, Image.Image):
+            return ImageProbe(size=image.size, format=None, n_bytes=None)
+        if hasattr(image, "__array__") and not isinstance(image, (str, Path, bytes)):
+            shape = np.shape(image)
+            return ImageProbe(size=(shape[1], shape[0]), format=None, n_bytes=None) if len(shape) >= 2 else None
+        if isinstance(image, (str, Path)):
+            loader = loader_for(image)
+            if loader is not None and not isinstance(loader, FileLoader):
+                return None
+        info, n_bytes = read_header(image)
+    except Exception:
+        return None
+    return ImageProbe(size=info["original_size"], format=info["format"], n_bytes=n_bytes)
+
+
+def estimate_image_cost(info: ImageProbe, mode: ExtractionMethod, palette_size: int, resize: int | None) -> float:
+    """Predicted seconds to load ``info``'s image and extract a palette from it."""
+    width, height = info.size
+    pixels = width * height
+    if info.format is None:
+        ns = pixels * _CONVERT_NS_PER_PIXEL
+    else:
+        ns = pixels * _DECODE_NS_PER_PIXEL.get(info.format, _DEFAULT_DECODE_NS_PER_PIXEL)
+    ns += (info.n_bytes or 0) * _READ_NS_PER_BYTE
+    sampled = resize * resize if resize is not None else pixels
+    return ns * 1e-9 + estimate_cost(mode, sampled, palette_size)
+
+
+def largest_first(
+    images: Sequence[ImageInput], mode: ExtractionMethod, palette_size: int, resize: int | None
+) -> list[int]:
+    """Positions of ``images`` from the most to the least expensive.
+
+    Images whose cost cannot be predicted (URLs, unreadable headers) come
+    first: they may be large, and starting them early bounds the damage.
+    Equal costs keep their input order.
+    """
+    with ThreadPoolExecutor(max_workers=min(_PROBE_WORKERS, max(1, len(images)))) as pool:
+        infos = list(pool.map(probe, images))
+    costs = [math.inf if info is None else estimate_image_cost(info, mode, palette_size, resize) for info in infos]
+    return sorted(range(len(images)), key=lambda i: -costs[i])
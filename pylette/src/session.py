@@ -0,0 +1,214 @@
+"""
+Long-lived extraction sessions.
+
+:func:`~pylette.batch_extract_colors` starts and shuts down a worker pool on
+every call, and :func:`~pylette.extract_colors` validates its arguments on
+every call. A service extracting many small batches pays that setup again and
+again. An :class:`ExtractionSession` validates an :class:`ExtractionConfig`
+once and keeps one worker pool for its lifetime, so repeated calls pay only
+for the extraction itself.
+"""
+
+import threading
+from concurrent.futures import Executor, Future
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, Literal
+
+from pylette.src.color_extraction import extract_colors, iter_extract_colors
+from pylette.src.exceptions import UnknownExtractionMethodError
+from pylette.src.palette import Palette
+from pylette.src.types import (
+    UNSET,
+    Backend,
+    BatchResult,
+    ExtractionMethod,
+    ImageInput,
+    Preset,
+    Unset,
+    coerce_to_enum,
+)
+
+
+@dataclass(frozen=True)
+class ExtractionConfig:
+    """Validated, immutable extraction settings.
+
+    The fields are those of :func:`~pylette.extract_colors`. Strings given for
+    ``mode`` and ``preset`` are converted to their enums, and every value is
+    checked once, on construction. Configs are hashable, so they can key
+    caches, and :func:`dataclasses.replace` derives a validated variant.
+
+    Raises:
+        UnknownExtractionMethodError: If ``mode`` is not a known extraction method.
+        ValueError: If any other field is out of range or unknown.
+
+    Examples:
+        >>> config = ExtractionConfig(palette_size=8, mode="OKLab", sort_mode="luminance")
+        >>> dataclasses.replace(config, palette_size=4)
+    """
+
+    palette_size: int = 5
+    resize: int | None | Unset = UNSET
+    mode: ExtractionMethod | str | None = None
+    sort_mode: Literal["luminance", "frequency"] | None = None
+    alpha_mask_threshold: int | None = None
+    time_budget: float | None = None
+    preset: Preset | str | None = None
+    max_pixels: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.palette_size < 1:
+            raise ValueError(f"palette_size must be a positive int, got {self.palette_size!r}.")
+        if isinstance(self.resize, bool) or (isinstance(self.resize, int) and self.resize < 1):
+            raise ValueError(f"resize must be a positive int or None, got {self.resize!r}.")
+        if self.sort_mode not in (None, "luminance", "frequency"):
+            raise ValueError(f"sort_mode must be 'luminance', 'frequency' or None, got {self.sort_mode!r}.")
+        if self.alpha_mask_threshold is not None and not 0 <= self.alpha_mask_threshold <= 255:
+            raise ValueError(f"alpha_mask_threshold must be between 0 and 255, got {self.alpha_mask_threshold!r}.")
+        if self.time_budget is not None and self.time_budget <= 0:
+            raise ValueError(f"time_budget must be positive, got {self.time_budget!r}.")
+        if self.max_pixels is not None and self.max_pixels < 1:
+            raise ValueError(f"max_pixels must be a positive int or None, got {self.max_pixels!r}.")
+        # Frozen: normalize through object.__setattr__.
+        if self.mode is not None:
+            object.__setattr__(
+                self, "mode", coerce_to_enum(self.mode, ExtractionMethod, error_cls=UnknownExtractionMethodError)
+            )
+        if self.preset is not None:
+            object.__setattr__(self, "preset", coerce_to_enum(self.preset, Preset))
+
+    def as_kwargs(self) -> dict[str, Any]:
+        """The settings as keyword arguments for :func:`~pylette.extract_colors`."""
+        return asdict(self)
+
+
+class ExtractionSession:
+    """Extracts palettes with one configuration and a long-lived worker pool.
+
+    The pool is created with the session and shut down by :meth:`close` (or on
+    leaving a ``with`` block); every :meth:`submit` and :meth:`map` call in
+    between reuses its warm workers. A session may be shared between threads.
+
+    Parameters:
+        config: The extraction settings; defaults to those of :func:`~pylette.extract_colors`.
+        backend: The worker pool: ``"threads"``, ``"processes"`` (see
+            :func:`~pylette.batch_extract_colors`), or an existing
+            :class:`~concurrent.futures.Executor`, which the session uses but
+            does not shut down.
+        max_workers: Number of workers of the pool the session creates;
+            ``None`` uses the standard library's default. Size an executor
+            passed as ``backend`` when creating it instead.
+        native_threads: OpenMP/BLAS threads per extraction; defaults to the CPU
+            count divided by the number of workers, or to 1 with an executor
+            passed as ``backend``, whose size the session does not know.
+
+    Raises:
+        ValueError: If ``backend`` is unknown, ``max_workers`` or
+            ``native_threads`` is not positive, or ``max_workers`` is given
+            with an executor as ``backend``.
+
+    Examples:
+        >>> with ExtractionSession(ExtractionConfig(palette_size=8), max_workers=4) as session:
+        ...     palette = session.extract("photo.jpg")
+        ...     future = session.submit("other.jpg")
+        ...     for result in session.map(paths):
+        ...         print(result.index, result.palette)
+    """
+
+    def __init__(
+        self,
+        config: ExtractionConfig | None = None,
+        backend: Backend | str | Executor = Backend.THREADS,
+        max_workers: int | None = None,
+        native_threads: int | None = None,
+    ):
+        from pylette.src.executors import create_executor, default_workers, limit_native_threads, native_threads_for
+
+        for name, value in [("max_workers", max_workers), ("native_threads", native_threads)]:
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be a positive int or None, got {value!r}.")
+        self.config = config if config is not None else ExtractionConfig()
+        self._owned = not isinstance(backend, Executor)
+        if isinstance(backend, Executor):
+            if max_workers is not None:
+                raise ValueError("max_workers sizes the pool the session creates; size the executor passed as backend.")
+            self.native_threads = native_threads or 1
+            self._executor: Executor = backend
+        else:
+            kind = coerce_to_enum(backend, Backend)
+            workers = max_workers or default_workers(kind)
+            self.native_threads = native_threads or native_threads_for(workers)
+            self._executor = create_executor(kind, workers, self.native_threads)
+        self._extract: Callable[[ImageInput], Palette] = partial(extract_colors, **self.config.as_kwargs())
+        self._task = limit_native_threads(self._extract, self.native_threads)
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def extract(self, image: ImageInput) -> Palette:
+        """Extract a palette from ``image`` in the calling thread.
+
+        Raises:
+            InvalidImageError: If the image cannot be loaded.
+            NoValidPixelsError: If no pixels remain after alpha masking.
+        """
+        return self._extract(image)
+
+    def submit(self, image: ImageInput) -> "Future[Palette]":
+        """Schedule the extraction of ``image`` on the pool.
+
+        Process workers receive ``image`` by pickling; :meth:`map` hands
+        in-memory images to them through shared memory instead.
+
+        Raises:
+            RuntimeError: If the session is closed.
+        """
+        self._check_open()
+        return self._executor.submit(self._task, image)
+
+    def map(
+        self,
+        images: Iterable[ImageInput],
+        ordered: bool = True,
+        max_in_flight: int | None = None,
+        cancel: threading.Event | None = None,
+        progress_callback: Callable[[int, BatchResult], None] | None = None,
+    ) -> Iterator[BatchResult]:
+        """Extract palettes from ``images`` on the pool, yielding one result per input.
+
+        Works like :func:`~pylette.iter_extract_colors` on the session's pool,
+        but yields in input order unless ``ordered`` is ``False``.
+
+        Raises:
+            RuntimeError: If the session is closed.
+        """
+        self._check_open()
+        return iter_extract_colors(
+            images,
+            **self.config.as_kwargs(),
+            backend=self._executor,
+            native_threads=self.native_threads,
+            max_in_flight=max_in_flight,
+            cancel=cancel,
+            progress_callback=progress_callback,
+            ordered=ordered,
+        )
+
+    def close(self, wait: bool = True) -> None:
+        """Shut the pool down (unless it was passed in); further submissions raise ``RuntimeError``."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._owned:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("The extraction session is closed.")
+
+    def __enter__(self) -> "ExtractionSession":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -5,17 +5,19 @@ This module contains all the type aliases and protocols used throughout the Pyle
 to ensure type safety and consistency.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Protocol, TypeAlias, TypedDict, TypeVar
+from typing import TYPE_CHECKING, Any, Final, Protocol, TypeAlias, TypedDict, TypeVar
 
 import numpy as np
-from cv2.typing import MatLike
 from numpy.typing import NDArray
 from PIL import Image
+from typing_extensions import NotRequired
 
 if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
     from pylette.src.palette import Palette
 
 
@@ -36,7 +38,12 @@ PathLikeImage: TypeAlias = str | Path
 URLImage: TypeAlias = str  # URLs are strings but semantically different
 BytesImage: TypeAlias = bytes
 ArrayImage: TypeAlias = NDArray[np.uint8]  # Properly typed array
-CV2Image: TypeAlias = MatLike
+if TYPE_CHECKING:
+    CV2Image: TypeAlias = MatLike
+else:
+    # OpenCV images are numpy arrays. cv2 is not imported at runtime: it has no
+    # free-threaded wheels and would re-enable the GIL on import.
+    CV2Image: TypeAlias = NDArray[Any]
 PILImage: TypeAlias = Image.Image
 
 # Main union type - more restrictive and logical
@@ -66,6 +73,37 @@ class ColorSpace(str, Enum):
     OKLAB = "oklab"
 
 
+class Backend(str, Enum):
+    THREADS = "threads"
+    PROCESSES = "processes"
+
+
+class Schedule(str, Enum):
+    INPUT = "input"
+    LARGEST_FIRST = "largest_first"
+
+
+class Preset(str, Enum):
+    FAST = "fast"
+    BALANCED = "balanced"
+    QUALITY = "quality"
+    AUTO = "auto"
+
+
+class Unset(Enum):
+    """Type of :data:`UNSET`, the default of arguments a preset may choose."""
+
+    UNSET = "unset"
+
+    def __repr__(self) -> str:
+        return "UNSET"
+
+
+# Default of ``resize`` in the extraction APIs: 256 unless a preset chooses,
+# as ``None`` already means "no resize".
+UNSET: Final = Unset.UNSET
+
+
 class HarmonyKind(str, Enum):
     COMPLEMENTARY = "complementary"
     TRIADIC = "triadic"
@@ -113,6 +151,7 @@ def coerce_to_enum(
 class SourceType(str, Enum):
     FILE_PATH = "file_path"
     URL = "url"
+    ARCHIVE_MEMBER = "archive_member"
     BYTES = "bytes"
     PIL_IMAGE = "pil_image"
     NUMPY_ARRAY = "numpy_array"
@@ -126,6 +165,7 @@ class ExtractionParams(TypedDict):
     sort_mode: str | None
     resize: int | None
     alpha_mask_threshold: int | None
+    preset: NotRequired[Preset]
 
 
 class ImageInfo(TypedDict):
@@ -143,12 +183,23 @@ class ProcessingStats(TypedDict):
     timestamp: str
 
 
+class RefinementInfo(TypedDict):
+    """How far progressive (anytime) extraction got; see :func:`~pylette.extract_colors_progressive`."""
+
+    levels_completed: int
+    levels_total: int
+    sample_size: int | None
+    time_budget: float | None
+
+
 class PaletteMetaData(TypedDict):
     image_source: str
     source_type: SourceType
     extraction_params: ExtractionParams
     image_info: ImageInfo
     processing_stats: ProcessingStats
+    refinement: NotRequired[RefinementInfo]
+    cached: NotRequired[bool]  # set when extracting with a cache: whether the palette came from it
 
 
 # Batch extraction types
@@ -157,6 +208,7 @@ class BatchResult:
     source: ImageInput
     result: "Palette | None" = None
     exception: Exception | None = None
+    index: int | None = None  # position of ``source`` in the input sequence
 
     @property
     def success(self) -> bool:
@@ -169,3 +221,127 @@ class BatchResult:
     @property
     def error(self) -> "Exception | None":
         return self.exception
+
+
+@dataclass
+class InspectResult:
+    """The header of one image, read by :func:`~pylette.inspect_images`."""
+
+    source: ImageInput
+    info: ImageInfo | None = None
+    """Size, format, mode and alpha flag; ``processed_size`` is the original size."""
+    n_bytes: int | None = None
+    """Encoded size, for files, bytes and loaded URIs."""
+    exception: Exception | None = None
+    index: int | None = None  # position of ``source`` in the input sequence
+
+    @property
+    def success(self) -> bool:
+        return self.info is not None
+
+
+@dataclass
+class PaletteArrays:
+    """Compact, array-backed palettes for a stack of images.
+
+    Returned by :func:`~pylette.extract_colors_stacked` with ``as_arrays=True``.
+    Row ``i`` holds the palette of image ``i``, already in ``sort_mode`` order;
+    slots an image could not fill (fewer distinct colors than ``palette_size``)
+    come last and have frequency ``0``.
+    """
+
+    colors: NDArray[np.uint8]
+    """``(N, palette_size, 4)`` RGBA colors."""
+    frequencies: NDArray[np.float64]
+    """``(N, palette_size)`` color frequencies; each row sums to ``1.0``."""
+
+    def __len__(self) -> int:
+        return len(self.colors)
+
+    def to_palettes(self) -> "list[Palette]":
+        """Convert to one :class:`~pylette.Palette` (without metadata) per image, dropping unused slots."""
+        from pylette.src.color import Color
+        from pylette.src.palette import Palette
+
+        return [
+            Palette([Color(tuple(int(v) for v in rgba), float(f)) for rgba, f in zip(colors, freqs) if f > 0])
+            for colors, freqs in zip(self.colors, self.frequencies)
+        ]
+
+
+@dataclass
+class BatchStats:
+    """Batch-level metrics of a :func:`~pylette.batch_extract_colors` run, updated while it runs."""
+
+    images: int = 0
+    """Number of images finished (successfully or not)."""
+    elapsed_seconds: float = 0.0
+    """Wall time of the run so far."""
+    workers: int = 0
+    """Concurrency at the end of the run: the tuned limit with ``max_workers="auto"``."""
+    concurrency_history: list[int] = field(default_factory=list)
+    """With ``max_workers="auto"``, the concurrency limit of every tuning epoch."""
+    duplicates: int = 0
+    """With ``dedupe=True``, the number of inputs answered by another input's extraction."""
+    cache_hits: int = 0
+    """With a ``cache``, the number of images answered from it."""
+
+    @property
+    def throughput(self) -> float:
+        """Images finished per second."""
+        return self.images / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters of a :class:`~pylette.MemoryPaletteCache`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    """Palettes dropped to stay within ``max_palettes``."""
+    palettes: int
+    """Palettes currently held."""
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class StageStats:
+    """Live counters for one stage of :func:`~pylette.pipeline_extract_colors`."""
+
+    workers: int = 0
+    """Number of worker threads running the stage."""
+    capacity: int = 0
+    """Size of the bounded queue feeding the stage."""
+    processed: int = 0
+    """Number of items the stage has finished."""
+    busy_seconds: float = 0.0
+    """Total time the stage's workers spent working, summed over workers."""
+    max_depth: int = 0
+    """Deepest the input queue has been."""
+    depth_total: int = 0
+    """Sum of the input queue depth sampled at every enqueue."""
+    depth_samples: int = 0
+    """Number of depth samples in ``depth_total``."""
+
+    @property
+    def mean_depth(self) -> float:
+        """Average depth of the stage's input queue; near ``capacity`` means the stage is the bottleneck."""
+        return self.depth_total / self.depth_samples if self.depth_samples else 0.0
+
+
+@dataclass
+class PipelineStats:
+    """Per-stage metrics of a :func:`~pylette.pipeline_extract_colors` run, updated while it runs."""
+
+    read: StageStats = field(default_factory=StageStats)
+    """Reading file and URL bytes."""
+    decode: StageStats = field(default_factory=StageStats)
+    """Decoding bytes into images."""
+    extract: StageStats = field(default_factory=StageStats)
+    """Extracting palettes."""
@@ -5,10 +5,14 @@ This module allows users to import types in multiple ways:
 """
 
 from pylette.src.types import (
+    UNSET,
     ArrayImage,
     ArrayLike,
+    Backend,
     BatchResult,
+    BatchStats,
     BytesImage,
+    CacheStats,
     ColorArray,
     ColorSpace,
     ColorTuple,
@@ -19,14 +23,22 @@ from pylette.src.types import (
     ImageInfo,
     ImageInput,
     ImageLike,
+    InspectResult,
     IntArray,
+    PaletteArrays,
     PaletteMetaData,
     PathLikeImage,
     PILImage,
+    PipelineStats,
+    Preset,
     ProcessingStats,
+    RefinementInfo,
     RGBATuple,
     RGBTuple,
+    Schedule,
     SourceType,
+    StageStats,
+    Unset,
     URLImage,
 )
 
@@ -51,8 +63,20 @@ __all__ = [
     "ColorSpace",
     "SourceType",
     "ExtractionParams",
+    "Preset",
+    "Backend",
+    "Schedule",
+    "Unset",
+    "UNSET",
     "ImageInfo",
     "ProcessingStats",
+    "RefinementInfo",
     "PaletteMetaData",
     "BatchResult",
+    "BatchStats",
+    "CacheStats",
+    "InspectResult",
+    "PaletteArrays",
+    "PipelineStats",
+    "StageStats",
 ]
@@ -0,0 +1,135 @@
+"""Tests for reading images out of zip and tar archives."""
+
+import json
+import tarfile
+import warnings
+import zipfile
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from typer.testing import CliRunner
+
+import pylette.src.archives as archives
+from pylette import InvalidImageError, archive_members, batch_extract_colors, extract_colors
+from pylette.cmd import pylette_app
+from pylette.src.archives import ArchiveLoader
+from pylette.types import SourceType
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+COLORS = {"red.png": (255, 0, 0), "sub/green.png": (0, 255, 0), "sub/blue.jpg": (0, 0, 255)}
+
+
+def _encoded(color: tuple[int, int, int], name: str) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (16, 16), color).save(buffer, "JPEG" if name.endswith(".jpg") else "PNG")
+    return buffer.getvalue()
+
+
+def _write_archive(path: Path) -> Path:
+    members = {name: _encoded(color, name) for name, color in COLORS.items()}
+    members["README.txt"] = b"not an image"
+    members["sub/._red.png"] = b"macOS metadata"
+    if path.suffix == ".zip":
+        with zipfile.ZipFile(path, "w") as zf:
+            for name, data in members.items():
+                zf.writestr(name, data)
+    else:
+        with tarfile.open(path, "w:gz" if path.suffix == ".gz" else "w") as tf:
+            for name, data in members.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tf.addfile(info, BytesIO(data))
+    return path
+
+
+@pytest.fixture(params=["images.zip", "images.tar", "images.tar.gz"])
+def archive(request: pytest.FixtureRequest, tmp_path: Path) -> Path:
+    return _write_archive(tmp_path / request.param)
+
+
+def _dominant(palette) -> tuple[int, ...]:  # type: ignore[no-untyped-def]
+    return max(palette.colors, key=lambda c: c.frequency).rgb
+
+
+def test_archive_members(archive: Path) -> None:
+    assert archive_members(archive) == [f"{archive}::{name}" for name in COLORS]
+
+
+def test_extract_a_member(archive: Path) -> None:
+    palette = extract_colors(f"{archive}::sub/green.png", palette_size=2)
+    assert _dominant(palette) == (0, 255, 0)
+    assert palette.metadata["image_source"] == f"{archive}::sub/green.png"
+    assert palette.metadata["source_type"] == SourceType.ARCHIVE_MEMBER
+
+
+def test_batch_over_an_archive(archive: Path) -> None:
+    results = batch_extract_colors(archive_members(archive), palette_size=2, max_workers=3)
+    assert all(r.success for r in results)
+    for result, color in zip(results, COLORS.values()):
+        assert max(abs(a - b) for a, b in zip(_dominant(result.palette), color)) <= 2  # JPEG
+
+
+def test_members_out_of_order(tmp_path: Path) -> None:
+    loader = ArchiveLoader()
+    archive = _write_archive(tmp_path / "images.tar.gz")
+    names = list(COLORS)
+    for name in [names[2], names[0], names[1]]:
+        assert loader.load(f"{archive}::{name}") == _encoded(COLORS[name], name)
+    with pytest.warns(RuntimeWarning, match="out of archive order"):
+        assert loader.load(f"{archive}::{names[0]}") == _encoded(COLORS[names[0]], names[0])
+    loader.close()
+
+
+def test_compressed_lookahead_is_bounded(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(archives, "_LOOKAHEAD_BYTES", 1)
+    archive = _write_archive(tmp_path / "images.tar.gz")
+    names = list(COLORS)
+    loader = ArchiveLoader()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        for name in names:  # in archive order: one pass, nothing kept
+            assert loader.load(f"{archive}::{name}") == _encoded(COLORS[name], name)
+        with pytest.raises(InvalidImageError):
+            loader.load(f"{archive}::missing.png")
+    with pytest.warns(RuntimeWarning):
+        assert loader.load(f"{archive}::{names[0]}") == _encoded(COLORS[names[0]], names[0])
+    loader.close()
+
+
+def test_changed_archive_is_reopened(tmp_path: Path) -> None:
+    loader = ArchiveLoader(max_open=1)
+    archive = tmp_path / "images.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a.png", b"old")
+    other = _write_archive(tmp_path / "other.zip")
+    assert loader.load(f"{archive}::a.png") == b"old"
+    assert loader.load(f"{other}::red.png")  # evicts the first archive
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a.png", b"new content")
+    assert loader.load(f"{archive}::a.png") == b"new content"
+
+
+@pytest.mark.parametrize("member", ["missing.png", "README.txt"])
+def test_bad_members_are_invalid(archive: Path, member: str) -> None:
+    with pytest.raises(InvalidImageError):
+        extract_colors(f"{archive}::{member}")
+
+
+def test_missing_archive_is_invalid(tmp_path: Path) -> None:
+    with pytest.raises(InvalidImageError):
+        extract_colors(f"{tmp_path / 'missing.zip'}::a.png")
+    with pytest.raises(InvalidImageError):
+        archive_members(tmp_path / "missing.tar")
+
+
+def test_cli_expands_archives(archive: Path, test_image_path_as_str: str, tmp_path: Path) -> None:
+    output = tmp_path / "palettes.json"
+    result = CliRunner().invoke(
+        pylette_app, [str(archive), test_image_path_as_str, "--export-json", "--output", str(output)]
+    )
+    assert result.exit_code == 0, result.output
+    palettes = json.loads(output.read_text())["palettes"]
+    assert [p["metadata"]["image_source"] for p in palettes] == [*archive_members(archive), test_image_path_as_str]
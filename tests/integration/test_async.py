@@ -0,0 +1,168 @@
+"""Tests for the asyncio API, against a local HTTP server."""
+
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import numpy as np
+import pytest
+
+from pylette import (
+    HostLimiter,
+    InvalidImageError,
+    batch_extract_colors_async,
+    extract_colors,
+    extract_colors_async,
+    iter_extract_colors_async,
+)
+from pylette.types import SourceType
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+
+class _Server:
+    """Serves one PNG under ``/image*.png`` and records the peak concurrency per Host header."""
+
+    def __init__(self, body: bytes, delay: float = 0.05):
+        self.body = body
+        self.delay = delay
+        self.active: dict[str, int] = defaultdict(int)
+        self.peak: dict[str, int] = defaultdict(int)
+        self.lock = threading.Lock()
+
+
+@pytest.fixture
+def server(test_image_as_bytes: bytes) -> Iterator[tuple[_Server, int]]:
+    state = _Server(test_image_as_bytes)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            host = self.headers["Host"].split(":")[0]
+            with state.lock:
+                state.active[host] += 1
+                state.peak[host] = max(state.peak[host], state.active[host])
+            try:
+                time.sleep(state.delay)
+                if self.path.startswith("/image"):
+                    self.send_response(200)
+                    self.send_header("Content-Type", "image/png")
+                    body = state.body
+                else:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html")
+                    body = b"<html></html>"
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            finally:
+                with state.lock:
+                    state.active[host] -= 1
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield state, httpd.server_address[1]
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_extract_url_matches_sync(server: tuple[_Server, int], test_image_path_as_str: str) -> None:
+    _, port = server
+    url = f"http://127.0.0.1:{port}/image.png"
+    palette = asyncio.run(extract_colors_async(url, palette_size=4))
+    expected = extract_colors(test_image_path_as_str, palette_size=4)
+
+    assert [c.rgb for c in palette.colors] == [c.rgb for c in expected.colors]
+    assert palette.image_source == url
+    assert palette.source_type == SourceType.URL
+
+
+def test_extract_local_inputs_use_given_executor(test_image_path_as_str: str) -> None:
+    arr = np.random.default_rng(0).integers(0, 256, (16, 16, 3), dtype=np.uint8)
+    with ThreadPoolExecutor(1, thread_name_prefix="custom") as pool:
+        palette = asyncio.run(extract_colors_async(arr, palette_size=3, executor=pool))
+        from_path = asyncio.run(extract_colors_async(test_image_path_as_str, executor=pool))
+    assert len(palette) == 3
+    assert from_path.image_source == test_image_path_as_str
+
+
+def test_non_image_url_raises(server: tuple[_Server, int]) -> None:
+    _, port = server
+    with pytest.raises(InvalidImageError):
+        asyncio.run(extract_colors_async(f"http://127.0.0.1:{port}/page.html"))
+
+
+def test_batch_limits_concurrency_per_host(server: tuple[_Server, int]) -> None:
+    state, port = server
+    urls = [f"http://{host}:{port}/image{i}.png" for i in range(6) for host in ("127.0.0.1", "localhost")]
+    results = asyncio.run(batch_extract_colors_async(urls, palette_size=3, per_host_limit=2))
+
+    assert [r.source for r in results] == urls
+    assert [r.index for r in results] == list(range(len(urls)))
+    assert all(r.success for r in results)
+    assert state.peak.keys() == {"127.0.0.1", "localhost"}
+    assert max(state.peak.values()) <= 2
+    # Both hosts were downloaded from at the same time.
+    assert all(peak == 2 for peak in state.peak.values())
+
+
+def test_batch_records_failures(server: tuple[_Server, int]) -> None:
+    _, port = server
+    images = [f"http://127.0.0.1:{port}/image.png", f"http://127.0.0.1:{port}/page.html"]
+    ok, failed = asyncio.run(batch_extract_colors_async(images))
+    assert ok.success
+    assert not failed.success
+    assert isinstance(failed.exception, InvalidImageError)
+
+
+def test_iter_yields_results_as_they_finish(server: tuple[_Server, int]) -> None:
+    state, port = server
+    state.delay = 0.3
+    arr = np.zeros((8, 8, 3), dtype=np.uint8)
+
+    async def collect() -> list[int | None]:
+        return [r.index async for r in iter_extract_colors_async([f"http://127.0.0.1:{port}/image.png", arr])]
+
+    assert asyncio.run(collect()) == [1, 0]
+
+
+def test_breaking_out_cancels_outstanding_work(server: tuple[_Server, int]) -> None:
+    state, port = server
+    state.delay = 0.2
+    urls = [f"http://127.0.0.1:{port}/image{i}.png" for i in range(20)]
+
+    async def first() -> int:
+        iterator = iter_extract_colors_async(urls, max_in_flight=4, per_host_limit=4)
+        async for _ in iterator:
+            break
+        await iterator.aclose()  # type: ignore[attr-defined]
+        return len(asyncio.all_tasks())
+
+    assert asyncio.run(first()) == 1
+
+
+def test_host_limiter_keys_on_host() -> None:
+    limiter = HostLimiter(per_host=3)
+    assert limiter("https://Example.com/a.png") is limiter("https://example.com/b.png")
+    assert limiter("https://example.com/a.png") is not limiter("https://example.org/a.png")
+    with pytest.raises(ValueError):
+        HostLimiter(per_host=0)
+
+
+@pytest.mark.parametrize("max_in_flight", [0, -1])
+def test_rejects_bad_max_in_flight(max_in_flight: int) -> None:
+    async def run() -> None:
+        async for _ in iter_extract_colors_async([], max_in_flight=max_in_flight):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
@@ -0,0 +1,116 @@
+"""Tests for ``max_workers="auto"``: the concurrency tuner and batch-level stats."""
+
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pytest
+from PIL import Image
+from typer.testing import CliRunner
+
+from pylette import batch_extract_colors, iter_extract_colors
+from pylette.cmd import pylette_app
+from pylette.src.autotune import ConcurrencyTuner
+from pylette.types import BatchStats
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+
+def _simulate(tuner: ConcurrencyTuner, rate: Callable[[int], float], completions: int = 5000) -> list[int]:
+    """Drive ``tuner`` with a synthetic clock where ``rate(limit)`` tasks finish per second."""
+    now = 0.0
+    tuner.start(now)
+    for _ in range(completions):
+        now += 1.0 / rate(tuner.limit)
+        tuner.record(now=now)
+    return tuner.history
+
+
+def test_tuner_climbs_while_throughput_rises() -> None:
+    # I/O-bound: throughput grows with concurrency up to 40 tasks in flight.
+    history = _simulate(ConcurrencyTuner(initial=4, maximum=64), lambda n: min(n, 40))
+    assert max(history) >= 40
+    assert all(30 <= limit <= 64 for limit in history[-10:])
+
+
+def test_tuner_backs_off_when_oversubscribed() -> None:
+    # CPU-bound on 4 cores: more concurrency only adds contention.
+    history = _simulate(ConcurrencyTuner(initial=16, maximum=64), lambda n: 4 / (1 + 0.05 * max(n - 4, 0)))
+    assert all(limit <= 8 for limit in history[-10:])
+
+
+def test_tuner_stays_within_bounds() -> None:
+    tuner = ConcurrencyTuner(initial=100, maximum=8, minimum=2)
+    assert tuner.limit == 8
+    history = _simulate(tuner, lambda n: 1.0, completions=500)
+    assert all(2 <= limit <= 8 for limit in history)
+
+
+def test_tuner_rejects_invalid_bounds() -> None:
+    with pytest.raises(ValueError):
+        ConcurrencyTuner(initial=1, maximum=2, minimum=3)
+
+
+@pytest.fixture
+def paths(tmp_path: Path) -> list[str]:
+    rng = np.random.default_rng(0)
+    out = []
+    for i in range(12):
+        path = tmp_path / f"image{i}.png"
+        Image.fromarray(rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)).save(path)
+        out.append(str(path))
+    return out
+
+
+def test_batch_auto_reports_stats(paths: list[str]) -> None:
+    stats = BatchStats()
+    results = batch_extract_colors(paths, palette_size=3, max_workers="auto", stats=stats)
+
+    assert all(r.success for r in results)
+    assert stats.images == len(paths)
+    assert stats.elapsed_seconds > 0
+    assert stats.throughput > 0
+    assert stats.concurrency_history
+    assert stats.workers == stats.concurrency_history[-1] >= 1
+
+
+def test_first_epoch_starts_at_submission(paths: list[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    events: list[str] = []
+    start, record = ConcurrencyTuner.start, ConcurrencyTuner.record
+
+    def logged_start(self: ConcurrencyTuner, now: float | None = None) -> None:
+        events.append("start")
+        start(self, now)
+
+    def logged_record(self: ConcurrencyTuner, completed: int = 1, now: float | None = None) -> None:
+        events.append("record")
+        record(self, completed, now)
+
+    monkeypatch.setattr(ConcurrencyTuner, "start", logged_start)
+    monkeypatch.setattr(ConcurrencyTuner, "record", logged_record)
+    batch_extract_colors(paths, palette_size=3, max_workers="auto")
+    assert events == ["start"] + ["record"] * len(paths)
+
+
+def test_fixed_workers_report_stats(paths: list[str]) -> None:
+    stats = BatchStats()
+    list(iter_extract_colors(paths, palette_size=3, max_workers=2, stats=stats))
+    assert stats.images == len(paths)
+    assert stats.workers == 2
+    assert stats.concurrency_history == []
+
+
+def test_invalid_max_workers_string_raises(paths: list[str]) -> None:
+    with pytest.raises(ValueError, match="auto"):
+        batch_extract_colors(paths, max_workers="many")  # type: ignore[arg-type]
+
+
+def test_cli_max_workers_auto(paths: list[str]) -> None:
+    result = CliRunner().invoke(pylette_app, [*paths[:4], "--max-workers", "auto", "--no-stdout"])
+    assert result.exit_code == 0
+    assert "Auto-tuned concurrency" in result.output
+
+
+def test_cli_max_workers_rejects_garbage(paths: list[str]) -> None:
+    result = CliRunner().invoke(pylette_app, [paths[0], "--max-workers", "0"])
+    assert result.exit_code == 2
@@ -0,0 +1,143 @@
+"""Tests for the executor backends of ``batch_extract_colors``."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from pylette import Backend, InvalidImageError, batch_extract_colors
+from pylette.types import BatchResult
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+AVAILABLE = [Backend.THREADS, Backend.PROCESSES]
+
+
+@pytest.fixture
+def images(test_image_path_as_str: str, test_image_as_bytes: bytes, tmp_path) -> list:  # type: ignore[no-untyped-def]
+    rng = np.random.default_rng(0)
+    noise = tmp_path / "noise.png"
+    Image.fromarray(rng.integers(0, 256, (40, 30, 3), dtype=np.uint8)).save(noise)
+    return [test_image_path_as_str, test_image_as_bytes, noise]
+
+
+def _colors(results: list[BatchResult]) -> list[list[tuple[int, ...]]]:
+    return [[c.rgb for c in r.palette.colors] if r.palette else [] for r in results]
+
+
+@pytest.mark.parametrize("backend", AVAILABLE)
+def test_backends_agree_with_threads(images: list, backend: Backend) -> None:
+    expected = batch_extract_colors(images, palette_size=4)
+    results = batch_extract_colors(images, palette_size=4, backend=backend, max_workers=2)
+    assert all(r.success for r in results)
+    assert _colors(results) == _colors(expected)
+    assert [r.palette.metadata["image_source"] for r in results if r.palette] == [
+        r.palette.metadata["image_source"] for r in expected if r.palette
+    ]
+
+
+@pytest.mark.parametrize("backend", AVAILABLE)
+def test_backend_exceptions_and_progress(test_image_path_as_str: str, backend: Backend) -> None:
+    calls: list[tuple[int, BatchResult]] = []
+    images = [test_image_path_as_str, "/does/not/exist.png"]
+    results = batch_extract_colors(
+        images, backend=backend, max_workers=2, progress_callback=lambda n, r: calls.append((n, r))
+    )
+
+    assert results[0].success
+    assert not results[1].success
+    assert isinstance(results[1].exception, InvalidImageError)
+    assert sorted(n for n, _ in calls) == [1, 2]
+    assert {id(r) for _, r in calls} == {id(r) for r in results}
+
+
+def test_backend_accepts_strings(test_image_path_as_str: str) -> None:
+    [result] = batch_extract_colors([test_image_path_as_str], backend="threads")
+    assert result.success
+
+
+def test_existing_executor_is_used_and_left_running(test_image_path_as_str: str) -> None:
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        [result] = batch_extract_colors([test_image_path_as_str], backend=executor)
+        assert result.success
+        assert executor.submit(sum, [1, 2]).result() == 3
+
+
+def test_unknown_backend_raises(test_image_path_as_str: str) -> None:
+    with pytest.raises(ValueError):
+        batch_extract_colors([test_image_path_as_str], backend="gpu")
+
+
+@pytest.fixture
+def frames() -> list:
+    rng = np.random.default_rng(1)
+    arr = rng.integers(0, 256, (64, 48, 3), dtype=np.uint8)
+    rgba = Image.fromarray(rng.integers(0, 256, (30, 40, 4), dtype=np.uint8), "RGBA")
+    indexed = Image.fromarray(arr).convert("P", palette=Image.Palette.ADAPTIVE, colors=8)
+    return [arr, arr, rgba, indexed, np.zeros((0, 0, 3), dtype=np.uint8)]
+
+
+def test_in_memory_inputs_through_shared_memory(frames: list) -> None:
+    expected = batch_extract_colors(frames, palette_size=4)
+    results = batch_extract_colors(frames, palette_size=4, backend=Backend.PROCESSES, max_workers=2)
+
+    assert [r.success for r in results] == [r.success for r in expected] == [True] * 4 + [False]
+    assert _colors(results) == _colors(expected)
+    for result, reference in zip(results, expected):
+        assert result.source is reference.source
+        if result.palette and reference.palette:
+            assert [c.rgb_float for c in result.palette.colors] == [c.rgb_float for c in reference.palette.colors]
+            meta, ref_meta = result.palette.metadata, reference.palette.metadata
+            assert meta is not None and ref_meta is not None
+            for key in ("image_source", "source_type", "image_info"):
+                assert meta[key] == ref_meta[key]
+
+
+def test_shared_memory_blocks_are_released(frames: list, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    from pylette.src import executors
+
+    created, released = [], []
+    share, release = executors.share_image, executors.release_block
+    monkeypatch.setattr(executors, "share_image", lambda image: _record(share(image), created))
+    monkeypatch.setattr(executors, "release_block", lambda block: (released.append(block.name), release(block)))
+
+    batch_extract_colors(frames, backend=Backend.PROCESSES, max_workers=2)
+    assert len(created) == 4  # the empty array is pickled instead
+    assert sorted(released) == sorted(created)
+
+
+def _record(shared, names: list):  # type: ignore[no-untyped-def]
+    if shared is not None:
+        names.append(shared[0].name)
+    return shared
+
+
+def test_shared_descriptor_is_independent_of_image_size() -> None:
+    import pickle
+
+    from pylette.src.executors import release_block, share_image
+
+    sizes = []
+    for side in (16, 1024):
+        shared = share_image(np.zeros((side, side, 3), dtype=np.uint8))
+        assert shared is not None
+        block, descriptor = shared
+        sizes.append(len(pickle.dumps(descriptor)))
+        release_block(block)
+    assert sizes[1] - sizes[0] < 16
+    assert share_image("image.png") is None
+
+
+def test_compact_palette_round_trip(test_image_path_as_str: str) -> None:
+    import pickle
+
+    from pylette import extract_colors
+    from pylette.src.executors import CompactPalette
+
+    palette = extract_colors(test_image_path_as_str, palette_size=6, mode="OKLab")
+    restored = pickle.loads(pickle.dumps(CompactPalette.from_palette(palette))).to_palette()
+    assert [(c.rgb_float, c.opacity, c.frequency) for c in restored.colors] == [
+        (c.rgb_float, c.opacity, c.frequency) for c in palette.colors
+    ]
+    assert restored.metadata == palette.metadata
@@ -0,0 +1,223 @@
+"""Tests for the palette caches: persistent and content-addressed, and in-memory LRU."""
+
+import json
+import os
+import shutil
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+from typer.testing import CliRunner
+
+import pylette.src.color_extraction as color_extraction
+from pylette import ImageTooLargeError, MemoryPaletteCache, PaletteCache, batch_extract_colors, extract_colors
+from pylette.cmd import pylette_app
+from pylette.types import BatchStats, CacheStats, SourceType
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> PaletteCache:
+    return PaletteCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def images(tmp_path: Path) -> list[str]:
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"image_{i}.png"
+        Image.fromarray(rng.integers(0, 256, (20, 20, 3), dtype=np.uint8)).save(path)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def calls(monkeypatch) -> list[object]:  # type: ignore[no-untyped-def]
+    """Records every image that is actually prepared for extraction."""
+    seen: list[object] = []
+    prepare = color_extraction._prepare_image  # type: ignore[reportPrivateUsage]
+
+    def counting(image, *args):  # type: ignore[no-untyped-def]
+        seen.append(image)
+        return prepare(image, *args)
+
+    monkeypatch.setattr(color_extraction, "_prepare_image", counting)
+    return seen
+
+
+def _rgbs(palette) -> list[tuple[int, ...]]:  # type: ignore[no-untyped-def]
+    return [c.rgb for c in palette.colors]
+
+
+def test_second_extraction_is_a_hit(
+    cache: PaletteCache, images: list[str], tmp_path: Path, calls: list[object]
+) -> None:
+    first = extract_colors(images[0], palette_size=4, cache=cache)
+    second = extract_colors(images[0], palette_size=4, cache=cache)
+    assert len(calls) == 1
+    assert first.metadata is not None and first.metadata["cached"] is False
+    assert second.metadata is not None and second.metadata["cached"] is True
+    assert _rgbs(first) == _rgbs(second)
+
+    # Keyed by content: a copy under another name is a hit, described as itself.
+    copy = shutil.copy(images[0], tmp_path / "renamed.png")
+    renamed = extract_colors(copy, palette_size=4, cache=cache)
+    assert len(calls) == 1
+    assert renamed.metadata is not None and renamed.metadata["image_source"] == str(copy)
+    from_bytes = extract_colors(Path(images[0]).read_bytes(), palette_size=4, cache=cache)
+    assert from_bytes.metadata is not None and from_bytes.metadata["source_type"] == SourceType.BYTES
+
+
+def test_json_export_reports_cached(cache: PaletteCache, images: list[str]) -> None:
+    first = extract_colors(images[0], palette_size=4, cache=cache).to_json()
+    second = extract_colors(images[0], palette_size=4, cache=cache).to_json()
+    assert first is not None and first["metadata"]["cached"] is False  # type: ignore[index]
+    assert second is not None and second["metadata"]["cached"] is True  # type: ignore[index]
+    assert "cached" not in extract_colors(images[0], palette_size=4).to_json()["metadata"]  # type: ignore[index, operator]
+
+
+def test_parameters_and_content_are_part_of_the_key(
+    cache: PaletteCache, images: list[str], calls: list[object]
+) -> None:
+    extract_colors(images[0], palette_size=4, cache=cache)
+    extract_colors(images[0], palette_size=5, cache=cache)
+    extract_colors(images[0], palette_size=4, mode="MC", cache=cache)
+    extract_colors(images[0], palette_size=4, resize=None, cache=cache)
+    assert len(calls) == 4
+    shutil.copy(images[1], images[0])  # rewritten in place
+    assert extract_colors(images[0], palette_size=4, cache=cache).metadata["cached"] is False  # type: ignore[index]
+
+
+def test_batch_uses_the_cache(cache: PaletteCache, images: list[str], calls: list[object]) -> None:
+    first = batch_extract_colors(images, palette_size=3, cache=cache)
+    stats = BatchStats()
+    second = batch_extract_colors([*images, images[0]], palette_size=3, cache=cache, stats=stats)
+    assert len(calls) == len(images)
+    assert stats.cache_hits == len(images) + 1
+    assert [_rgbs(r.palette) for r in second[:-1]] == [_rgbs(r.palette) for r in first]
+
+
+def test_processes_share_the_cache(cache: PaletteCache, images: list[str]) -> None:
+    batch_extract_colors(images, palette_size=3, cache=cache, backend="processes", max_workers=2)
+    assert len(cache) == len(images)
+    results = batch_extract_colors(images, palette_size=3, cache=cache, backend="processes", max_workers=2)
+    assert all(r.palette is not None and r.palette.metadata["cached"] for r in results)  # type: ignore[index]
+
+
+def test_least_recently_used_are_evicted(tmp_path: Path, images: list[str]) -> None:
+    cache = PaletteCache(tmp_path / "small")
+    extract_colors(images[3], palette_size=3, cache=cache)
+    entry_size = cache.size_bytes
+    cache.clear()
+    cache.max_bytes = int(entry_size * 2.5)
+    for image in images[:3]:
+        extract_colors(image, palette_size=3, cache=cache)
+    assert len(cache) == 2
+    assert cache.size_bytes <= cache.max_bytes
+    # The first image was evicted; the third, most recent, is still there.
+    assert extract_colors(images[2], palette_size=3, cache=cache).metadata["cached"] is True  # type: ignore[index]
+    assert extract_colors(images[0], palette_size=3, cache=cache).metadata["cached"] is False  # type: ignore[index]
+
+
+def test_max_pixels_applies_to_hits(cache: PaletteCache, images: list[str]) -> None:
+    extract_colors(images[0], cache=cache)
+    with pytest.raises(ImageTooLargeError):
+        extract_colors(images[0], cache=cache, max_pixels=100)
+
+
+def test_unreadable_entries_are_misses(cache: PaletteCache, images: list[str]) -> None:
+    extract_colors(images[0], cache=cache)
+    with closing(sqlite3.connect(cache.path)) as connection, connection:
+        connection.execute("UPDATE palettes SET palette = ?", (b"garbage",))
+    assert extract_colors(images[0], cache=cache).metadata["cached"] is False  # type: ignore[index]
+    assert extract_colors(images[0], cache=cache).metadata["cached"] is True  # type: ignore[index]
+
+
+def test_entries_are_json_and_round_trip(cache: PaletteCache, images: list[str]) -> None:
+    first = extract_colors(images[0], palette_size=4, mode="OKLab", cache=cache)
+    second = extract_colors(images[0], palette_size=4, mode="OKLab", cache=cache)
+    assert [(c.rgb_float, c.opacity, c.frequency) for c in first.colors] == [
+        (c.rgb_float, c.opacity, c.frequency) for c in second.colors
+    ]
+    assert second.metadata == {**first.metadata, "cached": True}  # type: ignore[dict-item]
+    with closing(sqlite3.connect(cache.path)) as connection:
+        (stored,) = connection.execute("SELECT palette FROM palettes").fetchone()
+    assert json.loads(stored)["metadata"]["extraction_params"]["mode"] == "OKLab"
+
+
+def test_invalid_max_bytes(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        PaletteCache(tmp_path, max_bytes=0)
+
+
+def test_cli_cache_dir(images: list[str], tmp_path: Path) -> None:
+    runner = CliRunner()
+    args = [*images, "--cache-dir", str(tmp_path / "cli-cache")]
+    assert runner.invoke(pylette_app, args).exit_code == 0
+    result = runner.invoke(pylette_app, args)
+    assert result.exit_code == 0
+    assert f"{len(images)}/{len(images)} images answered" in result.output
+
+
+def test_memory_cache_hits_and_stats(images: list[str], calls: list[object]) -> None:
+    cache = MemoryPaletteCache()
+    first = extract_colors(images[0], palette_size=4, cache=cache)
+    second = extract_colors(Path(images[0]), palette_size=4, cache=cache)
+    assert len(calls) == 1
+    assert second.metadata is not None and second.metadata["cached"] is True
+    assert _rgbs(first) == _rgbs(second)
+    second.metadata["image_info"]["format"] = "changed"  # hits are copies
+    assert extract_colors(images[0], palette_size=4, cache=cache).metadata["image_info"]["format"] == "PNG"  # type: ignore[index]
+    assert cache.stats == CacheStats(hits=2, misses=1, evictions=0, palettes=1)
+    assert cache.stats.hit_rate == pytest.approx(2 / 3)
+
+
+def test_memory_cache_notices_changed_files(images: list[str], calls: list[object]) -> None:
+    cache = MemoryPaletteCache()
+    extract_colors(images[0], cache=cache)
+    shutil.copy(images[1], images[0])
+    os.utime(images[0], ns=(0, 1))  # a different modification time
+    assert extract_colors(images[0], cache=cache).metadata["cached"] is False  # type: ignore[index]
+    assert len(cache) == 1  # the stale palette was replaced
+
+
+def test_memory_cache_evicts_and_invalidates(images: list[str], calls: list[object]) -> None:
+    cache = MemoryPaletteCache(max_palettes=2)
+    for image in images[:3]:
+        extract_colors(image, cache=cache)
+    extract_colors(images[2], palette_size=3, cache=cache)
+    assert cache.stats.evictions == 2
+    assert len(cache) == 2
+    cache.invalidate(images[2])
+    assert len(cache) == 0
+    extract_colors(images[1], cache=cache)
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_memory_cache_skips_other_inputs(images: list[str], calls: list[object]) -> None:
+    cache = MemoryPaletteCache()
+    data = Path(images[0]).read_bytes()
+    extract_colors(data, cache=cache)
+    extract_colors(data, cache=cache)
+    assert len(calls) == 2
+    assert len(cache) == 0 and cache.stats.misses == 0
+
+
+def test_memory_cache_in_a_thread_pool(images: list[str], calls: list[object]) -> None:
+    cache = MemoryPaletteCache()
+    stats = BatchStats()
+    batch_extract_colors(images * 5, palette_size=3, cache=cache, max_workers=8, schedule="input", stats=stats)
+    assert len(cache) == len(images)
+    assert cache.stats.hits + cache.stats.misses == len(images) * 5
+    assert stats.cache_hits == cache.stats.hits
+
+
+def test_invalid_max_palettes() -> None:
+    with pytest.raises(ValueError):
+        MemoryPaletteCache(max_palettes=0)
@@ -1,5 +1,6 @@
 from pathlib import Path
 
+import pytest
 from typer.testing import CliRunner
 
 from pylette.cmd import pylette_app
@@ -85,3 +86,33 @@ def test_alpha_mask_filters_all_pixels(test_image_path_as_str: str):
     result = runner.invoke(pylette_app, [test_image_path_as_str, "--alpha-mask-threshold", "255"])
     assert result.exit_code == 1
     assert "No valid pixels remain after applying alpha mask" in result.stderr
+
+
+@pytest.mark.parametrize(("resize", "expected"), [(["--resize", "0"], None), (["--resize", "256"], 256), ([], 64)])
+def test_cli_preset_and_resize(test_image_path_as_str: str, tmp_path: Path, resize: list[str], expected: int | None):
+    import json
+
+    output = tmp_path / "palettes.json"
+    result = runner.invoke(
+        pylette_app,
+        [test_image_path_as_str, "--preset", "fast", *resize, "--export-json", "--output", str(output)],
+    )
+    assert result.exit_code == 0
+    params = json.loads(output.read_text())["palettes"][0]["metadata"]["extraction_params"]
+    assert params["mode"] == "MedianCut"
+    assert params["resize"] == expected
+    assert params["preset"] == "fast"
+
+
+def test_cli_keyboard_interrupt_reports_partial_results(test_image_path_as_str: str, monkeypatch):
+    import pylette.cmd
+    from pylette.src.color_extraction import iter_extract_colors
+
+    def interrupted(*args, **kwargs):
+        yield next(iter_extract_colors(*args, **kwargs))
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(pylette.cmd, "iter_extract_colors", interrupted)
+    result = runner.invoke(pylette_app, [test_image_path_as_str, test_image_path_as_str])
+    assert result.exit_code == 130
+    assert "Interrupted: 1/2 images processed" in result.stderr
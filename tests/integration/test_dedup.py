@@ -0,0 +1,136 @@
+"""Tests for content-hash deduplication in ``batch_extract_colors``."""
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import pylette.src.color_extraction as color_extraction
+import pylette.src.dedup as dedup
+from pylette import InvalidImageError, batch_extract_colors
+from pylette.src.dedup import content_key
+from pylette.types import BatchStats, SourceType
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+
+@pytest.fixture
+def calls(monkeypatch) -> list[object]:  # type: ignore[no-untyped-def]
+    """Records the input of every extraction."""
+    seen: list[object] = []
+    extract = color_extraction.extract_colors
+
+    def counting(image, **kwargs):  # type: ignore[no-untyped-def]
+        seen.append(image)
+        return extract(image, **kwargs)
+
+    monkeypatch.setattr(color_extraction, "extract_colors", counting)
+    return seen
+
+
+def _colors(results) -> list[list[tuple[int, ...]]]:  # type: ignore[no-untyped-def]
+    return [[c.rgb for c in r.palette.colors] for r in results]
+
+
+def test_same_file_content_is_extracted_once(
+    test_image_path_as_str: str, test_image_as_bytes: bytes, tmp_path: Path, calls: list[object]
+) -> None:
+    copy = tmp_path / "copy.png"
+    shutil.copy(test_image_path_as_str, copy)
+    images = [test_image_path_as_str, test_image_as_bytes, str(copy), test_image_path_as_str]
+    stats = BatchStats()
+    progress: list[int] = []
+
+    results = batch_extract_colors(
+        images, palette_size=4, dedupe=True, stats=stats, progress_callback=lambda n, _: progress.append(n)
+    )
+
+    assert len(calls) == 1
+    assert stats.duplicates == 3
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    assert [r.source for r in results] == images
+    assert all(r.success for r in results)
+    assert _colors(results) == _colors(batch_extract_colors(images, palette_size=4))
+    assert sorted(progress) == [1, 2, 3, 4]
+    assert results[1].palette.metadata["source_type"] == SourceType.BYTES
+    assert results[2].palette.metadata["image_source"] == str(copy)
+
+
+def test_duplicate_palettes_are_independent(test_image_path_as_str: str) -> None:
+    results = batch_extract_colors([test_image_path_as_str] * 2, dedupe=True)
+    assert results[0].palette is not results[1].palette
+    results[0].palette.metadata["image_info"]["format"] = "changed"
+    assert results[1].palette.metadata["image_info"]["format"] == "PNG"
+
+
+def test_in_memory_duplicates(calls: list[object]) -> None:
+    rng = np.random.default_rng(0)
+    arr = rng.integers(0, 256, (20, 30, 3), dtype=np.uint8)
+    images = [arr, arr.copy(), Image.fromarray(arr), Image.fromarray(arr.copy()), arr[:, ::-1]]
+
+    results = batch_extract_colors(images, palette_size=3, dedupe=True)
+
+    # Arrays and PIL images hash separately; the flipped array is different content.
+    assert len(calls) == 3
+    assert all(r.success for r in results)
+    assert results[3].palette.metadata["image_source"] == "<pil_image: 30x20 RGB>"
+
+
+def test_unreadable_inputs_are_not_merged(tmp_path: Path) -> None:
+    missing = str(tmp_path / "missing.png")
+    assert content_key(missing) == (None, missing)
+    results = batch_extract_colors([missing, missing], dedupe=True)
+    assert all(isinstance(r.exception, InvalidImageError) for r in results)
+
+
+def test_urls_are_fetched_once(requests_mock, test_image_as_bytes: bytes, calls: list[object]) -> None:  # type: ignore[no-untyped-def]
+    urls = ["https://a.example/x.png", "https://b.example/y.png"]
+    for url in urls:
+        requests_mock.get(url, content=test_image_as_bytes, headers={"Content-Type": "image/png"})
+
+    results = batch_extract_colors([*urls, urls[0]], palette_size=3, dedupe=True)
+
+    assert requests_mock.call_count == 2
+    assert len(calls) == 1
+    assert [r.palette.metadata["image_source"] for r in results] == [*urls, urls[0]]
+    assert all(r.palette.metadata["source_type"] == SourceType.URL for r in results)
+
+
+def test_failures_fan_out(tmp_path: Path) -> None:
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"not an image")
+    results = batch_extract_colors([str(broken), broken.read_bytes()], dedupe=True)
+    assert [r.index for r in results] == [0, 1]
+    assert all(isinstance(r.exception, InvalidImageError) for r in results)
+    assert results[1].source == b"not an image"
+
+
+def test_inputs_are_hashed_as_they_are_extracted(monkeypatch, calls: list[object]) -> None:  # type: ignore[no-untyped-def]
+    rng = np.random.default_rng(0)
+    images = [rng.integers(0, 256, (8, 8, 3), dtype=np.uint8) for _ in range(100)]
+    images.append(images[0].copy())  # found long after the original finished
+    events: list[str] = []
+    key = dedup.content_key
+
+    def hashing(image):  # type: ignore[no-untyped-def]
+        events.append("hash")
+        return key(image)
+
+    monkeypatch.setattr(dedup, "content_key", hashing)
+    stats = BatchStats()
+
+    results = batch_extract_colors(
+        images,
+        palette_size=3,
+        dedupe=True,
+        max_workers=1,
+        stats=stats,
+        progress_callback=lambda *_: events.append("done"),
+    )
+
+    assert events.index("done") < len(images) // 2  # not every input was hashed first
+    assert stats.duplicates == 1 and len(calls) == 100
+    assert [r.index for r in results] == list(range(101))
+    assert _colors(results[-1:]) == _colors(results[:1])
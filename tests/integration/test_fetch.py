@@ -0,0 +1,109 @@
+"""Tests for the pooled, size-capped HTTP client."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+
+from pylette import HttpClient, InvalidImageError, extract_colors, set_http_client
+from pylette.src.fetch import get_http_client
+
+URL = "https://my-test-image.com/image.png"
+
+
+@pytest.fixture
+def keepalive_server(test_image_as_bytes: bytes) -> Iterator[tuple[int, list[int]]]:
+    """An HTTP/1.1 server recording the client port of every request."""
+    ports: list[int] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            ports.append(self.client_address[1])
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(test_image_as_bytes)))
+            self.end_headers()
+            self.wfile.write(test_image_as_bytes)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        yield httpd.server_address[1], ports
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+@pytest.fixture
+def client() -> Iterator[HttpClient]:
+    client = HttpClient(pool_size=4)
+    set_http_client(client)
+    yield client
+    set_http_client(None)
+    client.close()
+
+
+def test_connections_are_reused(keepalive_server: tuple[int, list[int]], client: HttpClient) -> None:
+    port, ports = keepalive_server
+    for i in range(5):
+        extract_colors(f"http://127.0.0.1:{port}/image{i}.png", palette_size=3)
+    assert len(ports) == 5
+    assert len(set(ports)) == 1
+
+
+def test_threads_share_the_pool(keepalive_server: tuple[int, list[int]], client: HttpClient) -> None:
+    port, ports = keepalive_server
+    sessions: list[object] = []
+
+    def fetch(i: int) -> None:
+        client.fetch(f"http://127.0.0.1:{port}/image{i}.png")
+        sessions.append(client._session())  # type: ignore[reportPrivateUsage]
+
+    for i in range(3):  # one after another, each on its own thread
+        thread = threading.Thread(target=fetch, args=(i,))
+        thread.start()
+        thread.join()
+    assert len({id(s) for s in sessions}) == 3
+    assert len(set(ports)) == 1
+
+
+def test_default_client_is_shared() -> None:
+    assert get_http_client() is get_http_client()
+
+
+def test_requests_carry_timeout(requests_mock, test_image_as_bytes: bytes) -> None:  # type: ignore[no-untyped-def]
+    requests_mock.get(URL, content=test_image_as_bytes, headers={"Content-Type": "image/png"})
+    assert HttpClient(timeout=1.5).fetch(URL) == test_image_as_bytes
+    assert requests_mock.last_request.timeout == 1.5
+
+
+def test_declared_oversized_body_is_rejected(requests_mock) -> None:  # type: ignore[no-untyped-def]
+    requests_mock.get(URL, content=b"x" * 100, headers={"Content-Type": "image/png", "Content-Length": "100"})
+    with pytest.raises(InvalidImageError, match="max_bytes=10"):
+        HttpClient(max_bytes=10).fetch(URL)
+
+
+def test_streamed_oversized_body_is_rejected(requests_mock) -> None:  # type: ignore[no-untyped-def]
+    requests_mock.get(URL, content=b"x" * 100, headers={"Content-Type": "image/png"})
+    with pytest.raises(InvalidImageError, match="max_bytes=10"):
+        HttpClient(max_bytes=10).fetch(URL)
+    assert HttpClient(max_bytes=None).fetch(URL) == b"x" * 100
+
+
+def test_connection_errors_are_invalid_image_errors(requests_mock) -> None:  # type: ignore[no-untyped-def]
+    import requests
+
+    requests_mock.get(URL, exc=requests.ConnectTimeout)
+    with pytest.raises(InvalidImageError, match="Could not fetch"):
+        HttpClient().fetch(URL)
+
+
+def test_rejects_bad_max_bytes() -> None:
+    with pytest.raises(ValueError):
+        HttpClient(max_bytes=0)
@@ -0,0 +1,127 @@
+"""Tests for file-handle lifetimes and memory-mapped file reads."""
+
+import gc
+import os
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from pylette import InvalidImageError, batch_extract_colors, extract_colors, inspect_images, set_mmap_reads
+from pylette.src.files import open_file
+
+pytestmark = [
+    pytest.mark.filterwarnings("ignore::UserWarning"),
+    pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="counts descriptors in /proc"),
+]
+
+
+def _open_fds() -> int:
+    return len(os.listdir("/proc/self/fd"))
+
+
+@pytest.fixture
+def no_gc() -> Iterator[None]:
+    """Files must be closed explicitly, not by the garbage collector."""
+    gc.collect()
+    gc.disable()
+    yield
+    gc.enable()
+
+
+@pytest.fixture
+def mmap_reads() -> Iterator[None]:
+    set_mmap_reads(True)
+    yield
+    set_mmap_reads(False)
+
+
+@pytest.fixture
+def images(tmp_path: Path) -> list[str]:
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(40):
+        path = tmp_path / f"image_{i}.{['png', 'jpg', 'gif'][i % 3]}"
+        Image.fromarray(rng.integers(0, 256, (24, 24, 3), dtype=np.uint8)).save(path)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def animated_gif(tmp_path: Path) -> str:
+    """PIL keeps multi-frame files open after loading them."""
+    path = tmp_path / "animated.gif"
+    frames = [Image.new("RGB", (16, 16), (i * 60, 0, 0)) for i in range(3)]
+    frames[0].save(path, save_all=True, append_images=frames[1:])
+    return str(path)
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_batches_do_not_leak_descriptors(
+    images: list[str], animated_gif: str, tmp_path: Path, no_gc: None, mmap: bool
+) -> None:
+    set_mmap_reads(mmap)
+    try:
+        broken = tmp_path / "broken.png"
+        broken.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 100)
+        before = _open_fds()
+        results = batch_extract_colors([*images, animated_gif, str(broken)], palette_size=3, max_workers=4)
+        assert sum(r.success for r in results) == len(images) + 1
+        assert isinstance(results[-1].exception, InvalidImageError)
+        assert _open_fds() <= before + 4  # at most the pool's own descriptors
+        for _ in range(3):
+            extract_colors(animated_gif, palette_size=2)
+        assert _open_fds() <= before + 4
+    finally:
+        set_mmap_reads(False)
+
+
+def test_failed_images_are_closed(images: list[str], tmp_path: Path, no_gc: None) -> None:
+    """A failed result's traceback keeps the frame that opened the file alive."""
+    truncated = [tmp_path / f"truncated_{i}.png" for i in range(10)]
+    for path in truncated:
+        path.write_bytes(Path(images[0]).read_bytes()[:200])
+    before = _open_fds()
+    too_large = batch_extract_colors(images[:10], max_pixels=10, max_workers=1)
+    corrupt = batch_extract_colors(truncated, max_workers=1)
+    assert all(isinstance(r.exception, InvalidImageError) for r in too_large + corrupt)
+    assert _open_fds() == before
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_inspection_closes_files(images: list[str], tmp_path: Path, no_gc: None, mmap: bool) -> None:
+    set_mmap_reads(mmap)
+    try:
+        broken = tmp_path / "broken.png"
+        broken.write_bytes(b"not an image")
+        before = _open_fds()
+        results = inspect_images([*images, str(broken), Path(images[0]).as_uri()], max_workers=1)
+        assert [r.success for r in results] == [True] * len(images) + [False, True]
+        assert results[-1].n_bytes == os.path.getsize(images[0])
+        assert _open_fds() == before
+    finally:
+        set_mmap_reads(False)
+
+
+def test_mmap_reads_give_the_same_palettes(images: list[str], mmap_reads: None) -> None:
+    mapped = [[c.rgb for c in extract_colors(path, palette_size=4).colors] for path in images[:6]]
+    set_mmap_reads(False)
+    buffered = [[c.rgb for c in extract_colors(path, palette_size=4).colors] for path in images[:6]]
+    assert mapped == buffered
+
+
+def test_open_file(tmp_path: Path, mmap_reads: None) -> None:
+    empty = tmp_path / "empty"
+    empty.touch()
+    with open_file(empty) as f:  # cannot be mapped; read through a buffer
+        assert f.read() == b""
+    data = tmp_path / "data"
+    data.write_bytes(b"abc" * 1000)
+    with open_file(data) as f:
+        assert f.read(3) == b"abc"
+        f.seek(2997)
+        assert f.read() == b"abc"
+    with pytest.raises(FileNotFoundError):
+        open_file(tmp_path / "missing")
@@ -0,0 +1,116 @@
+"""Tests for header-only image inspection."""
+
+import json
+import shutil
+import sys
+import zipfile
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+from typer.testing import CliRunner
+
+from pylette import ImageTooLargeError, InvalidImageError, extract_colors, inspect_image, inspect_images
+from pylette.cmd import inspect_app, inspect_typer, pylette_app
+
+
+@pytest.fixture
+def truncated_png(tmp_path: Path) -> Path:
+    """A 300x200 RGBA PNG without its pixel data: only the header can be read."""
+    buffer = BytesIO()
+    Image.new("RGBA", (300, 200), (10, 20, 30, 128)).save(buffer, "PNG")
+    path = tmp_path / "truncated.png"
+    path.write_bytes(buffer.getvalue()[:60])
+    return path
+
+
+def test_inspect_reads_only_the_header(truncated_png: Path) -> None:
+    info = inspect_image(truncated_png)
+    assert info == {
+        "original_size": (300, 200),
+        "processed_size": (300, 200),
+        "format": "PNG",
+        "mode": "RGBA",
+        "has_alpha": True,
+    }
+    with pytest.raises(InvalidImageError):
+        extract_colors(truncated_png)  # decoding needs the missing pixel data
+
+
+def test_inspect_matches_extraction_metadata(test_image_path_as_str: str) -> None:
+    info = inspect_image(test_image_path_as_str)
+    metadata = extract_colors(test_image_path_as_str).metadata
+    assert metadata is not None
+    assert info["original_size"] == metadata["image_info"]["original_size"]
+    assert info["format"] == metadata["image_info"]["format"]
+
+
+def test_inspect_input_types(test_image_as_bytes: bytes) -> None:
+    assert inspect_image(test_image_as_bytes)["format"] == "PNG"
+    assert inspect_image(Image.new("P", (4, 5)))["original_size"] == (4, 5)
+    array_info = inspect_image(np.zeros((5, 4, 3), dtype=np.uint8))
+    assert (array_info["original_size"], array_info["mode"], array_info["has_alpha"]) == ((4, 5), "RGB", False)
+
+
+def test_transparency_counts_as_alpha(tmp_path: Path) -> None:
+    path = tmp_path / "palette.png"
+    image = Image.new("P", (8, 8))
+    image.save(path, transparency=0)
+    assert inspect_image(path)["has_alpha"]
+
+
+def test_inspect_images(truncated_png: Path, test_image_path_as_str: str, tmp_path: Path) -> None:
+    images = [test_image_path_as_str, str(tmp_path / "missing.png"), truncated_png]
+    results = inspect_images(images, max_workers=2)
+    assert [r.index for r in results] == [0, 1, 2]
+    assert [r.success for r in results] == [True, False, True]
+    assert isinstance(results[1].exception, InvalidImageError)
+    assert results[0].n_bytes == Path(test_image_path_as_str).stat().st_size
+    assert results[2].info is not None and results[2].info["original_size"] == (300, 200)
+
+
+def test_decompression_bomb_is_image_too_large(test_image_path_as_str: str, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 10)
+    with pytest.raises(ImageTooLargeError):
+        inspect_image(test_image_path_as_str)
+
+
+def test_cli_prints_json_lines(truncated_png: Path, test_image_as_bytes: bytes, tmp_path: Path) -> None:
+    archive = tmp_path / "images.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a.png", test_image_as_bytes)
+
+    result = CliRunner().invoke(inspect_app, [str(truncated_png), str(archive)])
+
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in result.output.splitlines()]
+    assert [r["source"] for r in records] == [str(truncated_png), f"{archive}::a.png"]
+    assert records[0]["original_size"] == [300, 200]
+    assert records[1]["n_bytes"] == len(test_image_as_bytes)
+
+
+def test_cli_reports_failures(tmp_path: Path, test_image_path_as_str: str) -> None:
+    output = tmp_path / "headers.jsonl"
+    missing = str(tmp_path / "missing.png")
+    result = CliRunner().invoke(inspect_app, [test_image_path_as_str, missing, "--output", str(output)])
+    assert result.exit_code == 2
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert "error" in records[1] and records[1]["source"] == missing
+
+
+def test_inspect_entry_point(test_image_path_as_str: str, monkeypatch, capsys) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(sys, "argv", ["pylette-inspect", test_image_path_as_str])
+    with pytest.raises(SystemExit) as excinfo:
+        inspect_typer()
+    assert excinfo.value.code == 0
+    assert json.loads(capsys.readouterr().out)["source"] == test_image_path_as_str
+
+
+def test_a_file_named_inspect_is_extracted(test_image_path_as_str: str, tmp_path: Path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    shutil.copy(test_image_path_as_str, tmp_path / "inspect")
+    monkeypatch.chdir(tmp_path)
+    result = CliRunner().invoke(pylette_app, ["inspect"])
+    assert result.exit_code == 0, result.output
+    assert "pylette-inspect" in CliRunner().invoke(pylette_app, ["--help"]).output
@@ -0,0 +1,172 @@
+"""Tests for the streaming ``iter_extract_colors`` API and index-based collation."""
+
+import gc
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from pylette import batch_extract_colors, iter_extract_colors
+from pylette.types import BatchResult
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+
+def _arrays(n: int) -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (24, 24, 3), dtype=np.uint8) for _ in range(n)]
+
+
+def test_yields_every_input_with_its_index() -> None:
+    images = _arrays(10)
+    results = list(iter_extract_colors(images, palette_size=3, max_workers=3))
+    assert sorted(r.index for r in results) == list(range(10))
+    for r in results:
+        assert r.index is not None
+        assert r.source is images[r.index]
+        assert r.success
+
+
+def test_ordered_yields_in_input_order() -> None:
+    results = list(iter_extract_colors(_arrays(10), palette_size=3, max_workers=3, ordered=True))
+    assert [r.index for r in results] == list(range(10))
+
+
+def test_accepts_lazy_generators(test_image_path_as_str: str) -> None:
+    consumed = []
+
+    def paths():
+        for i in range(6):
+            consumed.append(i)
+            yield test_image_path_as_str
+
+    stream = iter_extract_colors(paths(), max_workers=1)
+    first = next(stream)
+    assert first.success
+    assert len(consumed) < 6  # the input is pulled only as workers free up
+    assert len([first, *stream]) == 6
+    stream.close()
+
+
+def test_in_flight_inputs_are_bounded() -> None:
+    lock = threading.Lock()
+    alive = {"current": 0, "peak": 0}
+
+    class Tracked(np.ndarray):
+        def __del__(self) -> None:
+            with lock:
+                alive["current"] -= 1
+
+    def images():
+        for arr in _arrays(40):
+            with lock:
+                alive["current"] += 1
+                alive["peak"] = max(alive["peak"], alive["current"])
+            yield arr.view(Tracked)
+
+    for result in iter_extract_colors(images(), palette_size=2, max_workers=2):
+        del result
+        gc.collect()
+    # The window of 2 * 2 inputs, the one being pulled, and up to one per
+    # worker that a pool thread still references for a moment after
+    # completing its future.
+    assert alive["peak"] <= 2 * 2 + 1 + 2
+
+
+def test_results_are_not_retained() -> None:
+    refs = []
+    for result in iter_extract_colors(_arrays(6), palette_size=2, max_workers=2):
+        assert result.palette is not None
+        refs.append(weakref.ref(result.palette))
+        del result
+    gc.collect()
+    assert all(ref() is None for ref in refs)
+
+
+def test_failures_are_yielded_in_place(test_image_path_as_str: str) -> None:
+    images = [test_image_path_as_str, "/does/not/exist.png", test_image_path_as_str]
+    results = list(iter_extract_colors(images, ordered=True))
+    assert [r.success for r in results] == [True, False, True]
+    assert results[1].index == 1
+
+
+def test_progress_callback_counts_completions() -> None:
+    calls: list[tuple[int, BatchResult]] = []
+    results = list(iter_extract_colors(_arrays(5), progress_callback=lambda n, r: calls.append((n, r))))
+    assert [n for n, _ in calls] == [1, 2, 3, 4, 5]
+    assert {id(r) for _, r in calls} == {id(r) for r in results}
+
+
+def test_early_stop_leaves_borrowed_executor_running() -> None:
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        stream = iter_extract_colors(_arrays(20), backend=executor)
+        next(stream)
+        stream.close()
+        assert executor.submit(sum, [1, 2]).result() == 3
+
+
+def test_batch_handles_unhashable_and_duplicate_inputs() -> None:
+    arr = _arrays(1)[0]
+    image = Image.fromarray(arr)
+    images = [arr, arr, image, b"not an image", arr.copy()]
+    results = batch_extract_colors(images, palette_size=3)
+    assert [r.index for r in results] == list(range(5))
+    assert [r.source is img for r, img in zip(results, images)] == [True] * 5
+    assert [r.success for r in results] == [True, True, True, False, True]
+
+
+def _counting(images: list, pulled: list):  # type: ignore[no-untyped-def]
+    for image in images:
+        pulled.append(1)
+        yield image
+
+
+def test_max_in_flight_bounds_submission() -> None:
+    pulled: list[int] = []
+    stream = iter_extract_colors(_counting(_arrays(30), pulled), palette_size=2, max_workers=4, max_in_flight=3)
+    next(stream)
+    assert len(pulled) <= 3 + 1
+    assert len([*stream]) == 29
+
+
+@pytest.mark.parametrize("max_in_flight", [0, -2])
+def test_invalid_max_in_flight_raises(max_in_flight: int) -> None:
+    with pytest.raises(ValueError):
+        batch_extract_colors(_arrays(1), max_in_flight=max_in_flight)
+
+
+def test_cancel_stops_remaining_work() -> None:
+    cancel = threading.Event()
+    pulled: list[int] = []
+
+    def stop_after_two(n: int, _: BatchResult) -> None:
+        if n == 2:
+            cancel.set()
+
+    images = _counting(_arrays(50), pulled)
+    results = list(
+        iter_extract_colors(images, max_workers=2, max_in_flight=2, cancel=cancel, progress_callback=stop_after_two)
+    )
+    assert 2 <= len(results) <= 4
+    assert len(pulled) <= 4
+
+
+def test_cancel_before_start_yields_nothing() -> None:
+    cancel = threading.Event()
+    cancel.set()
+    assert batch_extract_colors(_arrays(5), cancel=cancel) == []
+
+
+def test_keyboard_interrupt_propagates_without_draining() -> None:
+    pulled: list[int] = []
+
+    def interrupt(n: int, _: BatchResult) -> None:
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        for _ in iter_extract_colors(_counting(_arrays(40), pulled), max_workers=2, progress_callback=interrupt):
+            pass
+    assert len(pulled) <= 4
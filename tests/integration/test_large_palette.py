@@ -0,0 +1,80 @@
+"""
+Large palette sizes (64-256 colors, e.g. for GIF / indexed-PNG export) are a
+supported regime: every extractor must build a 256-color palette from a 1 MP
+sample within a fixed time budget.
+"""
+
+import time
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from pylette import extract_colors
+from pylette.src.extractors import available_methods
+from pylette.src.extractors.clustering import LARGE_PALETTE_SIZE
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+# Wall-clock budget for a 256-color palette from a 1000x1000 sample, per method.
+# The large-palette paths take one to three seconds on a single core; the naive
+# k-means they replace (KMeans over every pixel) takes over a minute there, so
+# the budget catches a regression to it while leaving room for slow runners.
+TIME_BUDGET_SECONDS = 10.0
+
+
+@pytest.fixture(scope="module")
+def megapixel_image() -> Image.Image:
+    rng = np.random.default_rng(0)
+    h = w = 1000
+    y, x = np.mgrid[0:h, 0:w]
+    arr = np.stack([x * 255 // w, y * 255 // h, (x + y) * 255 // (w + h)], axis=-1)
+    arr = np.clip(arr + rng.integers(-20, 21, (h, w, 3)), 0, 255).astype(np.uint8)
+    return Image.fromarray(arr, "RGB")
+
+
+@pytest.mark.parametrize("mode", available_methods())
+def test_256_colors_from_megapixel_within_budget(mode, megapixel_image: Image.Image) -> None:
+    start = time.perf_counter()
+    palette = extract_colors(megapixel_image, palette_size=256, mode=mode, resize=None)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < TIME_BUDGET_SECONDS
+    assert palette.metadata["processing_stats"]["valid_pixels"] == 1_000_000
+    assert len(palette) == 256
+    assert sum(palette.frequencies) == pytest.approx(1.0)
+    assert len({c.rgb for c in palette.colors}) > 200
+
+
+@pytest.mark.parametrize("mode", available_methods())
+def test_large_palette_is_deterministic(mode) -> None:
+    arr = np.random.default_rng(1).integers(0, 256, (120, 120, 3), dtype=np.uint8)
+    img = Image.fromarray(arr, "RGB")
+    a = extract_colors(img, palette_size=LARGE_PALETTE_SIZE, mode=mode, resize=None)
+    b = extract_colors(img, palette_size=LARGE_PALETTE_SIZE, mode=mode, resize=None)
+    assert [(c.rgb, c.frequency) for c in a.colors] == [(c.rgb, c.frequency) for c in b.colors]
+
+
+@pytest.mark.parametrize("mode", available_methods())
+def test_large_palette_with_few_distinct_colors(mode) -> None:
+    arr = np.zeros((10, 10, 3), dtype=np.uint8)
+    arr[:5] = (200, 10, 10)
+    arr[5:, :3] = (10, 10, 200)
+    img = Image.fromarray(arr, "RGB")
+    palette = extract_colors(img, palette_size=128, mode=mode, resize=None)
+    # Median cut splits boxes down to single pixels, so the same color may repeat.
+    totals: dict[tuple[int, int, int], float] = {}
+    for c in palette.colors:
+        totals[c.rgb] = totals.get(c.rgb, 0.0) + c.frequency
+    assert sorted(totals) == [(0, 0, 0), (10, 10, 200), (200, 10, 10)]
+    assert sorted(totals.values()) == pytest.approx([0.15, 0.35, 0.5])
+
+
+@pytest.mark.parametrize("mode", available_methods())
+def test_large_palette_keeps_alpha(mode) -> None:
+    arr = np.zeros((8, 8, 4), dtype=np.uint8)
+    arr[..., :3] = np.random.default_rng(2).integers(0, 256, (8, 8, 3))
+    arr[..., 3] = 128
+    img = Image.fromarray(arr, "RGBA")
+    palette = extract_colors(img, palette_size=LARGE_PALETTE_SIZE, mode=mode, resize=None)
+    assert all(c.alpha == 128 for c in palette.colors)
@@ -0,0 +1,25 @@
+"""`import pylette` must stay cheap: optional machinery loads on first use."""
+
+import subprocess
+import sys
+
+DEFERRED = ["asyncio", "sqlite3", "multiprocessing", "concurrent.futures.process", "tarfile", "sklearn", "requests"]
+
+
+def _loaded_after(statement: str) -> list[str]:
+    code = f"import sys\n{statement}\nprint(' '.join(m for m in {DEFERRED!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return output.split()
+
+
+def test_import_pylette_defers_optional_modules() -> None:
+    assert _loaded_after("import pylette") == []
+    assert _loaded_after("import pylette.cmd") == []
+
+
+def test_lazy_exports_resolve() -> None:
+    assert _loaded_after("from pylette import PaletteCache") == ["sqlite3"]
+    import pylette
+
+    assert pylette.extract_colors_async.__module__ == "pylette.src.async_extraction"
+    assert set(pylette.__all__) <= set(dir(pylette))
@@ -0,0 +1,153 @@
+"""Tests for per-image limits: ``max_pixels`` and batch ``timeout``."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+from typer.testing import CliRunner
+
+import pylette.src.color_extraction as color_extraction
+from pylette import (
+    ExtractionConfig,
+    ExtractionTimeoutError,
+    ImageTooLargeError,
+    InvalidImageError,
+    PyletteError,
+    batch_extract_colors,
+    extract_colors,
+    pipeline_extract_colors,
+)
+from pylette.cmd import pylette_app
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+
+@pytest.fixture
+def truncated_png(tmp_path: Path) -> Path:
+    """A 200x100 PNG whose pixel data is cut off: the header reads, decoding fails."""
+    buffer = BytesIO()
+    Image.fromarray(np.random.default_rng(0).integers(0, 256, (100, 200, 3), dtype=np.uint8)).save(buffer, "PNG")
+    path = tmp_path / "truncated.png"
+    path.write_bytes(buffer.getvalue()[:200])
+    return path
+
+
+def test_max_pixels_is_checked_from_the_header(truncated_png: Path) -> None:
+    with pytest.raises(ImageTooLargeError, match="200x100"):
+        extract_colors(truncated_png, max_pixels=10_000)
+    # Within the limit, decoding is attempted and fails on the missing data.
+    with pytest.raises(InvalidImageError) as excinfo:
+        extract_colors(truncated_png, max_pixels=20_000)
+    assert not isinstance(excinfo.value, ImageTooLargeError)
+
+
+def test_image_too_large_is_a_pylette_error() -> None:
+    assert issubclass(ImageTooLargeError, InvalidImageError)
+    assert issubclass(ImageTooLargeError, PyletteError)
+    assert issubclass(ExtractionTimeoutError, PyletteError)
+    assert issubclass(ExtractionTimeoutError, TimeoutError)
+
+
+def test_max_pixels_applies_to_in_memory_images() -> None:
+    image = Image.new("RGB", (20, 20))
+    with pytest.raises(ImageTooLargeError):
+        extract_colors(image, max_pixels=399)
+    assert len(extract_colors(image, max_pixels=400, time_budget=60.0)) == 1
+
+
+def test_decompression_bomb_is_image_too_large(test_image_path_as_str: str, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 100)
+    with pytest.raises(ImageTooLargeError):
+        extract_colors(test_image_path_as_str)
+
+
+@pytest.mark.parametrize("value", [0, -5])
+def test_invalid_max_pixels_raises(test_image_path_as_str: str, value: int) -> None:
+    with pytest.raises(ValueError):
+        extract_colors(test_image_path_as_str, max_pixels=value)
+    with pytest.raises(ValueError):
+        ExtractionConfig(max_pixels=value)
+
+
+def test_batch_reports_too_large_images(truncated_png: Path, test_image_path_as_str: str) -> None:
+    small = Image.new("RGB", (50, 50))
+    results = batch_extract_colors([str(truncated_png), test_image_path_as_str, small], max_pixels=10_000)
+    assert isinstance(results[0].exception, ImageTooLargeError)
+    assert isinstance(results[1].exception, ImageTooLargeError)
+    assert results[2].success
+
+
+def test_pipeline_checks_max_pixels_before_decoding(truncated_png: Path, test_image_path_as_str: str) -> None:
+    results = sorted(
+        pipeline_extract_colors([str(truncated_png), test_image_path_as_str], max_pixels=10_000),
+        key=lambda r: r.index or 0,
+    )
+    assert isinstance(results[0].exception, ImageTooLargeError)
+
+
+@pytest.fixture
+def slow_middle_image(monkeypatch) -> list[Image.Image]:  # type: ignore[no-untyped-def]
+    """Six small images; extracting the third blocks its worker for two seconds."""
+    images = [Image.new("RGB", (8, 8), (i * 40, 0, 0)) for i in range(6)]
+    extract = color_extraction.extract_colors
+
+    def slow(image, **kwargs):  # type: ignore[no-untyped-def]
+        if image is images[2]:
+            time.sleep(2)
+        return extract(image, **kwargs)
+
+    monkeypatch.setattr(color_extraction, "extract_colors", slow)
+    return images
+
+
+def test_thread_timeout_does_not_stall_the_batch(slow_middle_image: list[Image.Image]) -> None:
+    start = time.perf_counter()
+    results = batch_extract_colors(slow_middle_image, max_workers=1, timeout=0.3, schedule="input")
+    elapsed = time.perf_counter() - start
+
+    assert isinstance(results[2].exception, ExtractionTimeoutError)
+    assert [r.success for i, r in enumerate(results) if i != 2] == [True] * 5
+    assert elapsed < 1.5  # the pool was replaced instead of waiting for the stuck worker
+
+
+def test_borrowed_executor_timeout_is_reported(slow_middle_image: list[Image.Image]) -> None:
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = batch_extract_colors(slow_middle_image, backend=executor, timeout=0.3, schedule="input")
+    assert isinstance(results[2].exception, ExtractionTimeoutError)
+    assert sum(r.success for r in results) == 5
+
+
+def test_process_timeout_kills_the_worker() -> None:
+    rng = np.random.default_rng(0)
+    slow = rng.integers(0, 256, (1200, 1200, 3), dtype=np.uint8)  # many seconds at full resolution
+    small = [np.full((8, 8, 3), i * 40, dtype=np.uint8) for i in range(4)]
+    start = time.perf_counter()
+    results = batch_extract_colors(
+        [small[0], slow, *small[1:]],
+        palette_size=32,
+        resize=None,
+        backend="processes",
+        max_workers=2,
+        timeout=1.0,
+    )
+    elapsed = time.perf_counter() - start
+
+    assert isinstance(results[1].exception, ExtractionTimeoutError)
+    assert [r.success for i, r in enumerate(results) if i != 1] == [True] * 4
+    assert elapsed < 8
+
+
+@pytest.mark.parametrize("value", [0, -1.0])
+def test_invalid_timeout_raises(test_image_path_as_str: str, value: float) -> None:
+    with pytest.raises(ValueError):
+        batch_extract_colors([test_image_path_as_str], timeout=value)
+
+
+def test_cli_max_pixels(test_image_path_as_str: str) -> None:
+    result = CliRunner().invoke(pylette_app, [test_image_path_as_str, "--max-pixels", "1"])
+    assert result.exit_code == 1
+    assert "exceeds the limit" in result.output
@@ -0,0 +1,142 @@
+"""Tests for the URI-scheme loader registry."""
+
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from PIL import Image
+
+from pylette import (
+    InvalidImageError,
+    batch_extract_colors,
+    extract_colors,
+    iter_extract_colors,
+    pipeline_extract_colors,
+    register_loader,
+    unregister_loader,
+)
+from pylette.src.loaders import loader_for, registered_schemes
+from pylette.types import SourceType
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+
+class MemoryLoader:
+    """Serves ``mem://<name>`` from a dict, recording the peak number of concurrent loads."""
+
+    def __init__(self, blobs: dict[str, bytes], as_type: str = "bytes", max_concurrency: int | None = None):
+        self.blobs = blobs
+        self.as_type = as_type
+        self.max_concurrency = max_concurrency
+        self.delay = 0.0
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def load(self, uri: str):  # type: ignore[no-untyped-def]
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            data = self.blobs[uri.removeprefix("mem://")]
+        finally:
+            with self.lock:
+                self.active -= 1
+        if self.as_type == "stream":
+            return BytesIO(data)
+        if self.as_type == "image":
+            return Image.open(BytesIO(data))
+        return data
+
+
+@pytest.fixture
+def blobs(test_image_as_bytes: bytes) -> dict[str, bytes]:
+    return {"a": test_image_as_bytes, "b": test_image_as_bytes}
+
+
+@pytest.fixture
+def mem_scheme() -> Iterator[None]:
+    yield
+    unregister_loader("mem")
+
+
+@pytest.mark.parametrize("as_type", ["bytes", "stream", "image"])
+def test_custom_scheme(blobs: dict[str, bytes], mem_scheme: None, as_type: str) -> None:
+    register_loader("mem", MemoryLoader(blobs, as_type))
+    palette = extract_colors("mem://a", palette_size=3)
+    assert len(palette) == 3
+    assert palette.metadata["image_source"] == "mem://a"
+    assert palette.metadata["source_type"] == SourceType.URL
+
+
+def test_file_uri(test_image_path_as_pathlike: Path) -> None:
+    uri = test_image_path_as_pathlike.resolve().as_uri()
+    expected = extract_colors(test_image_path_as_pathlike, palette_size=3)
+    assert [c.rgb for c in extract_colors(uri, palette_size=3).colors] == [c.rgb for c in expected.colors]
+
+
+def test_missing_file_uri_is_invalid(tmp_path: Path) -> None:
+    with pytest.raises(InvalidImageError):
+        extract_colors((tmp_path / "missing.png").as_uri())
+
+
+def test_unknown_url_scheme_is_invalid() -> None:
+    with pytest.raises(InvalidImageError, match="'ftp'"):
+        extract_colors("ftp://example.com/image.png")
+
+
+def test_paths_are_not_uris() -> None:
+    assert loader_for("C:\\images\\photo.png") is None
+    assert loader_for("photo.png") is None
+    assert loader_for(Path("http://example.com/a.png")) is None
+
+
+def test_registration_rules(blobs: dict[str, bytes], mem_scheme: None) -> None:
+    assert {"http", "https", "file"} <= set(registered_schemes())
+    register_loader("MEM", MemoryLoader(blobs))
+    assert "mem" in registered_schemes()
+    with pytest.raises(ValueError, match="already registered"):
+        register_loader("mem", MemoryLoader(blobs))
+    register_loader("mem", MemoryLoader(blobs), replace=True)
+    for scheme in ["c", "1abc", "has space"]:
+        with pytest.raises(ValueError):
+            register_loader(scheme, MemoryLoader(blobs))
+
+
+def test_batch_respects_loader_concurrency(
+    blobs: dict[str, bytes], mem_scheme: None, test_image_path_as_str: str
+) -> None:
+    many = {str(i): blobs["a"] for i in range(8)}
+    loader = MemoryLoader(many, max_concurrency=2)
+    loader.delay = 0.05
+    register_loader("mem", loader)
+    images = [f"mem://{i}" for i in range(8)] + [test_image_path_as_str] * 2
+
+    results = batch_extract_colors(images, palette_size=3, max_workers=6, schedule="input")
+
+    assert all(r.success for r in results)
+    assert [r.index for r in results] == list(range(10))
+    assert loader.peak == 2
+
+
+def test_ordered_iteration_with_a_limited_loader(blobs: dict[str, bytes], mem_scheme: None) -> None:
+    register_loader("mem", MemoryLoader({str(i): blobs["a"] for i in range(5)}, max_concurrency=1))
+    results = list(iter_extract_colors([f"mem://{i}" for i in range(5)], max_workers=4, max_in_flight=2, ordered=True))
+    assert [r.index for r in results] == list(range(5))
+
+
+def test_pipeline_and_dedupe_use_loaders(blobs: dict[str, bytes], mem_scheme: None) -> None:
+    loader = MemoryLoader({str(i): blobs["a"] for i in range(6)} | blobs, max_concurrency=1)
+    loader.delay = 0.02
+    register_loader("mem", loader)
+
+    results = list(pipeline_extract_colors([f"mem://{i}" for i in range(6)], palette_size=3, read_workers=4))
+    assert all(r.success for r in results)
+    assert loader.peak == 1
+
+    results = batch_extract_colors(["mem://a", "mem://b", "mem://a"], palette_size=3, dedupe=True)
+    assert [r.palette.metadata["image_source"] for r in results] == ["mem://a", "mem://b", "mem://a"]
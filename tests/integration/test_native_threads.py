@@ -0,0 +1,96 @@
+"""Tests for per-worker OpenMP/BLAS thread limits in batch extraction."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+import pytest
+import sklearn.cluster  # noqa: F401  (loads scikit-learn's OpenMP runtime)
+from threadpoolctl import ThreadpoolController, threadpool_info
+
+from pylette import batch_extract_colors, pipeline_extract_colors
+from pylette.src.executors import create_executor, limit_native_threads, native_threads_for
+from pylette.types import Backend
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+
+def _openmp_threads(_: Any = None) -> int:
+    return ThreadpoolController().select(user_api="openmp").info()[0]["num_threads"]
+
+
+@pytest.fixture
+def eight_cores(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("pylette.src.executors.os.cpu_count", lambda: 8)
+
+
+@pytest.fixture
+def record_threads(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Make every extraction report the OpenMP thread limit it ran under."""
+    monkeypatch.setattr("pylette.src.color_extraction.extract_colors", lambda image, **_: _openmp_threads())
+    monkeypatch.setattr("pylette.src.pipeline.extract_colors", lambda image, **_: _openmp_threads())
+
+
+@pytest.mark.parametrize(("workers", "expected"), [(1, 8), (2, 4), (3, 2), (8, 1), (32, 1)])
+def test_native_threads_divide_the_cores(eight_cores: None, workers: int, expected: int) -> None:
+    assert native_threads_for(workers) == expected
+
+
+def _arrays(n: int) -> list[np.ndarray]:
+    return [np.zeros((4, 4, 3), dtype=np.uint8)] * n
+
+
+def test_default_limit_follows_max_workers(eight_cores: None, record_threads: None) -> None:
+    before = _openmp_threads()
+    results = batch_extract_colors(_arrays(6), max_workers=2)
+    assert [r.result for r in results] == [4] * 6
+    assert _openmp_threads() == before  # the caller's thread is left alone
+
+
+def test_explicit_limit(record_threads: None) -> None:
+    results = batch_extract_colors(_arrays(3), max_workers=2, native_threads=3)
+    assert [r.result for r in results] == [3] * 3
+
+
+def test_borrowed_executor_is_limited(eight_cores: None, record_threads: None) -> None:
+    with ThreadPoolExecutor(4) as pool:
+        results = batch_extract_colors(_arrays(4), backend=pool)
+    assert [r.result for r in results] == [2] * 4
+
+
+def test_pipeline_is_limited(eight_cores: None, record_threads: None) -> None:
+    results = list(pipeline_extract_colors(_arrays(4), extract_workers=2))
+    assert [r.result for r in results] == [4] * 4
+
+
+def test_limits_are_per_thread() -> None:
+    barrier = threading.Barrier(2)
+
+    def report(_: Any) -> int:
+        barrier.wait()  # both limits are in force at the same time
+        return _openmp_threads()
+
+    with ThreadPoolExecutor(2) as pool:
+        low = pool.submit(limit_native_threads(report, 2), None)
+        high = pool.submit(limit_native_threads(report, 5), None)
+        assert (low.result(), high.result()) == (2, 5)
+
+
+def test_process_workers_cap_every_pool() -> None:
+    executor = create_executor(Backend.PROCESSES, max_workers=1, native_threads=2)
+    with executor:
+        pools = executor.submit(threadpool_info).result()
+    assert {pool["user_api"] for pool in pools} >= {"openmp", "blas"}
+    assert all(pool["num_threads"] == 2 for pool in pools)
+
+
+def test_process_backend_extracts(test_image_path_as_str: str) -> None:
+    results = batch_extract_colors([test_image_path_as_str] * 2, backend=Backend.PROCESSES, max_workers=2)
+    assert all(r.success for r in results)
+
+
+@pytest.mark.parametrize("native_threads", [0, -2])
+def test_rejects_bad_native_threads(native_threads: int) -> None:
+    with pytest.raises(ValueError):
+        batch_extract_colors(_arrays(1), native_threads=native_threads)
@@ -0,0 +1,127 @@
+"""Tests for the incremental (partial_fit) extractors."""
+
+import numpy as np
+import pytest
+
+from pylette import HistogramExtractor, StreamingKMeansExtractor
+from pylette.src.extractors.protocol import IncrementalColorExtractor
+
+EXTRACTORS = [StreamingKMeansExtractor, HistogramExtractor]
+
+# Three well-separated colors, in proportions 1/2, 1/3, 1/6.
+RED, GREEN, BLUE = (220, 20, 20), (20, 200, 40), (30, 40, 230)
+
+
+def _stream(n_chunks: int = 12, chunk: int = 600) -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    colors = np.array([RED] * 3 + [GREEN] * 2 + [BLUE], dtype=np.int16)
+    chunks = []
+    for _ in range(n_chunks):
+        picks = colors[rng.integers(0, len(colors), chunk)]
+        noise = rng.integers(-3, 4, picks.shape)
+        chunks.append(np.clip(picks + noise, 0, 255).astype(np.uint8).reshape(20, -1, 3))
+    return chunks
+
+
+@pytest.mark.parametrize("cls", EXTRACTORS)
+class TestIncrementalExtractors:
+    def test_satisfies_protocol(self, cls):
+        assert isinstance(cls(), IncrementalColorExtractor)
+
+    def test_empty_before_any_pixels(self, cls):
+        assert len(cls().palette()) == 0
+
+    def test_recovers_stream_colors(self, cls):
+        extractor = cls(palette_size=3)
+        for chunk in _stream():
+            extractor.partial_fit(chunk)
+        palette = extractor.palette()
+
+        assert len(palette) == 3
+        assert sum(palette.frequencies) == pytest.approx(1.0)
+        # Sorted by descending frequency: red, green, blue.
+        for color, expected, freq in zip(palette.colors, (RED, GREEN, BLUE), (1 / 2, 1 / 3, 1 / 6)):
+            assert np.abs(np.array(color.rgb) - expected).max() <= 6
+            assert color.frequency == pytest.approx(freq, abs=0.03)
+
+    def test_palette_readable_mid_stream(self, cls):
+        extractor = cls(palette_size=3)
+        chunks = _stream()
+        extractor.partial_fit(chunks[0])
+        assert len(extractor.palette()) == 3
+        for chunk in chunks[1:]:
+            extractor.partial_fit(chunk)
+        assert len(extractor.palette()) == 3
+
+    def test_deterministic(self, cls):
+        a, b = cls(palette_size=4), cls(palette_size=4)
+        for chunk in _stream():
+            a.partial_fit(chunk)
+            b.partial_fit(chunk)
+        assert [c.rgb for c in a.palette().colors] == [c.rgb for c in b.palette().colors]
+
+    def test_reset_forgets_stream(self, cls):
+        extractor = cls(palette_size=3)
+        for chunk in _stream():
+            extractor.partial_fit(chunk)
+        extractor.reset()
+        assert len(extractor.palette()) == 0
+        assert extractor.n_pixels_seen == 0
+
+        extractor.partial_fit(np.full((4, 4, 3), 7, dtype=np.uint8))
+        assert [c.rgb for c in extractor.palette().colors] == [(7, 7, 7)]
+
+    def test_fewer_colors_than_palette_size(self, cls):
+        extractor = cls(palette_size=5)
+        extractor.partial_fit(np.array([[10, 10, 10], [250, 250, 250]], dtype=np.uint8))
+        palette = extractor.palette()
+        assert sorted(c.rgb for c in palette.colors) == [(10, 10, 10), (250, 250, 250)]
+
+    def test_alpha_masking(self, cls):
+        extractor = cls(palette_size=2, alpha_mask_threshold=128)
+        chunk = np.array([[255, 0, 0, 255], [0, 0, 255, 100], [0, 0, 255, 0]], dtype=np.uint8)
+        extractor.partial_fit(chunk)
+        assert [c.rgb for c in extractor.palette().colors] == [(255, 0, 0)]
+        assert extractor.n_pixels_seen == 1
+
+    def test_rejects_bad_channel_count(self, cls):
+        with pytest.raises(ValueError):
+            cls().partial_fit(np.zeros((4, 2), dtype=np.uint8))
+
+
+def test_streaming_kmeans_memory_is_bounded():
+    extractor = StreamingKMeansExtractor(palette_size=3)
+    for chunk in _stream(n_chunks=40):
+        extractor.partial_fit(chunk)
+    assert extractor._centers.shape == (3, 4)
+    assert extractor._counts.shape == (3,)
+
+
+def test_streaming_kmeans_decay_tracks_drift():
+    extractor = StreamingKMeansExtractor(palette_size=2, decay=0.5)
+    for _ in range(5):
+        extractor.partial_fit(np.array([[255, 0, 0]] * 50 + [[0, 0, 255]] * 50, dtype=np.uint8))
+    for _ in range(10):
+        extractor.partial_fit(np.array([[0, 0, 255]] * 100, dtype=np.uint8))
+    dominant = extractor.palette()[0]
+    assert dominant.rgb == (0, 0, 255)
+    assert dominant.frequency > 0.99
+
+
+def test_histogram_memory_is_bounded():
+    extractor = HistogramExtractor(palette_size=3, bits=4)
+    for chunk in _stream(n_chunks=40):
+        extractor.partial_fit(chunk)
+    assert extractor._counts.shape == (1 << 12,)
+
+
+@pytest.mark.parametrize("kwargs", [{"decay": 0.0}, {"decay": 1.5}, {"palette_size": 0}])
+def test_streaming_kmeans_rejects_bad_arguments(kwargs):
+    with pytest.raises(ValueError):
+        StreamingKMeansExtractor(**kwargs)
+
+
+@pytest.mark.parametrize("bits", [0, 9])
+def test_histogram_rejects_bad_bits(bits):
+    with pytest.raises(ValueError):
+        HistogramExtractor(bits=bits)
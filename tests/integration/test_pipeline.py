@@ -0,0 +1,135 @@
+"""Tests for the staged read / decode / extract pipeline."""
+
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from pylette import InvalidImageError, extract_colors, pipeline_extract_colors
+from pylette.types import PipelineStats, SourceType
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+
+@pytest.fixture
+def paths(tmp_path: Path) -> list[str]:
+    rng = np.random.default_rng(0)
+    out = []
+    for i in range(8):
+        path = tmp_path / f"image{i}.png"
+        Image.fromarray(rng.integers(0, 256, (24, 24, 3), dtype=np.uint8)).save(path)
+        out.append(str(path))
+    return out
+
+
+def test_matches_direct_extraction(paths: list[str]) -> None:
+    results = sorted(pipeline_extract_colors(paths, palette_size=4, extract_workers=2), key=lambda r: r.index or 0)
+    assert [r.index for r in results] == list(range(len(paths)))
+    for path, result in zip(paths, results):
+        expected = extract_colors(path, palette_size=4)
+        assert result.palette is not None
+        assert [c.rgb for c in result.palette.colors] == [c.rgb for c in expected.colors]
+        assert result.palette.image_source == path
+        assert result.palette.source_type == SourceType.FILE_PATH
+        assert result.palette.metadata["image_info"]["format"] == "PNG"
+
+
+def test_mixed_inputs(paths: list[str], test_image_as_bytes: bytes) -> None:
+    arr = np.zeros((8, 8, 3), dtype=np.uint8)
+    pil = Image.new("RGB", (8, 8), (10, 20, 30))
+    images = [paths[0], test_image_as_bytes, arr, pil]
+    results = list(pipeline_extract_colors(images, ordered=True))
+
+    assert [r.source for r in results] == images
+    assert [r.palette.source_type for r in results if r.palette] == [
+        SourceType.FILE_PATH,
+        SourceType.BYTES,
+        SourceType.NUMPY_ARRAY,
+        SourceType.PIL_IMAGE,
+    ]
+    assert results[1].palette.image_source == f"<bytes: {len(test_image_as_bytes):,} bytes>"
+
+
+def test_failures_in_any_stage_are_reported(paths: list[str]) -> None:
+    images = [paths[0], "does-not-exist.png", b"not an image", paths[1]]
+    results = list(pipeline_extract_colors(images, ordered=True))
+    assert [r.success for r in results] == [True, False, False, True]
+    assert all(isinstance(r.exception, InvalidImageError) for r in results[1:3])
+
+
+def test_ordered_yields_in_input_order(paths: list[str]) -> None:
+    results = list(pipeline_extract_colors(paths * 3, ordered=True, extract_workers=3))
+    assert [r.index for r in results] == list(range(len(paths) * 3))
+
+
+def test_stats_report_every_stage(paths: list[str]) -> None:
+    stats = PipelineStats()
+    list(pipeline_extract_colors(paths, read_workers=3, decode_workers=2, extract_workers=1, queue_size=2, stats=stats))
+
+    for stage, workers in [(stats.read, 3), (stats.decode, 2), (stats.extract, 1)]:
+        assert stage.workers == workers
+        assert stage.capacity == 2
+        assert stage.processed == len(paths)
+        assert stage.busy_seconds > 0
+        assert 1 <= stage.max_depth <= 2
+        assert 0 < stage.mean_depth <= 2
+
+
+def test_input_is_consumed_lazily(paths: list[str]) -> None:
+    consumed = []
+
+    def images():
+        for path in paths * 10:
+            consumed.append(path)
+            yield path
+
+    iterator = pipeline_extract_colors(images(), read_workers=1, decode_workers=1, extract_workers=1, max_in_flight=3)
+    next(iterator)
+    time.sleep(0.2)
+    assert len(consumed) <= 4  # max_in_flight, plus the slot freed by the first result
+    iterator.close()
+
+
+def test_cancel_stops_promptly(paths: list[str]) -> None:
+    cancel = threading.Event()
+    seen = []
+    for result in pipeline_extract_colors(paths * 20, cancel=cancel, extract_workers=1):
+        seen.append(result)
+        cancel.set()
+    assert len(seen) < len(paths) * 20
+
+
+def test_closing_early_stops_workers(paths: list[str]) -> None:
+    before = set(threading.enumerate())
+    iterator = pipeline_extract_colors(paths * 10, read_workers=4, decode_workers=2, extract_workers=2)
+    next(iterator)
+    iterator.close()
+    assert not [t for t in threading.enumerate() if t not in before]
+
+
+def test_input_errors_propagate() -> None:
+    def images():
+        yield np.zeros((4, 4, 3), dtype=np.uint8)
+        raise RuntimeError("broken source")
+
+    with pytest.raises(RuntimeError, match="broken source"):
+        list(pipeline_extract_colors(images()))
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"read_workers": 0},
+        {"decode_workers": 0},
+        {"extract_workers": 0},
+        {"extract_workers": -1},
+        {"queue_size": 0},
+        {"max_in_flight": 0},
+    ],
+)
+def test_rejects_bad_arguments(kwargs: dict[str, int]) -> None:
+    with pytest.raises(ValueError):
+        next(pipeline_extract_colors([], **kwargs))
@@ -0,0 +1,116 @@
+"""Tests for speed/quality presets and the cost-model-driven ``auto`` preset."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from pylette import Preset, batch_extract_colors, extract_colors, extract_colors_progressive
+from pylette.src.presets import AUTO_TARGET_SECONDS, PRESETS, choose_settings, estimate_cost
+from pylette.types import ExtractionMethod
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+
+def _photo(width: int, height: int) -> Image.Image:
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width]
+    arr = np.stack([x * 255 // width, y * 255 // height, (x + y) * 255 // (width + height)], axis=-1)
+    arr = np.clip(arr + rng.integers(-15, 16, arr.shape), 0, 255).astype(np.uint8)
+    return Image.fromarray(arr, "RGB")
+
+
+def _flat(width: int, height: int) -> Image.Image:
+    arr = np.zeros((height, width, 3), dtype=np.uint8)
+    arr[:] = (230, 40, 40)
+    arr[: height // 3] = (20, 20, 200)
+    return Image.fromarray(arr, "RGB")
+
+
+@pytest.mark.parametrize("preset", [Preset.FAST, Preset.BALANCED, Preset.QUALITY])
+def test_named_presets_set_mode_and_resize(preset: Preset) -> None:
+    palette = extract_colors(_photo(600, 400), palette_size=5, preset=preset)
+    params = palette.extraction_params
+    assert params is not None
+    assert params["mode"] == PRESETS[preset].mode
+    assert params["resize"] == PRESETS[preset].resize
+    assert params["preset"] == preset
+    assert len(palette) == 5
+
+
+def test_preset_accepts_strings() -> None:
+    params = extract_colors(_photo(100, 100), preset="fast").extraction_params
+    assert params is not None and params["preset"] is Preset.FAST
+
+
+def test_explicit_arguments_override_preset() -> None:
+    params = extract_colors(_photo(600, 400), preset="quality", mode="MC", resize=100).extraction_params
+    assert params is not None
+    assert params["mode"] == ExtractionMethod.MC
+    assert params["resize"] == 100
+
+
+def test_explicit_default_values_override_preset() -> None:
+    params = extract_colors(_photo(600, 400), preset="fast", mode="KMeans", resize=256).extraction_params
+    assert params is not None
+    assert params["mode"] == ExtractionMethod.KM
+    assert params["resize"] == 256
+    partial = extract_colors(_photo(600, 400), preset="fast", resize=256).extraction_params
+    assert partial is not None and (partial["mode"], partial["resize"]) == (ExtractionMethod.MC, 256)
+
+
+def test_no_preset_is_not_recorded() -> None:
+    params = extract_colors(_photo(100, 100)).extraction_params
+    assert params is not None and "preset" not in params
+
+
+def test_unknown_preset_raises() -> None:
+    with pytest.raises(ValueError):
+        extract_colors(_photo(100, 100), preset="ludicrous")
+
+
+def test_auto_flat_image_is_recovered_exactly() -> None:
+    palette = extract_colors(_flat(300, 300), palette_size=5, preset="auto")
+    params = palette.extraction_params
+    assert params is not None
+    assert params["mode"] == ExtractionMethod.OKLAB
+    assert params["resize"] is None  # resampling would blend new colors in
+    assert sorted(c.rgb for c in palette.colors) == [(20, 20, 200), (230, 40, 40)]
+
+
+def test_auto_small_image_is_not_upsampled() -> None:
+    settings = choose_settings(_photo(100, 80), palette_size=5)
+    assert settings.resize is None
+
+
+def test_auto_large_image_fits_target() -> None:
+    image = _photo(1200, 900)
+    for palette_size in (5, 16, 64, 256):
+        settings = choose_settings(image, palette_size)
+        n_pixels = settings.resize**2 if settings.resize is not None else 1200 * 900
+        assert estimate_cost(settings.mode, n_pixels, palette_size) <= AUTO_TARGET_SECONDS or settings.resize == 64
+
+
+def test_auto_trades_quality_for_palette_size() -> None:
+    image = _photo(1200, 900)
+    assert choose_settings(image, 5).mode == ExtractionMethod.OKLAB
+    assert choose_settings(image, 256).mode == ExtractionMethod.MC
+
+
+def test_cost_model_grows_with_pixels_and_palette_size() -> None:
+    for method in (ExtractionMethod.MC, ExtractionMethod.KM, ExtractionMethod.OKLAB):
+        assert estimate_cost(method, 256 * 256, 5) < estimate_cost(method, 512 * 512, 5)
+        assert estimate_cost(method, 256 * 256, 5) < estimate_cost(method, 256 * 256, 32)
+
+
+def test_progressive_uses_preset() -> None:
+    palettes = list(extract_colors_progressive(_photo(600, 400), preset="fast"))
+    assert palettes[-1].metadata["image_info"]["processed_size"] == (64, 64)
+    assert palettes[-1].metadata["extraction_params"]["mode"] == ExtractionMethod.MC
+
+
+def test_batch_forwards_preset(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    path = tmp_path / "image.png"
+    _photo(200, 200).save(path)
+    [result] = batch_extract_colors([str(path)], preset="quality")
+    assert result.palette is not None
+    assert result.palette.metadata["extraction_params"]["mode"] == ExtractionMethod.OKLAB
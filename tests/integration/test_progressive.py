@@ -0,0 +1,96 @@
+"""Tests for anytime extraction: ``extract_colors_progressive`` and ``time_budget``."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from pylette import batch_extract_colors, extract_colors, extract_colors_progressive
+from pylette.src.extractors import available_methods
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+
+@pytest.fixture
+def image() -> Image.Image:
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:200, 0:300]
+    arr = np.stack([x * 255 // 300, y * 255 // 200, (x + y) * 255 // 500], axis=-1)
+    arr = np.clip(arr + rng.integers(-10, 11, arr.shape), 0, 255).astype(np.uint8)
+    return Image.fromarray(arr, "RGB")
+
+
+@pytest.mark.parametrize("mode", available_methods())
+def test_levels_refine_up_to_resize(image: Image.Image, mode) -> None:
+    palettes = list(extract_colors_progressive(image, palette_size=5, resize=256, mode=mode))
+
+    assert [p.metadata["image_info"]["processed_size"] for p in palettes] == [(s, s) for s in (32, 64, 128, 256)]
+    assert [p.metadata["refinement"]["levels_completed"] for p in palettes] == [1, 2, 3, 4]
+    assert all(p.metadata["refinement"]["levels_total"] == 4 for p in palettes)
+    for palette in palettes:
+        assert len(palette) == 5
+        assert sum(palette.frequencies) == pytest.approx(1.0)
+
+
+def test_final_level_without_resize_is_full_image(image: Image.Image) -> None:
+    palettes = list(extract_colors_progressive(image, resize=None))
+    assert palettes[-1].metadata["image_info"]["processed_size"] == (300, 200)
+    assert palettes[-1].metadata["refinement"]["sample_size"] is None
+    assert palettes[-1].metadata["processing_stats"]["total_pixels"] == 300 * 200
+
+
+def test_small_resize_is_a_single_level(image: Image.Image) -> None:
+    palettes = list(extract_colors_progressive(image, resize=16))
+    assert len(palettes) == 1
+    assert palettes[0].metadata["image_info"]["processed_size"] == (16, 16)
+
+
+def test_caller_can_stop_early(image: Image.Image) -> None:
+    first = next(extract_colors_progressive(image, palette_size=3))
+    assert len(first) == 3
+    assert first.metadata["refinement"]["levels_completed"] == 1
+
+
+def test_progressive_is_deterministic(image: Image.Image) -> None:
+    a = [[c.rgb for c in p.colors] for p in extract_colors_progressive(image)]
+    b = [[c.rgb for c in p.colors] for p in extract_colors_progressive(image)]
+    assert a == b
+
+
+def test_tiny_budget_returns_coarse_palette(image: Image.Image) -> None:
+    palette = extract_colors(image, palette_size=5, time_budget=1e-9)
+    refinement = palette.metadata["refinement"]
+    assert refinement["levels_completed"] == 1
+    assert refinement["levels_total"] == 4
+    assert refinement["time_budget"] == 1e-9
+    assert len(palette) == 5
+
+
+def test_generous_budget_completes_refinement(image: Image.Image) -> None:
+    palette = extract_colors(image, palette_size=5, time_budget=60.0)
+    assert palette.metadata["refinement"]["levels_completed"] == palette.metadata["refinement"]["levels_total"]
+    assert palette.metadata["image_info"]["processed_size"] == (256, 256)
+
+
+def test_no_budget_records_no_refinement(image: Image.Image) -> None:
+    assert "refinement" not in extract_colors(image).metadata
+
+
+@pytest.mark.parametrize("budget", [0, -1.0])
+def test_invalid_budget_raises(image: Image.Image, budget: float) -> None:
+    with pytest.raises(ValueError):
+        extract_colors(image, time_budget=budget)
+
+
+def test_coarse_levels_without_valid_pixels_are_skipped() -> None:
+    arr = np.zeros((512, 512, 4), dtype=np.uint8)
+    arr[100:102, 100:102] = (250, 10, 10, 255)  # vanishes when downsampled
+    palettes = list(extract_colors_progressive(Image.fromarray(arr, "RGBA"), resize=None, alpha_mask_threshold=128))
+    assert palettes[-1].metadata["refinement"]["sample_size"] is None
+    assert [c.rgb for c in palettes[-1].colors] == [(250, 10, 10)]
+
+
+def test_batch_forwards_time_budget(image: Image.Image, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    path = tmp_path / "image.png"
+    image.save(path)
+    results = batch_extract_colors([str(path)], time_budget=1e-9)
+    assert results[0].palette.metadata["refinement"]["levels_completed"] == 1
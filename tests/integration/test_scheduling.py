@@ -0,0 +1,85 @@
+"""Tests for cost-aware (largest-first) batch scheduling."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from pylette import Schedule, batch_extract_colors
+from pylette.src.scheduling import estimate_image_cost, largest_first, probe
+from pylette.types import BatchResult, ExtractionMethod
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+
+@pytest.fixture
+def paths(tmp_path: Path) -> list[str]:
+    """Files of increasing size: 16, 32, 64 and 128 pixels square."""
+    rng = np.random.default_rng(0)
+    out = []
+    for side in (16, 32, 64, 128):
+        path = tmp_path / f"image{side}.png"
+        Image.fromarray(rng.integers(0, 256, (side, side, 3), dtype=np.uint8)).save(path)
+        out.append(str(path))
+    return out
+
+
+def _run_order(images: list, **kwargs) -> tuple[list[int | None], list[BatchResult]]:  # type: ignore[type-arg]
+    started: list[int | None] = []
+    results = batch_extract_colors(
+        images, palette_size=3, max_workers=1, progress_callback=lambda _, r: started.append(r.index), **kwargs
+    )
+    return started, results
+
+
+def test_probe_reads_headers(paths: list[str], test_image_as_bytes: bytes) -> None:
+    info = probe(paths[1])
+    assert info is not None
+    assert info.size == (32, 32)
+    assert info.format == "PNG"
+    assert info.n_bytes == Path(paths[1]).stat().st_size
+
+    from_bytes = probe(test_image_as_bytes)
+    assert from_bytes is not None and from_bytes.n_bytes == len(test_image_as_bytes)
+    assert probe(np.zeros((5, 7, 3), dtype=np.uint8)) == probe(Image.new("RGB", (7, 5)))
+    assert probe("https://example.com/image.png") is None
+    assert probe("does-not-exist.png") is None
+    assert probe(Path(paths[1]).as_uri()) == info
+
+
+def test_cost_grows_with_pixels(paths: list[str]) -> None:
+    costs = [estimate_image_cost(probe(p), ExtractionMethod.KM, 5, None) for p in paths]  # type: ignore[arg-type]
+    assert costs == sorted(costs)
+    assert len(set(costs)) == len(costs)
+
+
+def test_largest_first_puts_unknown_costs_first(paths: list[str]) -> None:
+    images = [*paths, "https://example.com/image.png"]
+    assert largest_first(images, ExtractionMethod.KM, 5, 256) == [4, 3, 2, 1, 0]
+
+
+def test_batch_starts_largest_and_returns_input_order(paths: list[str]) -> None:
+    started, results = _run_order(paths, schedule="largest_first")
+    assert started == [3, 2, 1, 0]
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    assert [r.source for r in results] == paths
+    for path, result in zip(paths, results):
+        assert result.palette is not None and result.palette.image_source == path
+
+
+def test_input_schedule_is_the_default(paths: list[str]) -> None:
+    started, results = _run_order(paths)
+    assert started == [0, 1, 2, 3]
+    assert [r.source for r in results] == paths
+
+
+def test_failures_keep_their_position(paths: list[str]) -> None:
+    _, results = _run_order([paths[0], "does-not-exist.png", paths[3]], schedule=Schedule.LARGEST_FIRST)
+    assert [r.success for r in results] == [True, False, True]
+    assert [r.index for r in results] == [0, 1, 2]
+
+
+def test_rejects_unknown_schedule(paths: list[str]) -> None:
+    with pytest.raises(ValueError):
+        batch_extract_colors(paths, schedule="shortest_first")
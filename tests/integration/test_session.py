@@ -0,0 +1,121 @@
+"""Tests for ``ExtractionConfig`` and the long-lived ``ExtractionSession``."""
+
+import dataclasses
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from pylette import ExtractionConfig, ExtractionSession, UnknownExtractionMethodError, extract_colors
+from pylette.types import Backend, ExtractionMethod, Preset
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+
+def _arrays(n: int) -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (16, 16, 3), dtype=np.uint8) for _ in range(n)]
+
+
+def _rgb(palette) -> list[tuple[int, ...]]:  # type: ignore[no-untyped-def]
+    return [c.rgb for c in palette.colors]
+
+
+def test_config_normalizes_and_hashes() -> None:
+    config = ExtractionConfig(palette_size=4, mode="OKLab", preset="fast")
+    assert config.mode is ExtractionMethod.OKLAB
+    assert config.preset is Preset.FAST
+    assert config == ExtractionConfig(palette_size=4, mode=ExtractionMethod.OKLAB, preset=Preset.FAST)
+    assert len({config, ExtractionConfig(palette_size=4, mode="OKLab", preset="fast")}) == 1
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.palette_size = 3  # type: ignore[misc]
+
+
+def test_replace_revalidates() -> None:
+    config = ExtractionConfig()
+    assert dataclasses.replace(config, palette_size=3).palette_size == 3
+    with pytest.raises(ValueError):
+        dataclasses.replace(config, resize=0)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"palette_size": 0},
+        {"resize": 0},
+        {"resize": True},
+        {"sort_mode": "hue"},
+        {"alpha_mask_threshold": 256},
+        {"time_budget": 0},
+        {"preset": "slow"},
+    ],
+)
+def test_config_rejects_bad_values(kwargs: dict) -> None:  # type: ignore[type-arg]
+    with pytest.raises(ValueError):
+        ExtractionConfig(**kwargs)
+
+
+def test_config_rejects_unknown_mode() -> None:
+    with pytest.raises(UnknownExtractionMethodError):
+        ExtractionConfig(mode="Octree")
+
+
+def test_extract_submit_and_map_match_extract_colors() -> None:
+    images = _arrays(5)
+    config = ExtractionConfig(palette_size=3, sort_mode="luminance")
+    expected = [_rgb(extract_colors(img, palette_size=3, sort_mode="luminance")) for img in images]
+    with ExtractionSession(config, max_workers=2) as session:
+        assert [_rgb(session.extract(img)) for img in images] == expected
+        assert [_rgb(session.submit(img).result()) for img in images] == expected
+        results = list(session.map(images))
+    assert [r.index for r in results] == list(range(5))
+    assert [_rgb(r.palette) for r in results] == expected
+
+
+def test_pool_is_reused_across_calls() -> None:
+    with ExtractionSession(max_workers=2) as session:
+        for _ in range(5):
+            list(session.map(_arrays(3)))
+            session.submit(_arrays(1)[0]).result()
+        names = {t.name for t in threading.enumerate() if t.name.startswith("pylette")}
+    assert len(names) <= 2
+
+
+def test_closed_session_rejects_work() -> None:
+    session = ExtractionSession()
+    session.close()
+    session.close()  # idempotent
+    with pytest.raises(RuntimeError):
+        session.submit(_arrays(1)[0])
+    with pytest.raises(RuntimeError):
+        session.map(_arrays(1))
+    assert len(session.extract(_arrays(1)[0])) == 5  # runs in the caller, needs no pool
+
+
+def test_borrowed_executor_is_left_running() -> None:
+    with ThreadPoolExecutor(2) as pool:
+        with ExtractionSession(backend=pool) as session:
+            session.submit(_arrays(1)[0]).result()
+        assert pool.submit(lambda: 1).result() == 1
+
+
+def test_worker_counts() -> None:
+    with ThreadPoolExecutor(2) as pool:
+        with pytest.raises(ValueError, match="max_workers"):
+            ExtractionSession(backend=pool, max_workers=4)
+        with ExtractionSession(backend=pool) as session:
+            assert session.native_threads == 1
+    with pytest.raises(ValueError):
+        ExtractionSession(max_workers=0)
+    with ExtractionSession(max_workers=1) as session:
+        assert session.native_threads == os.cpu_count()
+
+
+def test_process_session(test_image_path_as_str: str) -> None:
+    with ExtractionSession(ExtractionConfig(palette_size=3), backend=Backend.PROCESSES, max_workers=2) as session:
+        palette = session.submit(test_image_path_as_str).result()
+        results = list(session.map([test_image_path_as_str, _arrays(1)[0]]))
+    assert _rgb(palette) == _rgb(extract_colors(test_image_path_as_str, palette_size=3))
+    assert all(r.success for r in results)
@@ -0,0 +1,144 @@
+"""Tests for the vectorized ``extract_colors_stacked`` API over (N, H, W, C) stacks."""
+
+import numpy as np
+import pytest
+
+from pylette import InvalidImageError, NoValidPixelsError, extract_colors_stacked
+from pylette.types import ExtractionMethod, PaletteArrays, SourceType
+
+MODES = [ExtractionMethod.KM, ExtractionMethod.OKLAB]
+
+
+@pytest.fixture
+def stack() -> np.ndarray:
+    """Four 32x32 images, each 3/4 one color and 1/4 another."""
+    pairs = [((200, 30, 30), (20, 20, 220)), ((10, 180, 10), (250, 250, 250)), ((0, 0, 0), (128, 64, 0))]
+    pairs.append(((90, 90, 200), (200, 200, 40)))
+    arr = np.zeros((len(pairs), 32, 32, 3), dtype=np.uint8)
+    for i, (major, minor) in enumerate(pairs):
+        arr[i] = major
+        arr[i, :8] = minor
+    return arr
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_one_palette_per_image(stack: np.ndarray, mode: ExtractionMethod) -> None:
+    palettes = extract_colors_stacked(stack, palette_size=2, mode=mode)
+    assert len(palettes) == len(stack)
+    for img, palette in zip(stack, palettes):
+        assert len(palette) == 2
+        assert palette.colors[0].rgb == tuple(int(v) for v in img[-1, -1])
+        assert palette.colors[1].rgb == tuple(int(v) for v in img[0, 0])
+        assert palette.frequencies == pytest.approx([0.75, 0.25])
+
+
+def test_metadata(stack: np.ndarray) -> None:
+    palette = extract_colors_stacked(stack, palette_size=2)[1]
+    assert palette.source_type == SourceType.NUMPY_ARRAY
+    assert palette.image_source == "<numpy_array: shape=(32, 32, 3) index=1>"
+    assert palette.processing_stats["valid_pixels"] == 32 * 32
+    assert palette.extraction_params["palette_size"] == 2
+
+
+def test_fewer_colors_than_palette_size(stack: np.ndarray) -> None:
+    palettes = extract_colors_stacked(stack, palette_size=5)
+    assert all(len(p) == 2 for p in palettes)
+    assert all(sum(p.frequencies) == pytest.approx(1.0) for p in palettes)
+
+
+def test_masks_restrict_sampled_pixels(stack: np.ndarray) -> None:
+    masks = np.zeros(stack.shape[:3], dtype=bool)
+    masks[:, :8] = True  # only the minor color
+    palettes = extract_colors_stacked(stack, palette_size=3, masks=masks)
+    for img, palette in zip(stack, palettes):
+        assert [c.rgb for c in palette.colors] == [tuple(int(v) for v in img[0, 0])]
+        assert palette.processing_stats["valid_pixels"] == 8 * 32
+
+
+def test_alpha_mask_threshold() -> None:
+    arr = np.zeros((2, 8, 8, 4), dtype=np.uint8)
+    arr[..., :3] = (255, 0, 0)
+    arr[..., 3] = 255
+    arr[:, :4, :, :3] = (0, 0, 255)
+    arr[:, :4, :, 3] = 100
+    palettes = extract_colors_stacked(arr, palette_size=2, alpha_mask_threshold=128)
+    assert all([c.rgb for c in p.colors] == [(255, 0, 0)] for p in palettes)
+
+
+def test_fully_masked_image_raises(stack: np.ndarray) -> None:
+    masks = np.ones(stack.shape[:3], dtype=bool)
+    masks[2] = False
+    with pytest.raises(NoValidPixelsError, match="image 2"):
+        extract_colors_stacked(stack, masks=masks)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_arrays_match_palettes(stack: np.ndarray, mode: ExtractionMethod) -> None:
+    rng = np.random.default_rng(0)
+    noisy = np.clip(stack.astype(int) + rng.integers(-10, 11, stack.shape), 0, 255).astype(np.uint8)
+    arrays = extract_colors_stacked(noisy, palette_size=4, mode=mode, sort_mode="luminance", as_arrays=True)
+    palettes = extract_colors_stacked(noisy, palette_size=4, mode=mode, sort_mode="luminance")
+
+    assert isinstance(arrays, PaletteArrays)
+    assert len(arrays) == len(stack)
+    assert arrays.colors.shape == (len(stack), 4, 4)
+    assert arrays.colors.dtype == np.uint8
+    np.testing.assert_allclose(arrays.frequencies.sum(axis=1), 1.0)
+    for row, palette in zip(arrays.to_palettes(), palettes):
+        assert [c.rgba for c in row.colors] == [c.rgba for c in palette.colors]
+        assert row.frequencies == pytest.approx(palette.frequencies)
+        luminances = [c.luminance for c in palette.colors]
+        assert luminances == sorted(luminances)
+
+
+def test_sample_size_none_uses_every_pixel(stack: np.ndarray) -> None:
+    a = extract_colors_stacked(stack, palette_size=2, sample_size=None)
+    b = extract_colors_stacked(stack, palette_size=2, sample_size=64)
+    assert [[c.rgb for c in p.colors] for p in a] == [[c.rgb for c in p.colors] for p in b]
+
+
+def test_deterministic() -> None:
+    arr = np.random.default_rng(5).integers(0, 256, (3, 20, 20, 3), dtype=np.uint8)
+    a = extract_colors_stacked(arr, palette_size=5, as_arrays=True)
+    b = extract_colors_stacked(arr, palette_size=5, as_arrays=True)
+    np.testing.assert_array_equal(a.colors, b.colors)
+    np.testing.assert_array_equal(a.frequencies, b.frequencies)
+
+
+@pytest.mark.parametrize("shape", [(8, 8, 3), (2, 8, 8, 2)])
+def test_rejects_bad_stack_shape(shape: tuple[int, ...]) -> None:
+    with pytest.raises(InvalidImageError):
+        extract_colors_stacked(np.zeros(shape, dtype=np.uint8))
+
+
+def test_rejects_mismatched_masks(stack: np.ndarray) -> None:
+    with pytest.raises(InvalidImageError):
+        extract_colors_stacked(stack, masks=np.ones((1, 32, 32), dtype=bool))
+
+
+def test_rejects_median_cut(stack: np.ndarray) -> None:
+    with pytest.raises(ValueError):
+        extract_colors_stacked(stack, mode=ExtractionMethod.MC)
+
+
+def test_sampling_memory_is_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Sampling keys are drawn a few images at a time, without changing the palettes."""
+    import tracemalloc
+
+    import pylette.src.color_extraction as color_extraction
+
+    arr = np.random.default_rng(5).integers(0, 256, (40, 64, 64, 3), dtype=np.uint8)
+    expected = extract_colors_stacked(arr, palette_size=2, sample_size=16, as_arrays=True)
+    # Small enough that sampling draws keys for two images at a time, while
+    # all 40 images still share one k-means call.
+    monkeypatch.setattr(color_extraction, "_STACKED_MAX_ELEMENTS", 2 * 64 * 64)
+    tracemalloc.start()
+    try:
+        result = extract_colors_stacked(arr, palette_size=2, sample_size=16, as_arrays=True)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    np.testing.assert_array_equal(result.colors, expected.colors)
+    np.testing.assert_array_equal(result.frequencies, expected.frequencies)
+    # Keys for the whole stack alone would take 16 bytes per pixel.
+    assert peak < 16 * arr.shape[0] * 64 * 64 / 4
@@ -0,0 +1,87 @@
+"""Thread-safety of the extraction path (shared extractors, registry, incremental extractors).
+
+These run on every build; on a free-threaded interpreter they exercise the
+extraction path without the GIL.
+"""
+
+import sys
+import sysconfig
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from pylette import HistogramExtractor, StreamingKMeansExtractor, batch_extract_colors, extract_colors
+from pylette.src.extractors import available_methods, registry
+from pylette.src.extractors.registry import get_extractor, register
+from pylette.types import ExtractionMethod
+
+pytestmark = pytest.mark.filterwarnings("ignore::UserWarning")
+
+
+@pytest.fixture(autouse=True)
+def frequent_switches():
+    """Switch threads as often as possible so races surface under the GIL too."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _images(n: int) -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (48, 48, 3), dtype=np.uint8) for _ in range(n)]
+
+
+@pytest.mark.parametrize("mode", available_methods())
+def test_concurrent_extraction_matches_sequential(mode: ExtractionMethod) -> None:
+    images = _images(16)
+    sequential = [[c.rgb for c in extract_colors(img, palette_size=4, mode=mode).colors] for img in images]
+    results = batch_extract_colors(images, palette_size=4, mode=mode, max_workers=8)
+    assert [[c.rgb for c in r.palette.colors] if r.palette else None for r in results] == sequential
+
+
+def test_concurrent_registration_is_atomic() -> None:
+    original = get_extractor(ExtractionMethod.MC)
+    winners: list[int] = []
+    errors: list[Exception] = []
+    barrier = threading.Barrier(8)
+
+    def attempt(i: int) -> None:
+        barrier.wait()
+        try:
+            register(ExtractionMethod.MC)(type(original))
+            winners.append(i)
+        except ValueError as e:
+            errors.append(e)
+        available_methods()
+
+    del registry._REGISTRY[ExtractionMethod.MC]
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(attempt, range(8)))
+    finally:
+        registry._REGISTRY[ExtractionMethod.MC] = original
+    assert len(winners) == 1
+    assert len(errors) == 7
+
+
+@pytest.mark.parametrize("cls", [StreamingKMeansExtractor, HistogramExtractor])
+def test_incremental_extractor_shared_by_producers(cls) -> None:  # type: ignore[no-untyped-def]
+    extractor = cls(palette_size=3)
+    chunk = np.array([[220, 20, 20]] * 300 + [[20, 200, 40]] * 200 + [[30, 40, 230]] * 100, dtype=np.uint8)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: extractor.partial_fit(chunk), range(32)))
+
+    assert extractor.n_pixels_seen == 32 * len(chunk)
+    palette = extractor.palette()
+    assert [c.rgb for c in palette.colors] == [(220, 20, 20), (20, 200, 40), (30, 40, 230)]
+    assert palette.frequencies == pytest.approx([1 / 2, 1 / 3, 1 / 6])
+
+
+@pytest.mark.skipif(not sysconfig.get_config_var("Py_GIL_DISABLED"), reason="requires a free-threaded build")
+def test_gil_stays_disabled() -> None:
+    batch_extract_colors(_images(4), max_workers=4)
+    assert not sys._is_gil_enabled()  # pyright: ignore[reportAttributeAccessIssue]